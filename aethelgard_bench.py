@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for Echoes of Aethelgard hot paths."""
+
+import argparse
+import random
+import sys
+import timeit
+import tracemalloc
+from copy import deepcopy
+
+from echoes_of_aethelgard import ENEMY_TEMPLATES, ITEM_TEMPLATES, Enemy, Game, HeadlessIO, Item, Player
+
+DEFAULT_NUMBER = 20000
+DEFAULT_REPEAT = 5
+DEFAULT_SESSIONS = 200
+DEFAULT_HOARD = 2000
+
+
+def build_prototype_item(template):
+    """Build a catalog-style Item for the deepcopy baseline."""
+    return Item(template)
+
+
+def build_prototype_enemy(template):
+    """Build a catalog-style Enemy the way templates were cloned before compilation."""
+    return Enemy(
+        template.name,
+        template.description,
+        health=template.health,
+        damage=template.damage,
+        defense=template.defense,
+        agility=template.agility,
+        exp_reward=template.exp_reward,
+        loot=list(template.loot),
+        bonus_loot=[{"name": name, "chance": chance} for name, chance in template.bonus_loot],
+        magic_resistance=template.magic_resistance,
+    )
+
+
+def best_per_call(statement, number, repeat):
+    """Return the best observed time per call in microseconds."""
+    timings = timeit.repeat(statement, number=number, repeat=repeat)
+    return min(timings) / number * 1e6
+
+
+def bench_clones(number, repeat):
+    """Compare deepcopy cloning against compiled template factories."""
+    item_templates = list(ITEM_TEMPLATES.values())
+    enemy_templates = list(ENEMY_TEMPLATES.values())
+    item_prototypes = [build_prototype_item(template) for template in item_templates]
+    enemy_prototypes = [build_prototype_enemy(template) for template in enemy_templates]
+
+    def deepcopy_items():
+        for prototype in item_prototypes:
+            deepcopy(prototype)
+
+    def template_items():
+        for template in item_templates:
+            Item(template)
+
+    def deepcopy_enemies():
+        for prototype in enemy_prototypes:
+            deepcopy(prototype)
+
+    def template_enemies():
+        for template in enemy_templates:
+            Enemy.from_template(template)
+
+    calls = max(1, number // max(len(item_templates), len(enemy_templates)))
+    return [
+        (
+            "clone item",
+            best_per_call(deepcopy_items, calls, repeat) / len(item_templates),
+            best_per_call(template_items, calls, repeat) / len(item_templates),
+        ),
+        (
+            "clone enemy",
+            best_per_call(deepcopy_enemies, calls, repeat) / len(enemy_templates),
+            best_per_call(template_enemies, calls, repeat) / len(enemy_templates),
+        ),
+    ]
+
+
+def bench_game_paths(number, repeat):
+    """Time the game paths dominated by cloning."""
+    game = Game(io=HeadlessIO())
+    calls = max(1, number // 100)
+    return [
+        ("merchant restock", best_per_call(game.build_merchant_inventory, calls, repeat)),
+        ("copy location", best_per_call(lambda: game.copy_location(game.world.base["Sunken Archives"]), calls, repeat)),
+    ]
+
+
+def bench_hoard(number, repeat, hoard_size):
+    """Time per-frame inventory queries against a large hoard."""
+    game = Game(io=HeadlessIO())
+    game.player = Player("Bench", "Whispering Ruins", io=game.io)
+    names = list(ITEM_TEMPLATES)
+    for index in range(hoard_size):
+        game.player.inventory.append(game.clone_item(names[index % len(names)]))
+
+    def stat_tags():
+        for item in game.player.inventory:
+            game.format_merchant_item_stats(item)
+            game.format_upgrade_preview(item, "Epic")
+
+    calls = max(1, number // 100)
+    return [
+        ("count item", best_per_call(lambda: game.count_inventory_items("Void Shard"), calls, repeat)),
+        ("has item", best_per_call(lambda: game.player_has_item("Echo Crystal"), calls, repeat)),
+        ("inventory summary", best_per_call(game.inventory_summary, calls, repeat)),
+        ("resolve exact", best_per_call(lambda: game.resolve_item("void shard", game.player.inventory), calls, repeat)),
+        ("resolve partial", best_per_call(lambda: game.resolve_item("shard", game.player.inventory), calls, repeat)),
+        ("stat tags", best_per_call(stat_tags, max(1, calls // 10), repeat)),
+    ]
+
+
+def bench_render(number, repeat):
+    """Time minimap rendering and full location redraws."""
+    game = Game(io=HeadlessIO())
+    game.player = Player("Bench", "Whispering Ruins", io=game.io)
+    game.player.visited_locations.update(game.world.keys())
+
+    def cold_minimap():
+        game.minimap_cache_state = None
+        game.minimap_row_cache = {}
+        game.minimap_rows()
+
+    def redraw_location():
+        game.display_location()
+        game.io.drain()
+
+    calls = max(1, number // 100)
+    return [
+        ("minimap (warm)", best_per_call(game.minimap_rows, calls, repeat)),
+        ("minimap (cold)", best_per_call(cold_minimap, calls, repeat)),
+        ("redraw location", best_per_call(redraw_location, calls, repeat)),
+    ]
+
+
+def build_full_session():
+    """Create a session with a player and a private copy of every location."""
+    game = Game(io=HeadlessIO())
+    game.player = Player("Bench", "Whispering Ruins", io=game.io)
+    for name in list(game.world.keys()):
+        game.world.mutable(name)
+    return game
+
+
+def traced_bytes(factory, count):
+    """Return the bytes still allocated per object after building count objects."""
+    tracemalloc.start()
+    try:
+        objects = [factory() for _ in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objects
+    return current / count
+
+
+def bench_memory(sessions):
+    """Measure retained memory for core objects and for fully explored sessions."""
+    Game(io=HeadlessIO())
+    item_template = ITEM_TEMPLATES["Warrior's Sword"]
+    enemy_template = ENEMY_TEMPLATES[next(iter(ENEMY_TEMPLATES))]
+    return [
+        ("item", traced_bytes(lambda: Item(item_template), 10000)),
+        ("enemy", traced_bytes(lambda: Enemy.from_template(enemy_template), 10000)),
+        ("session (explored)", traced_bytes(build_full_session, sessions)),
+    ]
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the benchmark."""
+    parser = argparse.ArgumentParser(description="Run Echoes of Aethelgard micro-benchmarks.")
+    parser.add_argument("--number", type=int, default=DEFAULT_NUMBER, help=f"calls per timing (default: {DEFAULT_NUMBER})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"timings per benchmark (default: {DEFAULT_REPEAT})")
+    parser.add_argument(
+        "--hoard",
+        type=int,
+        default=DEFAULT_HOARD,
+        help=f"items held for the hoard benchmark (default: {DEFAULT_HOARD})",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=DEFAULT_SESSIONS,
+        help=f"sessions built for the memory benchmark (default: {DEFAULT_SESSIONS})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run every benchmark and print a summary table."""
+    args = parse_args(argv)
+    random.seed(args.seed)
+    print(f"{'benchmark':<20}{'deepcopy us':>14}{'template us':>14}{'speedup':>10}")
+    for name, before, after in bench_clones(args.number, args.repeat):
+        print(f"{name:<20}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x")
+    print()
+    print(f"{'benchmark':<20}{'us per call':>14}")
+    timings = (
+        bench_game_paths(args.number, args.repeat)
+        + bench_hoard(args.number, args.repeat, args.hoard)
+        + bench_render(args.number, args.repeat)
+    )
+    for name, elapsed in timings:
+        print(f"{name:<20}{elapsed:>14.2f}")
+    print()
+    print(f"{'memory':<20}{'bytes each':>14}")
+    for name, size in bench_memory(args.sessions):
+        print(f"{name:<20}{size:>14.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
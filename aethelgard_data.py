@@ -854,3 +854,35 @@ __||________||__
 """,
     },
 }
+
+# Exit locks. "from" limits a rule to one origin (None locks the destination from
+# anywhere). Each rule unlocks when its requirement is met: a truthy player flag,
+# an accepted quest, or a minimum number of completed quests.
+EXIT_LOCK_DEFAULT_MESSAGE = "A sealed passage blocks your way. Something deeper must call you first."
+
+EXIT_LOCK_RULES = [
+    {
+        "destination": "Heartstone Depths",
+        "from": None,
+        "requires": {"flag": "heartstone_unlocked"},
+        "message": EXIT_LOCK_DEFAULT_MESSAGE,
+    },
+    {
+        "destination": "Barren Peaks",
+        "from": "Ironclad Camp",
+        "requires": {"quest": "clear_path"},
+        "message": "I should talk to Brak before going this way.",
+    },
+    {
+        "destination": "Voidscar Hollow",
+        "from": "Chasm of Whispers",
+        "requires": {"quest": "void_shards"},
+        "message": "I should talk with Nyx before going this way.",
+    },
+    {
+        "destination": "The Temporal Breach Apex",
+        "from": "The Chronos Nexus",
+        "requires": {"completed_quests": 6},
+        "message": "I can't help but feeling I need to go back and see what else needs done first.",
+    },
+]
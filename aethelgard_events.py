@@ -0,0 +1,160 @@
+"""Typed game events for Echoes of Aethelgard and the renderers that turn them into output."""
+
+import json
+from collections import namedtuple
+
+
+# -----------------------------
+# Event types
+# -----------------------------
+
+
+class Moved(namedtuple("Moved", "origin destination")):
+    """The player walked from one location to another."""
+
+    __slots__ = ()
+    kind = "move"
+
+
+class Damage(namedtuple("Damage", "source target amount method")):
+    """One hit landed in combat; method is melee, ranged_bow, magic_staff, spell, or curse."""
+
+    __slots__ = ()
+    kind = "damage"
+
+
+class CombatEnded(namedtuple("CombatEnded", "enemy level result health")):
+    """A fight finished as defeated, fled, or dead, leaving the player at health."""
+
+    __slots__ = ()
+    kind = "combat"
+
+
+class LootDropped(namedtuple("LootDropped", "source item rarity")):
+    """A defeated enemy dropped an item."""
+
+    __slots__ = ()
+    kind = "loot"
+
+
+class QuestAccepted(namedtuple("QuestAccepted", "quest_id name")):
+    """A quest was added to the player's log."""
+
+    __slots__ = ()
+    kind = "quest_accepted"
+
+
+class QuestCompleted(namedtuple("QuestCompleted", "quest_id name")):
+    """A quest was marked completed."""
+
+    __slots__ = ()
+    kind = "quest_completed"
+
+
+class LevelUp(namedtuple("LevelUp", "level")):
+    """The player reached a new level."""
+
+    __slots__ = ()
+    kind = "level"
+
+
+class HordeSpread(namedtuple("HordeSpread", "locations")):
+    """The horde overran new locations."""
+
+    __slots__ = ()
+    kind = "horde_spread"
+
+
+class GameEnded(namedtuple("GameEnded", "result score")):
+    """The run ended in a win or a loss."""
+
+    __slots__ = ()
+    kind = "end"
+
+
+class Narration(namedtuple("Narration", "text")):
+    """Plain story and dialogue text for clients that do not draw screens."""
+
+    __slots__ = ()
+    kind = "narration"
+
+
+class Prompt(namedtuple("Prompt", "text")):
+    """The game is waiting for a line of input."""
+
+    __slots__ = ()
+    kind = "prompt"
+
+
+EVENT_TYPES = {
+    event_type.kind: event_type
+    for event_type in (
+        Moved,
+        Damage,
+        CombatEnded,
+        LootDropped,
+        QuestAccepted,
+        QuestCompleted,
+        LevelUp,
+        HordeSpread,
+        GameEnded,
+        Narration,
+        Prompt,
+    )
+}
+
+
+# -----------------------------
+# Renderers
+# -----------------------------
+
+TEXT_TEMPLATES = {
+    "move": "{origin} -> {destination}",
+    "damage": "{source} hits {target} for {amount} ({method})",
+    "combat": "{enemy} (Lv {level}) {result}, HP {health}",
+    "loot": "{source} dropped {item}",
+    "quest_accepted": "{name}",
+    "quest_completed": "{name}",
+    "level": "reached level {level}",
+    "horde_spread": "{locations}",
+    "end": "{result}, score {score}",
+    "narration": "{text}",
+    "prompt": "{text}",
+}
+
+
+def event_payload(event):
+    """Return an event as a plain dict tagged with its kind."""
+    payload = {"event": event.kind}
+    payload.update(event._asdict())
+    return payload
+
+
+def render_json(event):
+    """Render an event as one compact JSON line."""
+    return json.dumps(event_payload(event), separators=(",", ":"))
+
+
+def render_text(event):
+    """Render an event as one human-readable log line."""
+    fields = event._asdict()
+    if event.kind == "horde_spread":
+        fields["locations"] = ", ".join(event.locations)
+    return f"{event.kind}: {TEXT_TEMPLATES[event.kind].format(**fields)}"
+
+
+def parse_event(payload):
+    """Rebuild a typed event from a payload produced by event_payload."""
+    fields = dict(payload)
+    event_type = EVENT_TYPES.get(fields.pop("event", None))
+    if event_type is None:
+        raise ValueError(f"Unknown event payload {payload!r}.")
+    if event_type is HordeSpread:
+        fields["locations"] = tuple(fields.get("locations", ()))
+    return event_type(**fields)
+
+
+EVENT_RENDERERS = {
+    "text": render_text,
+    "json": render_json,
+}
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Telnet-style server hosting many Echoes of Aethelgard sessions in one process."""
+
+import argparse
+import asyncio
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from aethelgard_events import Narration, Prompt, render_json
+from echoes_of_aethelgard import SGR_ESCAPE, Game, GameIO
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 4000
+DEFAULT_MAX_SESSIONS = 256
+DEFAULT_TERMINAL_SIZE = (80, 24)
+PROTOCOLS = ("screen", "events")
+# Virtual pacing only records delays for a harness to replay; no session reads them back.
+SESSION_PACING_PROFILES = ("instant", "interactive")
+TELNET_COMMAND = re.compile(rb"\xff[\xfb-\xfe].|\xff[\xf0-\xfa]", re.DOTALL)
+
+
+class SessionIO(GameIO):
+    """I/O port for one network client; reads are awaited on the server's event loop."""
+
+    def __init__(self, loop, reader, writer, pacing=None, color=None, width=None):
+        super().__init__(pacing=pacing, color=color, width=width)
+        self.loop = loop
+        self.reader = reader
+        self.writer = writer
+        if self.renders_scenes:
+            self.enable_frames(self.terminal_size)
+
+    def send(self, data):
+        """Queue output for the client, translating newlines for telnet."""
+        if self.writer.is_closing():
+            return
+        payload = data.replace("\n", "\r\n").encode("utf-8")
+        self.loop.call_soon_threadsafe(self.writer.write, payload)
+
+    def supports_color(self):
+        """Assume an ANSI-capable client; players can switch color off in game."""
+        return True
+
+    def terminal_width(self):
+        """Assume a standard terminal; players can declare their own width in game."""
+        return DEFAULT_TERMINAL_SIZE[0]
+
+    def terminal_size(self):
+        """Return the client's (columns, rows), following the declared width."""
+        return (self.width or DEFAULT_TERMINAL_SIZE[0], DEFAULT_TERMINAL_SIZE[1])
+
+    async def read_line(self):
+        """Flush pending output, then await one line from the client."""
+        await self.writer.drain()
+        return await self.reader.readline()
+
+    def receive(self):
+        """Block this session's worker until the client sends a line; exit when it disconnects."""
+        future = asyncio.run_coroutine_threadsafe(self.read_line(), self.loop)
+        try:
+            raw = future.result()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            # A line longer than the reader's limit cannot be recovered; drop the client like a disconnect.
+            raw = b""
+        if not raw:
+            raise SystemExit(0)
+        raw = TELNET_COMMAND.sub(b"", raw)
+        return raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def input(self, prompt):
+        """Show a prompt and block this session's worker until the client answers."""
+        self.write(prompt)
+        self.flush()
+        line = self.receive()
+        self.frames.echo(line)
+        return line
+
+
+class EventSessionIO(SessionIO):
+    """I/O port for thin clients that receive typed events as JSON lines instead of screens."""
+
+    renders_scenes = False
+
+    def __init__(self, loop, reader, writer, pacing=None):
+        super().__init__(loop, reader, writer, pacing=pacing, color=False)
+        self.narration = []
+
+    def supports_color(self):
+        """Send plain text; clients style events themselves."""
+        return False
+
+    def terminal_width(self):
+        """Leave wrapping to the client."""
+        return None
+
+    def write(self, text):
+        """Collect story text until the next event or prompt."""
+        self.narration.append(text)
+
+    def flush_narration(self):
+        """Queue collected story text as one narration event."""
+        text = SGR_ESCAPE.sub("", "".join(self.narration)).strip("\n")
+        self.narration = []
+        if text.strip():
+            self.pending.append(render_json(Narration(text)) + "\n")
+
+    def emit(self, event):
+        """Queue one typed event, after any story text that led up to it."""
+        self.flush_narration()
+        self.pending.append(render_json(event) + "\n")
+
+    def flush(self):
+        """Send queued narration and events in one write."""
+        self.flush_narration()
+        super().flush()
+
+    def input(self, prompt):
+        """Send a prompt event and block until the client answers."""
+        self.emit(Prompt(SGR_ESCAPE.sub("", prompt).strip()))
+        self.flush()
+        return self.receive()
+
+
+def run_session(game):
+    """Run a full game session, treating a closed connection as a normal exit."""
+    try:
+        game.run()
+    except (SystemExit, KeyboardInterrupt):
+        pass
+    finally:
+        game.io.flush()
+
+
+class GameServer:
+    """Accept TCP clients and give each one its own Game on a shared worker pool."""
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        max_sessions=DEFAULT_MAX_SESSIONS,
+        pacing="instant",
+        color=True,
+        protocol="screen",
+    ):
+        if pacing not in SESSION_PACING_PROFILES:
+            raise ValueError(f"Sessions cannot use the '{pacing}' pacing profile.")
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.pacing = pacing
+        self.color = color
+        self.protocol = protocol
+        self.executor = ThreadPoolExecutor(max_workers=max_sessions, thread_name_prefix="aethelgard-session")
+        self.sessions = set()
+
+    async def handle_client(self, reader, writer):
+        """Host one client connection until its session ends."""
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"The Wayfarer's Respite is full. Try again soon.\r\n")
+            await writer.drain()
+            writer.close()
+            return
+        loop = asyncio.get_running_loop()
+        if self.protocol == "events":
+            io = EventSessionIO(loop, reader, writer, pacing=self.pacing)
+        else:
+            io = SessionIO(loop, reader, writer, pacing=self.pacing, color=self.color)
+        self.sessions.add(io)
+        try:
+            await loop.run_in_executor(self.executor, run_session, Game(io=io))
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.sessions.discard(io)
+            writer.close()
+
+    async def serve(self):
+        """Listen for clients until cancelled."""
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Echoes of Aethelgard server listening on {addresses}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for io in list(self.sessions):
+                io.writer.close()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the server."""
+    parser = argparse.ArgumentParser(description="Host Echoes of Aethelgard sessions over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=DEFAULT_MAX_SESSIONS,
+        help=f"concurrent sessions allowed (default: {DEFAULT_MAX_SESSIONS})",
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=SESSION_PACING_PROFILES,
+        default="instant",
+        help="text pacing profile for sessions (default: instant)",
+    )
+    parser.add_argument("--no-color", action="store_true", help="start sessions with ANSI colors off")
+    parser.add_argument(
+        "--protocol",
+        choices=PROTOCOLS,
+        default="screen",
+        help="send rendered screens or typed JSON events to clients (default: screen)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the server."""
+    args = parse_args(argv)
+    server = GameServer(
+        args.host,
+        args.port,
+        args.max_sessions,
+        args.pacing,
+        color=not args.no_color,
+        protocol=args.protocol,
+    )
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\nShutting down the Echoes of Aethelgard server.")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""Monte Carlo combat simulator for balancing Echoes of Aethelgard builds and enemies.
+
+Every fight in a batch runs in lockstep as NumPy arrays, following the rules of
+Game.player_attack, player_cast, enemy_attack, apply_life_steal, weapon curse
+procs and attempt_flee. Requires NumPy (pip install numpy).
+"""
+
+import argparse
+import math
+import sys
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from echoes_of_aethelgard import (
+    CLASS_DEFS,
+    ENEMY_DAMAGE_MULT_PER_LEVEL,
+    ENEMY_DEFENSE_MULT_PER_LEVEL,
+    ENEMY_HEALTH_MULT_PER_LEVEL,
+    ENEMY_LEVEL_VARIANCE,
+    ENEMY_TEMPLATES,
+    ITEM_TEMPLATES,
+    RARITY_ORDER,
+    SPELL_DEFS,
+    Enemy,
+    HeadlessIO,
+    Item,
+    Player,
+    clamp,
+)
+
+DEFAULT_FIGHTS = 100000
+DEFAULT_LEVELS = (1, 3, 5)
+DEFAULT_MAX_TURNS = 200
+DEFAULT_SPELL = "echo bolt"
+TACTICS = ("attack", "cast")
+WON, FLED, DIED, TIMED_OUT = range(4)
+
+PlayerProfile = namedtuple(
+    "PlayerProfile",
+    "build level max_health max_mana magic agility attack_power defense "
+    "life_steal_percent curse_chance curse_damage is_staff magic_bonus spell_cost spell_base_damage",
+)
+EnemyStats = namedtuple("EnemyStats", "levels health damage defense")
+FightResults = namedtuple("FightResults", "outcome turns health")
+SimRow = namedtuple(
+    "SimRow",
+    "build level enemy fights win_rate flee_rate death_rate "
+    "turns_mean turns_p50 turns_p90 health_mean health_p10 health_p50",
+)
+
+
+# -----------------------------
+# Combatants
+# -----------------------------
+
+
+def build_player(class_name, level, weapon=None, armor=None, rarity="Common"):
+    """Build a Player as the game would have them at a level, spending every point on the class stat."""
+    class_info = CLASS_DEFS[class_name]
+    player = Player("Sim", "Whispering Ruins", io=HeadlessIO())
+    player.class_name = class_name
+    for stat, bonus in class_info["buff"].items():
+        setattr(player, stat, getattr(player, stat) + bonus)
+    gained = level - 1
+    player.level = level
+    player.max_health += 10 * gained
+    player.max_mana += 5 * gained
+    primary_stat = next(iter(class_info["buff"]))
+    setattr(player, primary_stat, getattr(player, primary_stat) + gained)
+    player.health = player.max_health
+    player.mana = player.max_mana
+    player.equipped_weapon = Item(ITEM_TEMPLATES[weapon or class_info["weapon"]], rarity)
+    if armor:
+        player.equipped_armor = Item(ITEM_TEMPLATES[armor], rarity)
+    return player
+
+
+def player_profile(player, spell=DEFAULT_SPELL):
+    """Flatten a Player into the numbers the combat rules read."""
+    weapon = player.equipped_weapon
+    effect = weapon.effect if weapon else {}
+    is_staff = bool(weapon) and (
+        weapon.weapon_type == "magic_staff" or "mana_cost_reduction_percent" in effect
+    )
+    spell_data = SPELL_DEFS[spell]
+    spell_cost = spell_data["mana_cost"]
+    reduction_percent = effect.get("mana_cost_reduction_percent", 0) if is_staff else 0
+    if reduction_percent:
+        reduction = max(1, int(math.ceil(spell_cost * reduction_percent / 100)))
+        spell_cost = max(1, int(spell_cost - reduction))
+    weapon_name = weapon.name if weapon else "fists"
+    return PlayerProfile(
+        build=f"{player.class_name} ({weapon_name})",
+        level=player.level,
+        max_health=player.max_health,
+        max_mana=player.max_mana,
+        magic=player.magic,
+        agility=player.agility,
+        attack_power=player.attack_power(),
+        defense=player.defense(),
+        life_steal_percent=effect.get("life_steal_percent", 0),
+        curse_chance=effect.get("curse_chance", 0),
+        curse_damage=effect.get("curse_damage", 0),
+        is_staff=is_staff,
+        magic_bonus=effect.get("magic", 0),
+        spell_cost=spell_cost,
+        spell_base_damage=spell_data["base_damage"],
+    )
+
+
+def spell_damage(profile, template):
+    """Return the fixed damage a spell deals to an enemy, after magic resistance."""
+    raw_damage = profile.spell_base_damage + ((profile.magic + profile.magic_bonus) * 2)
+    resistance = max(0.0, min(1.0, template.magic_resistance))
+    effective_resistance = resistance / 2 if profile.is_staff else resistance
+    return max(0, int(round(raw_damage * (1 - effective_resistance))))
+
+
+def enemy_level_range(template, player_level, variance):
+    """Return the levels an enemy can appear at against a player, as scale_enemy_for_player picks them."""
+    if template.name == "The Chronos Tyrant":
+        return [max(1, player_level + 1)]
+    spread = ENEMY_LEVEL_VARIANCE if variance else 0
+    return sorted({max(1, player_level + offset) for offset in range(-spread, spread + 1)})
+
+
+def enemy_stats(template, player_level, variance):
+    """Scale an enemy to each level it can appear at and return the stats as lookup arrays."""
+    levels = enemy_level_range(template, player_level, variance)
+    health, damage, defense = [], [], []
+    for level in levels:
+        enemy = Enemy.from_template(template)
+        enemy.apply_level(
+            level,
+            ENEMY_HEALTH_MULT_PER_LEVEL,
+            ENEMY_DAMAGE_MULT_PER_LEVEL,
+            ENEMY_DEFENSE_MULT_PER_LEVEL,
+        )
+        health.append(enemy.max_health)
+        damage.append(enemy.damage)
+        defense.append(enemy.defense)
+    return EnemyStats(np.array(levels), np.array(health), np.array(damage), np.array(defense))
+
+
+# -----------------------------
+# Simulation
+# -----------------------------
+
+
+def roll_levels(stats, player_level, fights, rng):
+    """Pick each fight's enemy level the way scale_enemy_for_player does, clamped at level 1."""
+    if len(stats.levels) == 1:
+        return np.zeros(fights, dtype=np.intp)
+    offsets = rng.integers(-ENEMY_LEVEL_VARIANCE, ENEMY_LEVEL_VARIANCE + 1, fights)
+    levels = np.maximum(1, player_level + offsets)
+    return np.searchsorted(stats.levels, levels)
+
+
+def simulate(
+    profile,
+    template,
+    fights,
+    rng,
+    tactic="attack",
+    flee_below=0,
+    variance=False,
+    max_turns=DEFAULT_MAX_TURNS,
+):
+    """Run many independent fights at once and return each one's outcome, turns and health left.
+
+    A fight ends when the enemy dies, the player dies, the player escapes, or
+    max_turns player actions pass. Each turn the player flees if their health is
+    under flee_below percent, casts if the tactic is "cast" and mana allows, and
+    attacks otherwise; the enemy then strikes back unless the fight is over.
+    """
+    stats = enemy_stats(template, profile.level, variance)
+    picks = roll_levels(stats, profile.level, fights, rng)
+    enemy_health = stats.health[picks]
+    enemy_damage = stats.damage[picks]
+    enemy_defense = stats.defense[picks]
+    player_health = np.full(fights, profile.max_health, dtype=np.int64)
+    mana = np.full(fights, profile.max_mana, dtype=np.int64)
+    index = np.arange(fights)
+
+    outcome = np.full(fights, TIMED_OUT, dtype=np.int8)
+    turns = np.full(fights, max_turns, dtype=np.int32)
+    health = np.zeros(fights, dtype=np.int64)
+
+    hit_chance = clamp(70 + (profile.agility * 2) - (template.agility * 3), 5, 95)
+    enemy_hit_chance = clamp(70 + (template.agility * 2) - (profile.agility * 1), 5, 95)
+    flee_chance = clamp(50 + (profile.agility * 2) - (template.agility * 4), 5, 95)
+    cast_damage = spell_damage(profile, template)
+    flee_threshold = profile.max_health * flee_below
+
+    for turn in range(1, max_turns + 1):
+        count = index.size
+        if not count:
+            break
+        fleeing = player_health * 100 < flee_threshold
+        if tactic == "cast":
+            casting = ~fleeing & (mana >= profile.spell_cost)
+        else:
+            casting = np.zeros(count, dtype=bool)
+        hits = ~fleeing & ~casting & (rng.integers(1, 101, count) <= hit_chance)
+
+        swing = np.maximum(0, profile.attack_power + rng.integers(0, 5, count) - enemy_defense)
+        damage = np.where(hits, swing, 0)
+        damage[casting] = cast_damage
+        mana[casting] -= profile.spell_cost
+        enemy_health = np.maximum(0, enemy_health - damage)
+
+        if profile.life_steal_percent > 0:
+            heal = np.maximum(1, np.ceil(damage * profile.life_steal_percent / 100).astype(np.int64))
+            heal[damage <= 0] = 0
+            player_health = np.minimum(profile.max_health, player_health + heal)
+        if profile.curse_chance:
+            cursed = hits & (rng.integers(1, 101, count) <= profile.curse_chance)
+            player_health = np.maximum(0, player_health - np.where(cursed, profile.curse_damage, 0))
+
+        escaped = fleeing & (rng.integers(1, 101, count) <= flee_chance)
+        died = player_health <= 0
+        won = ~died & (enemy_health <= 0)
+        struck = ~(died | won | escaped) & (rng.integers(1, 101, count) <= enemy_hit_chance)
+        blow = np.maximum(1, enemy_damage + rng.integers(0, 5, count) - profile.defense)
+        player_health = np.maximum(0, player_health - np.where(struck, blow, 0))
+        died |= player_health <= 0
+
+        done = died | won | escaped
+        if done.any():
+            finished = index[done]
+            outcome[finished] = np.select([won[done], escaped[done]], [WON, FLED], DIED)
+            turns[finished] = turn
+            health[finished] = player_health[done]
+            keep = ~done
+            index = index[keep]
+            player_health = player_health[keep]
+            mana = mana[keep]
+            enemy_health = enemy_health[keep]
+            enemy_damage = enemy_damage[keep]
+            enemy_defense = enemy_defense[keep]
+    return FightResults(outcome, turns, health)
+
+
+def summarize(profile, template, results):
+    """Reduce a batch of fights to win, flee and death rates plus turn and health spreads for wins."""
+    fights = results.outcome.size
+    won = results.outcome == WON
+    if won.any():
+        turns = results.turns[won]
+        health = results.health[won]
+        turns_spread = (turns.mean(), np.percentile(turns, 50), np.percentile(turns, 90))
+        health_spread = (health.mean(), np.percentile(health, 10), np.percentile(health, 50))
+    else:
+        turns_spread = health_spread = (None, None, None)
+    return SimRow(
+        profile.build,
+        profile.level,
+        template.name,
+        fights,
+        won.mean(),
+        (results.outcome == FLED).mean(),
+        (results.outcome == DIED).mean(),
+        *turns_spread,
+        *health_spread,
+    )
+
+
+# -----------------------------
+# Command line
+# -----------------------------
+
+
+def parse_levels(text):
+    """Parse a comma-separated list of player levels."""
+    try:
+        levels = [int(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid level list {text!r}")
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError("levels must be positive integers")
+    return levels
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the simulator."""
+    weapons = [name for name, template in ITEM_TEMPLATES.items() if template.item_type == "weapon"]
+    armors = [name for name, template in ITEM_TEMPLATES.items() if template.item_type == "armor"]
+    parser = argparse.ArgumentParser(description="Simulate Echoes of Aethelgard fights in bulk to tune balance.")
+    parser.add_argument(
+        "--fights",
+        type=int,
+        default=DEFAULT_FIGHTS,
+        help=f"fights per (build, level, enemy) cell (default: {DEFAULT_FIGHTS})",
+    )
+    parser.add_argument(
+        "--levels",
+        type=parse_levels,
+        default=list(DEFAULT_LEVELS),
+        help=f"comma-separated player levels (default: {','.join(map(str, DEFAULT_LEVELS))})",
+    )
+    parser.add_argument(
+        "--class",
+        dest="classes",
+        action="append",
+        choices=list(CLASS_DEFS),
+        help="class to simulate; repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--enemy",
+        dest="enemies",
+        action="append",
+        choices=list(ENEMY_TEMPLATES),
+        metavar="NAME",
+        help="enemy to fight; repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--weapon",
+        choices=weapons,
+        metavar="NAME",
+        help="weapon for every build (default: the class starting weapon)",
+    )
+    parser.add_argument("--armor", choices=armors, metavar="NAME", help="armor for every build (default: none)")
+    parser.add_argument("--rarity", choices=RARITY_ORDER, default="Common", help="gear rarity (default: Common)")
+    parser.add_argument(
+        "--tactic",
+        choices=TACTICS,
+        default="attack",
+        help="attack every turn, or cast while mana lasts (default: attack)",
+    )
+    parser.add_argument(
+        "--spell",
+        choices=sorted(SPELL_DEFS),
+        default=DEFAULT_SPELL,
+        help=f"spell for the cast tactic (default: {DEFAULT_SPELL})",
+    )
+    parser.add_argument(
+        "--flee-below",
+        type=int,
+        default=0,
+        metavar="PERCENT",
+        help="try to flee while health is under this percent (default: never)",
+    )
+    parser.add_argument(
+        "--variance",
+        action="store_true",
+        help=f"vary enemy levels by up to {ENEMY_LEVEL_VARIANCE} around the player's, as the game does",
+    )
+    parser.add_argument(
+        "--max-turns",
+        type=int,
+        default=DEFAULT_MAX_TURNS,
+        help=f"player turns before a fight counts as a stalemate (default: {DEFAULT_MAX_TURNS})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    return parser.parse_args(argv)
+
+
+def format_stat(value, width, precision=1):
+    """Format a statistic, showing a dash when no fight produced it."""
+    if value is None:
+        return f"{'-':>{width}}"
+    return f"{value:>{width}.{precision}f}"
+
+
+def format_row(row):
+    """Format one simulated cell as a table line."""
+    return (
+        f"{row.build:<32}{row.level:>4}  {row.enemy:<24}"
+        f"{row.win_rate * 100:>7.1f}{row.flee_rate * 100:>7.1f}{row.death_rate * 100:>7.1f}"
+        f"{format_stat(row.turns_mean, 7)}{format_stat(row.turns_p50, 6, 0)}{format_stat(row.turns_p90, 6, 0)}"
+        f"{format_stat(row.health_mean, 9)}{format_stat(row.health_p10, 7, 0)}{format_stat(row.health_p50, 7, 0)}"
+    )
+
+
+def main(argv=None):
+    """Simulate every requested (build, level, enemy) cell and print a summary table."""
+    args = parse_args(argv)
+    if np is None:
+        print("aethelgard_sim needs NumPy; install it with: pip install numpy", file=sys.stderr)
+        return 1
+    rng = np.random.default_rng(args.seed)
+    classes = args.classes or list(CLASS_DEFS)
+    enemies = args.enemies or list(ENEMY_TEMPLATES)
+    print(
+        f"{'build':<32}{'lvl':>4}  {'enemy':<24}{'win %':>7}{'flee %':>7}{'die %':>7}"
+        f"{'turns':>7}{'p50':>6}{'p90':>6}{'hp left':>9}{'p10':>7}{'p50':>7}"
+    )
+    for class_name in classes:
+        for level in args.levels:
+            player = build_player(class_name, level, args.weapon, args.armor, args.rarity)
+            profile = player_profile(player, args.spell)
+            for enemy_name in enemies:
+                template = ENEMY_TEMPLATES[enemy_name]
+                results = simulate(
+                    profile,
+                    template,
+                    args.fights,
+                    rng,
+                    tactic=args.tactic,
+                    flee_below=args.flee_below,
+                    variance=args.variance,
+                    max_turns=args.max_turns,
+                )
+                row = summarize(profile, template, results)
+                print(format_row(row))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,48 @@
 #!/usr/bin/env python3
 """Echoes of Aethelgard - a text-based RPG."""
 
+import argparse
 import json
 import math
 import os
+import queue
 import random
+import re
+import shutil
 import sys
+import threading
 import time
+from collections import deque, namedtuple
+from functools import lru_cache
+from itertools import islice
 from copy import deepcopy
 from datetime import datetime
 
-from aethelgard_data import ENEMY_DEFS, ITEM_DEFS, LOCATION_DEFS, WIN_ENDGAME_ART
+from aethelgard_events import (
+    EVENT_RENDERERS,
+    CombatEnded,
+    Damage,
+    GameEnded,
+    HordeSpread,
+    LevelUp,
+    LootDropped,
+    Moved,
+    QuestAccepted,
+    QuestCompleted,
+)
+from aethelgard_data import (
+    ENEMY_DEFS,
+    EXIT_LOCK_DEFAULT_MESSAGE,
+    EXIT_LOCK_RULES,
+    ITEM_DEFS,
+    LOCATION_DEFS,
+    WIN_ENDGAME_ART,
+)
 
 # -----------------------------
 # Utility helpers
 # -----------------------------
 
-USE_COLOR = sys.stdout.isatty()
 SAVE_DIR = os.path.dirname(os.path.abspath(__file__))
 LEGACY_SAVE_FILE = os.path.join(SAVE_DIR, "savegame.json")
 SAVE_SLOT_TEMPLATE = os.path.join(SAVE_DIR, "savegame_slot{}.json")
@@ -31,6 +57,24 @@ ENEMY_LEVEL_VARIANCE = 1
 ENEMY_HEALTH_MULT_PER_LEVEL = 0.15
 ENEMY_DAMAGE_MULT_PER_LEVEL = 0.10
 ENEMY_DEFENSE_MULT_PER_LEVEL = 0.07
+DIRECTION_ALIASES = {
+    "n": "north",
+    "s": "south",
+    "e": "east",
+    "w": "west",
+    "up": "north",
+    "down": "south",
+    "left": "west",
+    "right": "east",
+}
+MOVEMENT_VERBS = ("north", "south", "east", "west") + tuple(DIRECTION_ALIASES)
+COMMAND_SEPARATOR = ";"
+HORDE_LOCKOUT_LOCATION = "The Temporal Breach Apex"
+FRAME_SCROLL_MIN_SAVING = 24
+ANSI_ESCAPE = re.compile(r"\033\[[0-9;?]*[A-Za-z]")
+SGR_ESCAPE = re.compile(r"\033\[[0-9;]*m")
+CLEAR_SCREEN = "\033[2J\033[H"
+DIM_STYLE = "2;37"
 RARITY_TABLE = (
     ("Common", 0.50, 1.0),
     ("Uncommon", 0.30, 1.1),
@@ -40,6 +84,13 @@ RARITY_TABLE = (
 )
 RARITY_ORDER = [name for name, _, _ in RARITY_TABLE]
 RARITY_MULTIPLIERS = {name: multiplier for name, _, multiplier in RARITY_TABLE}
+RARITY_COLORS = {
+    "Common": "37",
+    "Uncommon": "32",
+    "Rare": "34",
+    "Epic": "35",
+    "Legendary": "33",
+}
 UPGRADE_COST_MULTIPLIERS = {
     "Common": 0.50,
     "Uncommon": 1.00,
@@ -177,25 +228,115 @@ MINIMAP_EDGES = [
     ("Barren Peaks", "Blighted Outpost"),
     ("Blighted Outpost", "The Emberforge"),
 ]
+MINIMAP_WIDTH = max(data["pos"][0] + MINIMAP_LABEL_WIDTH for data in MINIMAP_LAYOUT.values())
+MINIMAP_HEIGHT = max(data["pos"][1] for data in MINIMAP_LAYOUT.values()) + 1
+MINIMAP_ESCAPE_LOCATION = "Shattered Library"
+MINIMAP_DIM_STYLE = DIM_STYLE
+
+
+def compile_minimap_geometry():
+    """Precompute minimap edge and lock-marker cells, dropping any that a label covers."""
+    label_cells = {
+        (data["pos"][0] + offset, data["pos"][1])
+        for data in MINIMAP_LAYOUT.values()
+        for offset in range(MINIMAP_LABEL_WIDTH)
+    }
+    edges = []
+    locks = {}
+    for start, end in MINIMAP_EDGES:
+        x1, y1 = MINIMAP_LAYOUT[start]["pos"]
+        x2, y2 = MINIMAP_LAYOUT[end]["pos"]
+        if y1 == y2:
+            cells = [(x, y1) for x in range(min(x1, x2) + MINIMAP_LABEL_WIDTH, max(x1, x2))]
+            glyphs = ("-", ".")
+        elif x1 == x2:
+            cells = [(x1 + 1, y) for y in range(min(y1, y2) + 1, max(y1, y2))]
+            glyphs = ("|", ":")
+        else:
+            continue
+        cells = tuple(cell for cell in cells if cell not in label_cells)
+        edges.append((start, end, cells, glyphs))
+    for origin, data in MINIMAP_LAYOUT.items():
+        x1, y1 = data["pos"]
+        for destination, other in MINIMAP_LAYOUT.items():
+            x2, y2 = other["pos"]
+            if origin == destination:
+                continue
+            if y1 == y2:
+                cell = (x1 + MINIMAP_LABEL_WIDTH if x2 > x1 else x1 - 1, y1)
+            elif x1 == x2:
+                cell = (x1 + 1, y1 + 1 if y2 > y1 else y1 - 1)
+            else:
+                continue
+            if 0 <= cell[0] < MINIMAP_WIDTH and 0 <= cell[1] < MINIMAP_HEIGHT and cell not in label_cells:
+                locks[origin, destination] = cell
+    return tuple(edges), locks
 
 
-def clear_screen():
-    """Clear the terminal screen for a fresh scene."""
-    print("\033[2J\033[H", end="")
+MINIMAP_EDGE_CELLS, MINIMAP_LOCK_CELLS = compile_minimap_geometry()
 
 
 def pause(seconds=0.6):
     """Small pacing delay to avoid overwhelming the player with text."""
+    sys.stdout.flush()
     time.sleep(seconds)
 
 
+STYLE = threading.local()
+
+
+def styling_enabled():
+    """Return whether the session running on this thread shows colors at all."""
+    return getattr(STYLE, "enabled", True)
+
+
+def ansi_text(text, color_code):
+    """Wrap text in ANSI colors unconditionally, for results shared across sessions."""
+    return f"\033[{color_code}m{text}\033[0m"
+
+
 def color_text(text, color_code):
-    """Wrap text in ANSI colors when enabled; otherwise return plain text."""
-    if not USE_COLOR:
+    """Wrap text in ANSI colors, or skip the work when this thread's session has color off.
+
+    Strings cached across sessions always carry colors; sinks without color strip them on output.
+    """
+    if not getattr(STYLE, "enabled", True):
         return text
     return f"\033[{color_code}m{text}\033[0m"
 
 
+@lru_cache(maxsize=None)
+def cached_style(text, color_code):
+    """Return colored text for a fixed string, formatting each one only once."""
+    return ansi_text(text, color_code)
+
+
+def styled(text, color_code):
+    """Return colored text for fixed strings, or the text itself when color is off."""
+    if not styling_enabled():
+        return text
+    return cached_style(text, color_code)
+
+
+@lru_cache(maxsize=1024)
+def cached_item_name(name, rarity, dim):
+    """Return an item name with its rarity tag, colored by rarity."""
+    if rarity:
+        label = f"[{rarity}] {name}"
+        color = RARITY_COLORS.get(rarity)
+        if color:
+            return ansi_text(label, f"{'2' if dim else '1'};{color}")
+        return ansi_text(label, DIM_STYLE) if dim else label
+    return ansi_text(name, DIM_STYLE) if dim else name
+
+
+def styled_item_name(name, rarity, dim=False):
+    """Return an item name with its rarity tag, colored by rarity when color is on."""
+    if not styling_enabled():
+        return f"[{rarity}] {name}" if rarity else name
+    return cached_item_name(name, rarity, dim)
+
+
 def headline(text):
     """Format a header line for emphasis."""
     return color_text(text, "1;36")
@@ -223,6 +364,11 @@ def slow_print(lines, delay=0.3):
         pause(delay)
 
 
+def visible_width(text):
+    """Return the number of terminal columns text occupies once escapes are removed."""
+    return len(ANSI_ESCAPE.sub("", text))
+
+
 def normalize_name(text):
     """Normalize user input for matching items and NPCs."""
     return text.strip().lower()
@@ -242,48 +388,841 @@ def clamp(value, minimum, maximum):
     return max(minimum, min(maximum, value))
 
 
+# -----------------------------
+# Name resolution
+# -----------------------------
+
+NAME_GRAM_SIZE = 3
+NAME_GRAMS = {}
+KNOWN_NAMES = set()
+NAME_INDEX_LOCK = threading.Lock()
+
+
+def name_grams(name, sizes=range(1, NAME_GRAM_SIZE + 1)):
+    """Return every substring of a name up to NAME_GRAM_SIZE characters long."""
+    return {name[start:start + size] for size in sizes for start in range(len(name) - size + 1)}
+
+
+def register_name(name):
+    """Add a normalized name to the process-wide substring index."""
+    with NAME_INDEX_LOCK:
+        if name in KNOWN_NAMES:
+            return
+        for gram in name_grams(name):
+            NAME_GRAMS.setdefault(gram, set()).add(name)
+        KNOWN_NAMES.add(name)
+        names_containing.cache_clear()
+
+
+@lru_cache(maxsize=512)
+def names_containing(fragment):
+    """Return the known normalized names that contain a fragment."""
+    if len(fragment) <= NAME_GRAM_SIZE:
+        return frozenset(NAME_GRAMS.get(fragment, ()))
+    grams = sorted(
+        (NAME_GRAMS.get(gram, frozenset()) for gram in name_grams(fragment, (NAME_GRAM_SIZE,))),
+        key=len,
+    )
+    candidates = set(grams[0])
+    for names in grams[1:]:
+        candidates &= names
+    return frozenset(name for name in candidates if fragment in name)
+
+
+@lru_cache(maxsize=512)
+def parse_item_query(item_name):
+    """Normalize item queries and extract any rarity tag."""
+    normalized = normalize_name(item_name).replace("[", "").replace("]", "")
+    rarity = None
+    for name in RARITY_MULTIPLIERS:
+        tier = name.lower()
+        if tier in normalized:
+            rarity = name
+            normalized = normalized.replace(tier, "").strip()
+            break
+    return normalized, rarity
+
+
+for known_name in ITEM_DEFS:
+    register_name(normalize_name(known_name))
+for location_data in LOCATION_DEFS.values():
+    for npc_data in location_data.get("npcs", []):
+        register_name(normalize_name(npc_data["name"]))
+
+
+# -----------------------------
+# Text layout
+# -----------------------------
+
+SGR_RESET = "\033[0m"
+WRAP_MIN_WIDTH = 20
+WRAP_MAX_WIDTH = 240
+
+
+def wrap_line(line, width):
+    """Break one over-wide line at spaces, reopening any active color on each new row."""
+    body = line.lstrip(" ")
+    indent = line[: len(line) - len(body)]
+    if len(indent) * 2 >= width:
+        indent = ""
+    rows = []
+    current = indent
+    current_width = len(indent)
+    active = ""
+    for word in body.split(" "):
+        if not word:
+            continue
+        word_width = visible_width(word)
+        if current_width > len(indent) and current_width + 1 + word_width > width:
+            rows.append(current + SGR_RESET if active else current)
+            current = indent + active
+            current_width = len(indent)
+        elif current_width > len(indent):
+            current += " "
+            current_width += 1
+        current += word
+        current_width += word_width
+        for code in SGR_ESCAPE.findall(word):
+            active = "" if code == SGR_RESET else active + code
+    rows.append(current)
+    return rows
+
+
+@lru_cache(maxsize=1024)
+def wrap_text(text, width):
+    """Wrap text to a column width; lines that already fit, such as art, are kept as-is."""
+    lines = []
+    for line in text.split("\n"):
+        if visible_width(line) <= width:
+            lines.append(line)
+        else:
+            lines.extend(wrap_line(line, width))
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=512)
+def summarize_text(text, max_len=90):
+    """Return the first sentence of text on one line, shortened to max_len."""
+    summary = " ".join(text.split())
+    for sep in (".", "!", "?"):
+        index = summary.find(sep)
+        if index != -1 and index + 1 < len(summary):
+            summary = summary[: index + 1]
+            break
+    if len(summary) > max_len:
+        summary = summary[: max_len - 3].rstrip() + "..."
+    return summary
+
+
+# -----------------------------
+# Pacing profiles
+# -----------------------------
+
+
+class SleepPacing:
+    """Interactive pacing: block for the full delay so a human can keep up."""
+
+    blocking = True
+    records_positions = False
+
+    def pause(self, seconds, position=None):
+        """Sleep for the requested delay."""
+        pause(seconds)
+
+
+class InstantPacing:
+    """Zero-delay pacing for servers, bots, and test harnesses."""
+
+    blocking = False
+    records_positions = False
+
+    def pause(self, seconds, position=None):
+        """Skip the delay entirely."""
+
+
+class VirtualClockPacing:
+    """Record intended delays on a virtual clock so a client can replay them."""
+
+    blocking = False
+    records_positions = True
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.timeline = []
+
+    def pause(self, seconds, position=None):
+        """Advance the virtual clock and note where in the output the delay belongs."""
+        self.timeline.append((self.elapsed, seconds, position))
+        self.elapsed += seconds
+
+    def drain(self):
+        """Return and forget the recorded delays."""
+        timeline = self.timeline
+        self.timeline = []
+        return timeline
+
+
+PACING_PROFILES = {
+    "interactive": SleepPacing,
+    "instant": InstantPacing,
+    "virtual": VirtualClockPacing,
+}
+
+
+def make_pacing(profile):
+    """Return a pacing object for a profile name, passing pacing objects through."""
+    if not isinstance(profile, str):
+        return profile
+    if profile not in PACING_PROFILES:
+        raise ValueError(f"Unknown pacing profile '{profile}'.")
+    return PACING_PROFILES[profile]()
+
+
+# -----------------------------
+# I/O ports
+# -----------------------------
+
+
+class FrameRenderer:
+    """Compose each scene into a line buffer and redraw only the lines that changed.
+
+    Between begin() and the next present() writes are held in the frame; present()
+    diffs the frame against the lines already on screen and returns the escape
+    sequences that bring the terminal up to date. A block of lines that moved up,
+    such as a combat log gaining entries, is scrolled inside a margin region rather
+    than repainted. Frames taller than the terminal would scroll the whole screen,
+    so they fall back to a full clear-and-reprint.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.screen = None
+        self.frame = None
+
+    def begin(self):
+        """Start composing a new scene."""
+        self.frame = [""]
+
+    def write(self, text):
+        """Add text to the frame being composed; return text that should go out now."""
+        if self.frame is None:
+            return text
+        lines = text.split("\n")
+        self.frame[-1] += lines[0]
+        self.frame.extend(lines[1:])
+        return ""
+
+    def echo(self, line):
+        """Record a line the terminal echoed itself after the frame was presented."""
+        if self.frame is None:
+            return
+        self.write(f"{line}\n")
+        columns, rows = self.size()
+        if self.layout(self.frame, columns)[1] > rows:
+            # The echoed newline scrolled the terminal.
+            self.screen = None
+            self.frame = None
+        else:
+            self.screen = list(self.frame)
+
+    def layout(self, lines, columns):
+        """Return the first terminal row of each line, plus the rows used, allowing for wrapping."""
+        starts = []
+        row = 0
+        for line in lines:
+            starts.append(row)
+            row += max(1, -(-visible_width(line) // columns))
+        return starts, row
+
+    def scroll(self, old, old_starts, old_used, frame, starts):
+        """Return escapes and the resulting screen for the most useful upward scroll, or None."""
+        positions = {}
+        for index, line in enumerate(old):
+            if line:
+                positions.setdefault(line, []).append(index)
+        best = None
+        best_saving = FRAME_SCROLL_MIN_SAVING
+        for first, line in enumerate(frame):
+            if first < len(old) and old[first] == line:
+                continue
+            if first >= len(old) or starts[first] != old_starts[first]:
+                continue
+            for source in positions.get(line, ()):
+                shift = source - first
+                if shift <= 0 or (first and source > 0 and old[source - 1] == frame[first - 1]):
+                    continue
+                length = 0
+                saving = 0
+                while (
+                    first + length < len(frame)
+                    and source + length < len(old)
+                    and frame[first + length] == old[source + length]
+                ):
+                    saving += visible_width(frame[first + length])
+                    length += 1
+                if saving > best_saving:
+                    best_saving = saving
+                    best = (first, source, length)
+        if best is None:
+            return None
+        first, source, length = best
+        top = old_starts[first]
+        amount = old_starts[source] - top
+        end = source + length
+        bottom = (old_starts[end] if end < len(old) else old_used) - 1
+        data = f"\033[{top + 1};{bottom + 1}r\033[{bottom + 1};1H" + "\n" * amount + "\033[r"
+        return data, old[:first] + frame[first : first + length] + [""] * amount + old[end:]
+
+    def present(self):
+        """Return the output that makes the screen match the composed frame."""
+        frame = self.frame
+        if frame is None:
+            return ""
+        columns, rows = self.size()
+        starts, used = self.layout(frame, columns)
+        if used > rows:
+            # The terminal will scroll, so line addresses are lost until the next scene.
+            self.screen = None
+            self.frame = None
+            return CLEAR_SCREEN + "\n".join(frame)
+        old = self.screen
+        self.screen = list(frame)
+        if old is None:
+            return CLEAR_SCREEN + "\n".join(frame)
+        old_starts, old_used = self.layout(old, columns)
+        parts = []
+        scrolled = self.scroll(old, old_starts, old_used, frame, starts)
+        if scrolled:
+            data, old = scrolled
+            parts.append(data)
+            old_starts, old_used = self.layout(old, columns)
+        for index, line in enumerate(frame):
+            moved = index >= len(old) or old_starts[index] != starts[index]
+            if not moved and index + 1 < len(old) and index + 1 < len(frame):
+                moved = old_starts[index + 1] != starts[index + 1]
+            if moved:
+                # Everything from here down shifted; repaint the tail in one pass.
+                parts.append(f"\033[{starts[index] + 1};1H\033[J" + "\n".join(frame[index:]))
+                break
+            if old[index] == line:
+                continue
+            parts.append(f"\033[{starts[index] + 1};1H{line}")
+            width = visible_width(line)
+            if not width or width % columns:
+                parts.append("\033[K")
+        else:
+            if old_used > used:
+                parts.append(f"\033[{used + 1};1H\033[J")
+        if parts:
+            width = visible_width(frame[-1])
+            row = starts[-1] + max(0, width - 1) // columns
+            column = width - (row - starts[-1]) * columns
+            parts.append(f"\033[{row + 1};{column + 1}H")
+        return "".join(parts)
+
+
+class GameIO:
+    """Input source and output sink the game talks to instead of the terminal."""
+
+    default_pacing = "instant"
+    renders_scenes = True
+
+    def __init__(self, pacing=None, color=None, width=None):
+        self.pacing = make_pacing(pacing or self.default_pacing)
+        self.use_color = self.supports_color() if color is None else color
+        self.width = self.terminal_width() if width is None else width
+        self.frames = None
+        self.pending = []
+
+    def send(self, data):
+        """Deliver raw output to the sink."""
+        raise NotImplementedError
+
+    def supports_color(self):
+        """Return whether the sink renders ANSI colors when none was requested."""
+        return False
+
+    def terminal_width(self):
+        """Return the column width to wrap text to, or None to leave wrapping to the client."""
+        return None
+
+    def write(self, text):
+        """Buffer text for the sink, holding it in the current frame when one is open."""
+        if self.frames is not None:
+            text = self.frames.write(text)
+        if text:
+            self.pending.append(text)
+
+    def flush(self):
+        """Send buffered text and any composed frame to the sink in a single write."""
+        data = "".join(self.pending)
+        self.pending = []
+        if self.frames is not None:
+            data += self.frames.present()
+        if data and not self.use_color:
+            data = SGR_ESCAPE.sub("", data)
+        if data:
+            self.send(data)
+
+    def emit(self, event):
+        """Receive a typed game event; screen sinks ignore them."""
+
+    def enable_frames(self, size):
+        """Render scenes through a diffing frame buffer sized by the size callable."""
+        self.frames = FrameRenderer(size)
+
+    def input(self, prompt):
+        """Show a prompt and return one line of player input."""
+        raise NotImplementedError
+
+    def print(self, *values, sep=" ", end="\n"):
+        """Write values to the output sink, mirroring the print builtin and wrapping to width."""
+        text = sep.join(str(value) for value in values)
+        if self.width and len(text) > self.width:
+            text = wrap_text(text, self.width)
+        self.write(text + end)
+
+    def clear_screen(self):
+        """Start a fresh scene."""
+        if self.frames is not None:
+            self.frames.begin()
+
+    def position(self):
+        """Return a marker for the current output position, if the sink tracks one."""
+        return None
+
+    def pause(self, seconds=0.6):
+        """Pacing delay between bursts of text, as decided by the pacing profile."""
+        if getattr(self.pacing, "blocking", False):
+            self.flush()
+        position = self.position() if getattr(self.pacing, "records_positions", False) else None
+        self.pacing.pause(seconds, position=position)
+
+    def slow_print(self, lines, delay=0.3):
+        """Print a list of lines with a pacing delay between them."""
+        for line in lines:
+            self.print(line)
+            self.pause(delay)
+
+
+class ConsoleIO(GameIO):
+    """Terminal I/O port: reads stdin and writes stdout."""
+
+    default_pacing = "interactive"
+
+    def __init__(self, pacing=None, color=None, width=None):
+        super().__init__(pacing=pacing, color=color, width=width)
+        if sys.stdout.isatty():
+            self.enable_frames(shutil.get_terminal_size)
+
+    def send(self, data):
+        """Write data straight to stdout."""
+        sys.stdout.write(data)
+
+    def supports_color(self):
+        """Color the output when stdout is a terminal."""
+        return sys.stdout.isatty()
+
+    def terminal_width(self):
+        """Wrap to the terminal's width when stdout is a terminal."""
+        if not sys.stdout.isatty():
+            return None
+        return clamp(shutil.get_terminal_size().columns, WRAP_MIN_WIDTH, WRAP_MAX_WIDTH)
+
+    def flush(self):
+        """Present the composed frame and flush stdout."""
+        super().flush()
+        sys.stdout.flush()
+
+    def input(self, prompt):
+        """Read from stdin, exiting cleanly if the stream closes."""
+        self.write(prompt)
+        self.flush()
+        line = safe_input("")
+        if self.frames is not None:
+            self.frames.echo(line)
+        return line
+
+    def clear_screen(self):
+        """Clear the terminal screen, or open a new frame when diffing is enabled."""
+        if self.frames is not None:
+            self.frames.begin()
+        else:
+            self.write(CLEAR_SCREEN)
+
+
+class HeadlessIO(GameIO):
+    """I/O port for harnesses and servers: queue-fed input, list-collected output."""
+
+    def __init__(self, inputs=None, block=False, timeout=None, pacing=None, color=None, width=None):
+        super().__init__(pacing=pacing, color=color, width=width)
+        self.inputs = queue.Queue()
+        self.output = []
+        self.block = block
+        self.timeout = timeout
+        self.feed(*(inputs or ()))
+
+    def feed(self, *lines):
+        """Queue lines of player input."""
+        for line in lines:
+            self.inputs.put(line)
+
+    def close(self):
+        """Mark the input stream closed once queued lines are consumed."""
+        self.inputs.put(None)
+
+    def send(self, data):
+        """Collect data in the output list."""
+        self.output.append(data)
+
+    def position(self):
+        """Flush buffered text and return the index of the next output chunk."""
+        self.flush()
+        return len(self.output)
+
+    def input(self, prompt):
+        """Return the next queued line; behave like a closed stream when none remain."""
+        self.write(prompt)
+        self.flush()
+        try:
+            line = self.inputs.get(block=self.block, timeout=self.timeout)
+        except queue.Empty:
+            line = None
+        if line is None:
+            self.write("\nInput stream closed. Exiting Echoes of Aethelgard.\n")
+            self.flush()
+            raise SystemExit(0)
+        self.write(f"{line}\n")
+        return line
+
+    def text(self):
+        """Return everything written so far as a single string."""
+        self.flush()
+        return "".join(self.output)
+
+    def drain(self):
+        """Return and forget everything written so far."""
+        text = self.text()
+        self.output = []
+        return text
+
+
+STREAM_FORMATS = tuple(EVENT_RENDERERS)
+
+
+class StreamIO(GameIO):
+    """I/O port for piped and batch runs: screens are dropped, game events are logged.
+
+    Each event becomes one compact line, either plain text or a JSON object, so a
+    scripted run produces a small log instead of redrawn screens.
+    """
+
+    renders_scenes = False
+
+    def __init__(self, stream=None, source=None, fmt="text", pacing=None):
+        super().__init__(pacing=pacing, color=False)
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Unknown stream format '{fmt}'.")
+        self.stream = stream or sys.stdout
+        self.source = source or sys.stdin
+        self.format = fmt
+        self.render = EVENT_RENDERERS[fmt]
+
+    def write(self, text):
+        """Discard screen text; only event records reach the stream."""
+
+    def send(self, data):
+        """Write records to the output stream."""
+        self.stream.write(data)
+
+    def flush(self):
+        """Send buffered records and flush the stream."""
+        super().flush()
+        self.stream.flush()
+
+    def emit(self, event):
+        """Buffer one event as a text or JSON line."""
+        self.pending.append(self.render(event) + "\n")
+
+    def input(self, prompt):
+        """Read the next command line from the input stream, exiting when it closes."""
+        self.flush()
+        line = self.source.readline()
+        if not line:
+            raise SystemExit(0)
+        return line.rstrip("\r\n")
+
+
 # -----------------------------
 # Core data classes
 # -----------------------------
 
 
 class Item:
-    """Represents any interactive object the player can carry or equip."""
+    """Represents any interactive object the player can carry or equip.
 
-    def __init__(
-        self,
-        name,
-        description,
-        item_type,
-        effect=None,
-        weapon_type=None,
-        gold_value=0,
-        major=False,
-        value=None,
-        rarity=None,
-    ):
-        self.name = name
-        self.description = description
-        self.item_type = item_type  # weapon, armor, consumable, quest_item
-        self.weapon_type = weapon_type
-        self.base_effect = deepcopy(effect or {})
-        self.effect = deepcopy(self.base_effect)
-        if value is not None and gold_value == 0:
-            gold_value = value
-        self.base_gold_value = gold_value
-        self.gold_value = gold_value
-        self.value = gold_value
-        self.major = major
+    Shared data lives on an immutable ItemTemplate; an instance only records its rarity.
+    """
+
+    __slots__ = ("template", "rarity")
+
+    def __init__(self, template, rarity=None):
+        self.template = template
         self.rarity = rarity
 
+    @property
+    def name(self):
+        """Return the item's display name."""
+        return self.template.name
+
+    @property
+    def description(self):
+        """Return the item's flavor text."""
+        return self.template.description
+
+    @property
+    def item_type(self):
+        """Return weapon, armor, consumable, or quest_item."""
+        return self.template.item_type
+
+    @property
+    def weapon_type(self):
+        """Return the weapon family, if any."""
+        return self.template.weapon_type
+
+    @property
+    def major(self):
+        """Return True for story-critical items."""
+        return self.template.major
+
+    @property
+    def base_effect(self):
+        """Return the unscaled effect shared by every copy of this item."""
+        return lookup_item_effect(self.template, None)
+
+    @property
+    def effect(self):
+        """Return the shared effect table for this item's rarity; never mutate it."""
+        return lookup_item_effect(self.template, self.rarity)
+
+    @property
+    def base_gold_value(self):
+        """Return the unscaled price."""
+        return self.template.gold_value
+
+    @property
+    def gold_value(self):
+        """Return the item's price, scaled by its rarity tier."""
+        if self.rarity is None:
+            return self.template.gold_value
+        return max(1, int(round(self.template.gold_value * RARITY_MULTIPLIERS.get(self.rarity, 1.0))))
+
+    @property
+    def value(self):
+        """Alias for gold_value kept for older callers."""
+        return self.gold_value
+
     def describe(self):
         """Return a readable description of the item."""
         return f"{self.name}: {self.description}"
 
 
+class NamedCollection:
+    """Ordered collection of named objects with a live normalized-name index.
+
+    Iteration follows insertion order like a list. Exact lookups hash the normalized
+    name; partial lookups go through the shared substring index, so resolution cost
+    tracks the number of matches rather than the size of the collection.
+    """
+
+    __slots__ = ("entries", "by_name", "next_position", "version")
+
+    def __init__(self, objects=()):
+        self.entries = {}
+        self.by_name = {}
+        self.next_position = 0
+        self.version = 0
+        for obj in objects:
+            self.append(obj)
+
+    def __iter__(self):
+        return iter([entry[1] for entry in self.entries.values()])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, obj):
+        return id(obj) in self.entries
+
+    def stack_key(self, obj):
+        """Return the secondary index key for an object, if the collection keeps one."""
+        return None
+
+    def append(self, obj):
+        """Add an object after everything already held."""
+        obj_id = id(obj)
+        if obj_id in self.entries:
+            raise ValueError("object is already in the collection")
+        name = normalize_name(obj.name)
+        if name not in KNOWN_NAMES:
+            register_name(name)
+        entry = (self.next_position, obj, name, self.stack_key(obj))
+        self.entries[obj_id] = entry
+        self.next_position += 1
+        self.index(obj_id, entry)
+        self.version += 1
+
+    def remove(self, obj):
+        """Remove a specific object, raising ValueError if it is not held."""
+        entry = self.entries.pop(id(obj), None)
+        if entry is None:
+            raise ValueError("object is not in the collection")
+        self.unindex(id(obj), entry)
+        self.version += 1
+
+    def clear(self):
+        """Remove every object."""
+        self.entries.clear()
+        self.by_name.clear()
+        self.version += 1
+
+    def index(self, obj_id, entry):
+        """Add an entry to the name index."""
+        self.by_name.setdefault(entry[2], {})[obj_id] = entry[1]
+
+    def unindex(self, obj_id, entry):
+        """Drop an entry from the name index."""
+        named = self.by_name[entry[2]]
+        del named[obj_id]
+        if not named:
+            del self.by_name[entry[2]]
+
+    def in_order(self, objects):
+        """Sort objects held by this collection into insertion order."""
+        if len(objects) < 2:
+            return list(objects)
+        return sorted(objects, key=lambda obj: self.entries[id(obj)][0])
+
+    def count_named(self, name):
+        """Count objects whose name matches, ignoring case."""
+        return len(self.by_name.get(normalize_name(name), ()))
+
+    def items_named(self, name):
+        """Return objects whose name matches, ignoring case, in insertion order."""
+        named = self.by_name.get(normalize_name(name))
+        if not named:
+            return []
+        return self.in_order(named.values())
+
+    def items_containing(self, fragment):
+        """Return objects whose normalized name contains a fragment, in insertion order."""
+        matches = []
+        for name in names_containing(normalize_name(fragment)):
+            named = self.by_name.get(name)
+            if named:
+                matches.extend(named.values())
+        return self.in_order(matches)
+
+    def first_named(self, name, rarity=None):
+        """Return the earliest object matching a name and optional rarity."""
+        for obj in self.items_named(name):
+            if rarity is None or obj.rarity == rarity:
+                return obj
+        return None
+
+
+class Inventory(NamedCollection):
+    """Ordered multiset of items that also indexes stacks by (name, rarity).
+
+    Call refresh() after changing an item's rarity in place.
+    """
+
+    __slots__ = ("by_key", "summary")
+
+    def __init__(self, items=()):
+        self.by_key = {}
+        self.summary = None
+        super().__init__(items)
+
+    def stack_key(self, item):
+        """Return the (name, rarity) key items stack under."""
+        return (item.name, item.rarity)
+
+    def index(self, item_id, entry):
+        """Add an entry to the name and stack indexes."""
+        super().index(item_id, entry)
+        self.by_key.setdefault(entry[3], {})[item_id] = entry[1]
+
+    def unindex(self, item_id, entry):
+        """Drop an entry from the name and stack indexes."""
+        super().unindex(item_id, entry)
+        stack = self.by_key[entry[3]]
+        del stack[item_id]
+        if not stack:
+            del self.by_key[entry[3]]
+
+    def clear(self):
+        """Remove every item."""
+        super().clear()
+        self.by_key.clear()
+
+    def refresh(self, item):
+        """Re-index an item whose rarity changed while it was held."""
+        item_id = id(item)
+        entry = self.entries.get(item_id)
+        if entry is None:
+            return
+        key = self.stack_key(item)
+        if key == entry[3]:
+            return
+        self.unindex(item_id, entry)
+        entry = (entry[0], item, entry[2], key)
+        self.entries[item_id] = entry
+        self.index(item_id, entry)
+        stack = self.by_key[key]
+        if len(stack) > 1:
+            self.by_key[key] = {id(stacked): stacked for stacked in self.in_order(stack.values())}
+        named = self.by_name[entry[2]]
+        if len(named) > 1:
+            self.by_name[entry[2]] = {id(same): same for same in self.in_order(named.values())}
+        self.version += 1
+
+    def stack_count(self, key):
+        """Return how many items share a (name, rarity) stack key."""
+        return len(self.by_key.get(key, ()))
+
+    def stacks(self):
+        """Return (order, counts) like Game.summarize_items_with_counts; treat both as read-only."""
+        if self.summary is None or self.summary[0] != self.version:
+            firsts = self.in_order([next(iter(stack.values())) for stack in self.by_key.values()])
+            counts = {key: len(stack) for key, stack in self.by_key.items()}
+            self.summary = (self.version, firsts, counts)
+        return self.summary[1], self.summary[2]
+
+
 class Enemy:
     """Represents a hostile creature with combat stats."""
 
+    __slots__ = (
+        "name",
+        "description",
+        "base_health",
+        "base_damage",
+        "base_defense",
+        "magic_resistance",
+        "base_exp_reward",
+        "level",
+        "max_health",
+        "health",
+        "damage",
+        "defense",
+        "agility",
+        "exp_reward",
+        "loot",
+        "bonus_loot",
+        "scaled",
+    )
+
     def __init__(
         self,
         name,
@@ -315,6 +1254,29 @@ class Enemy:
         self.bonus_loot = bonus_loot or []
         self.scaled = False
 
+    @classmethod
+    def from_template(cls, template):
+        """Build a fresh enemy straight from a compiled EnemyTemplate."""
+        enemy = cls.__new__(cls)
+        enemy.name = template.name
+        enemy.description = template.description
+        enemy.base_health = template.health
+        enemy.base_damage = template.damage
+        enemy.base_defense = template.defense
+        enemy.magic_resistance = template.magic_resistance
+        enemy.base_exp_reward = template.exp_reward
+        enemy.level = 1
+        enemy.max_health = template.health
+        enemy.health = template.health
+        enemy.damage = template.damage
+        enemy.defense = template.defense
+        enemy.agility = template.agility
+        enemy.exp_reward = template.exp_reward
+        enemy.loot = template.loot
+        enemy.bonus_loot = template.bonus_loot
+        enemy.scaled = False
+        return enemy
+
     def apply_level(self, level, health_mult, damage_mult, defense_mult, preserve_health=False):
         """Scale stats to the specified level."""
         level = max(1, int(level))
@@ -341,6 +1303,8 @@ class Enemy:
 class NPC:
     """Represents a non-player character with dialogue and quests."""
 
+    __slots__ = ("name", "description", "faction", "dialogue")
+
     def __init__(self, name, description, faction, dialogue):
         self.name = name
         self.description = description
@@ -351,20 +1315,96 @@ class NPC:
 class Location:
     """Represents a place in the world with exits and interactive content."""
 
+    __slots__ = ("name", "description", "exits", "items", "enemies", "npcs", "events", "art")
+
     def __init__(self, name, description, exits=None, items=None, enemies=None, npcs=None, events=None, art=None):
         self.name = name
         self.description = description
         self.exits = exits or {}
-        self.items = items or []
+        self.items = Inventory(items or ())
         self.enemies = enemies or []
-        self.npcs = npcs or []
+        self.npcs = NamedCollection(npcs or ())
         self.events = events or []
         self.art = art or ""
 
 
+class WorldOverlay:
+    """Per-session view of a shared base world that copies a location on its first write.
+
+    Reads fall through to the immutable base; callers that change a location's items,
+    enemies, or NPCs must fetch it with mutable() so only touched locations are copied.
+    Locations named in private are copied on first read instead, for content such as
+    item rarities that every session rolls for itself.
+    """
+
+    def __init__(self, base, copy_location, private=()):
+        self.base = base
+        self.copy_location = copy_location
+        self.private = frozenset(private)
+        self.overlay = {}
+
+    def __getitem__(self, name):
+        location = self.overlay.get(name)
+        if location is None:
+            if name in self.private:
+                return self.mutable(name)
+            return self.base[name]
+        return location
+
+    def __contains__(self, name):
+        return name in self.base
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+    def get(self, name, default=None):
+        """Return a read-only view of a location, or default if it does not exist."""
+        if name not in self.base:
+            return default
+        return self[name]
+
+    def keys(self):
+        """Return location names."""
+        return self.base.keys()
+
+    def items(self):
+        """Yield (name, location) pairs, preferring session copies."""
+        for name in self.base:
+            yield name, self[name]
+
+    def values(self):
+        """Yield locations, preferring session copies."""
+        for name in self.base:
+            yield self[name]
+
+    def mutable(self, name):
+        """Return this session's private copy of a location, creating it if needed."""
+        location = self.overlay.get(name)
+        if location is None:
+            location = self.copy_location(self.base[name])
+            self.overlay[name] = location
+        return location
+
+    def replace(self, location):
+        """Install a session copy built elsewhere, such as from save data."""
+        self.overlay[location.name] = location
+
+    def reset(self, name=None):
+        """Drop session copies so lookups fall back to the base world."""
+        if name is None:
+            self.overlay = {}
+        else:
+            self.overlay.pop(name, None)
+
+
 class Quest:
     """Tracks quest objectives and completion state."""
 
+    __slots__ = ("quest_id", "name", "description", "requirements", "rewards", "status")
+
     def __init__(self, quest_id, name, description, requirements, rewards):
         self.quest_id = quest_id
         self.name = name
@@ -374,11 +1414,87 @@ class Quest:
         self.status = "active"  # active or completed
 
 
+class QuestLog:
+    """Player quests in acceptance order, indexed by id with a live completed count."""
+
+    __slots__ = ("quests", "by_id", "completed", "version")
+
+    def __init__(self, quests=()):
+        self.quests = []
+        self.by_id = {}
+        self.completed = 0
+        self.version = 0
+        for quest in quests:
+            self.append(quest)
+
+    def __iter__(self):
+        return iter(list(self.quests))
+
+    def __len__(self):
+        return len(self.quests)
+
+    def append(self, quest):
+        """Record a newly accepted quest."""
+        self.quests.append(quest)
+        self.by_id.setdefault(quest.quest_id, quest)
+        if quest.status == "completed":
+            self.completed += 1
+        self.version += 1
+
+    def get(self, quest_id):
+        """Return a quest by ID, or None if it has not been accepted."""
+        return self.by_id.get(quest_id)
+
+    def set_status(self, quest, status):
+        """Change a quest's status, keeping the completed count current."""
+        if quest.status == status:
+            return
+        if quest.status == "completed":
+            self.completed -= 1
+        if status == "completed":
+            self.completed += 1
+        quest.status = status
+        self.version += 1
+
+
 class Player:
     """Holds player stats, inventory, quests, and progression."""
 
-    def __init__(self, name, location):
+    __slots__ = (
+        "name",
+        "io",
+        "max_health",
+        "health",
+        "max_mana",
+        "mana",
+        "strength",
+        "magic",
+        "agility",
+        "class_name",
+        "spellbooks_read_count",
+        "current_active_spell",
+        "inventory",
+        "equipped_weapon",
+        "equipped_armor",
+        "current_location",
+        "experience",
+        "level",
+        "attribute_points",
+        "quests",
+        "gold",
+        "total_gold_earned",
+        "travel_steps",
+        "flags",
+        "enemies_killed",
+        "damage_done",
+        "damage_received",
+        "total_xp_earned",
+        "visited_locations",
+    )
+
+    def __init__(self, name, location, io=None):
         self.name = name
+        self.io = io or ConsoleIO()
         self.max_health = 100
         self.health = 100
         self.max_mana = 50
@@ -389,14 +1505,14 @@ class Player:
         self.class_name = "Ranger"
         self.spellbooks_read_count = 0
         self.current_active_spell = "echo bolt"
-        self.inventory = []
+        self.inventory = Inventory()
         self.equipped_weapon = None
         self.equipped_armor = None
         self.current_location = location
         self.experience = 0
         self.level = 1
         self.attribute_points = 0
-        self.quests = []
+        self.quests = QuestLog()
         self.gold = 30
         self.total_gold_earned = 0
         self.travel_steps = 0
@@ -421,7 +1537,7 @@ class Player:
         """Grant experience and handle level-ups."""
         self.experience += amount
         self.total_xp_earned += amount
-        print(good(f"You gain {amount} experience."))
+        self.io.print(good(f"You gain {amount} experience."))
         while self.experience >= self.level * 100:
             self.experience -= self.level * 100
             self.level += 1
@@ -430,35 +1546,248 @@ class Player:
             self.max_mana += 5
             self.health = self.max_health
             self.mana = self.max_mana
-            print(headline("You feel the ley lines surge within you. Level up!"))
-            print("You gain 1 attribute point, +10 max health, +5 max mana.")
+            self.io.emit(LevelUp(self.level))
+            self.io.print(headline("You feel the ley lines surge within you. Level up!"))
+            self.io.print("You gain 1 attribute point, +10 max health, +5 max mana.")
             self.spend_attribute_points()
 
     def spend_attribute_points(self):
         """Prompt the player to allocate earned attribute points."""
         while self.attribute_points > 0:
-            print(f"Attribute points remaining: {self.attribute_points}")
-            choice = safe_input("Spend on (strength, magic, agility), 'help', or 'skip': ").strip().lower()
+            self.io.print(f"Attribute points remaining: {self.attribute_points}")
+            choice = self.io.input("Spend on (strength, magic, agility), 'help', or 'skip': ").strip().lower()
             if choice == "strength":
                 self.strength += 1
                 self.attribute_points -= 1
-                print(good("Strength increased."))
+                self.io.print(good("Strength increased."))
             elif choice == "magic":
                 self.magic += 1
                 self.attribute_points -= 1
-                print(good("Magic increased."))
+                self.io.print(good("Magic increased."))
             elif choice == "agility":
                 self.agility += 1
                 self.attribute_points -= 1
-                print(good("Agility increased."))
+                self.io.print(good("Agility increased."))
             elif choice == "help":
-                print("Strength increases melee damage with weapons.")
-                print("Magic increases spell damage and powers magical effects.")
-                print("Agility improves hit chance, dodge chance, and fleeing success.")
+                self.io.print("Strength increases melee damage with weapons.")
+                self.io.print("Magic increases spell damage and powers magical effects.")
+                self.io.print("Agility improves hit chance, dodge chance, and fleeing success.")
             elif choice == "skip":
                 break
             else:
-                print("Not a valid choice.")
+                self.io.print("Not a valid choice.")
+
+
+# -----------------------------
+# Compiled templates
+# -----------------------------
+
+ItemTemplate = namedtuple(
+    "ItemTemplate",
+    "name description item_type effect weapon_type gold_value major",
+)
+EnemyTemplate = namedtuple(
+    "EnemyTemplate",
+    "name description health damage defense agility exp_reward loot bonus_loot magic_resistance",
+)
+
+
+def compile_item_template(name, data):
+    """Flatten an ITEM_DEFS entry into an immutable ItemTemplate."""
+    return ItemTemplate(
+        name,
+        data["description"],
+        data["item_type"],
+        tuple(data.get("effect", {}).items()),
+        data.get("weapon_type"),
+        data.get("gold_value", 0),
+        data.get("major", False),
+    )
+
+
+def compile_enemy_template(name, data):
+    """Flatten an ENEMY_DEFS entry into an immutable EnemyTemplate."""
+    bonus_loot = tuple(
+        (entry.get("name"), entry.get("chance", 0)) if isinstance(entry, dict) else tuple(entry)
+        for entry in data.get("bonus_loot", [])
+    )
+    return EnemyTemplate(
+        name,
+        data["description"],
+        data["health"],
+        data["damage"],
+        data["defense"],
+        data["agility"],
+        data["exp_reward"],
+        tuple(data.get("loot", [])),
+        bonus_loot,
+        float(data.get("magic_resistance", 0.0)),
+    )
+
+
+def scale_item_effect(base_effect, multiplier):
+    """Scale core combat stats by rarity multiplier."""
+    scaled = {}
+    for key, value in base_effect.items():
+        if key in ("damage", "defense"):
+            scaled_value = int(round(value * multiplier))
+            if value > 0:
+                scaled_value = max(1, scaled_value)
+            scaled[key] = scaled_value
+        elif key in ("magic", "mana_cost_reduction_percent", "life_steal_percent"):
+            scaled_value = value * multiplier
+            if value > 0:
+                scaled_value = max(0.1, scaled_value)
+            scaled[key] = scaled_value
+        else:
+            scaled[key] = value
+    return scaled
+
+
+def compile_item_effects(templates):
+    """Precompute the effect table for every (template, rarity) an item can have."""
+    effects = {}
+    for name, template in templates.items():
+        base_effect = dict(template.effect)
+        effects[name, None] = base_effect
+        if template.item_type in ("consumable", "quest_item"):
+            continue
+        for rarity, _, multiplier in RARITY_TABLE:
+            effects[name, rarity] = scale_item_effect(base_effect, multiplier)
+    return effects
+
+
+def lookup_item_effect(template, rarity):
+    """Return the shared effect table for a template at a rarity."""
+    effect = ITEM_EFFECTS.get((template.name, rarity))
+    if effect is None:
+        effect = scale_item_effect(dict(template.effect), RARITY_MULTIPLIERS.get(rarity, 1.0))
+    return effect
+
+
+def format_stat_value(value, is_percent):
+    """Format a stat for previews, dropping the decimal on whole numbers."""
+    if abs(value - round(value)) < 0.0001:
+        text = str(int(round(value)))
+    else:
+        text = f"{value:.1f}"
+    return f"{text}%" if is_percent else text
+
+
+@lru_cache(maxsize=2048)
+def item_stats_tag(template, rarity, equipped_template=None, equipped_rarity=None):
+    """Return the damage/defense tag for an item, compared with the equipped one.
+
+    Tags depend only on the two (template, rarity) pairs, so a rarity change simply
+    selects a different cache entry.
+    """
+    if template.item_type == "weapon":
+        stat, label = "damage", "Damage"
+    elif template.item_type == "armor":
+        stat, label = "defense", "Defense"
+    else:
+        return ""
+    value = lookup_item_effect(template, rarity).get(stat, 0)
+    equipped_value = 0
+    if equipped_template is not None:
+        equipped_value = lookup_item_effect(equipped_template, equipped_rarity).get(stat, 0)
+    delta = value - equipped_value
+    if delta == 0:
+        return f" ({label} {value})"
+    sign = "+" if delta > 0 else ""
+    diff_text = ansi_text(f"({sign}{delta} {stat})", "1;32" if delta > 0 else "1;31")
+    return f" ({label} {value} {diff_text})"
+
+
+UPGRADE_PREVIEW_FIELDS = (
+    ("damage", "Damage", False),
+    ("defense", "Defense", False),
+    ("magic", "Magic", False),
+    ("mana_cost_reduction_percent", "Mana Cost Reduction", True),
+    ("life_steal_percent", "Life Steal", True),
+)
+
+
+@lru_cache(maxsize=2048)
+def upgrade_preview_tag(template, rarity, next_rarity):
+    """Return the projected stat gains for upgrading an item to the next rarity tier."""
+    if not next_rarity or template.item_type not in ("weapon", "armor"):
+        return ""
+    if next_rarity not in RARITY_MULTIPLIERS:
+        return ""
+    effect = lookup_item_effect(template, rarity)
+    upgraded = lookup_item_effect(template, next_rarity)
+    changes = []
+    for key, label, is_percent in UPGRADE_PREVIEW_FIELDS:
+        if key not in effect and key not in upgraded:
+            continue
+        current = effect.get(key, 0)
+        future = upgraded.get(key, 0)
+        if abs(current - future) < 0.0001:
+            continue
+        changes.append(f"{label} {format_stat_value(current, is_percent)} -> {format_stat_value(future, is_percent)}")
+    if not changes:
+        return ""
+    return f"(Upgrade: {', '.join(changes)})"
+
+
+ExitLock = namedtuple("ExitLock", "destination origin is_locked message")
+
+
+def compile_lock_requirement(requires):
+    """Turn a rule's requirement into a predicate that is True while the exit stays locked."""
+    if "flag" in requires:
+        flag = requires["flag"]
+        return lambda game: not game.player.flags.get(flag)
+    if "quest" in requires:
+        quest_id = requires["quest"]
+        return lambda game: game.get_quest(quest_id) is None
+    if "completed_quests" in requires:
+        needed = requires["completed_quests"]
+        return lambda game: game.count_completed_quests() < needed
+    raise ValueError(f"Unknown exit lock requirement: {requires}")
+
+
+def compile_exit_locks(rules):
+    """Index exit lock rules by (origin, destination)."""
+    locks = {}
+    for rule in rules:
+        lock = ExitLock(
+            rule["destination"],
+            rule.get("from"),
+            compile_lock_requirement(rule["requires"]),
+            rule.get("message", EXIT_LOCK_DEFAULT_MESSAGE),
+        )
+        locks[lock.origin, lock.destination] = lock
+    return locks
+
+
+ITEM_TEMPLATES = {name: compile_item_template(name, data) for name, data in ITEM_DEFS.items()}
+ITEM_EFFECTS = compile_item_effects(ITEM_TEMPLATES)
+ENEMY_TEMPLATES = {name: compile_enemy_template(name, data) for name, data in ENEMY_DEFS.items()}
+EXIT_LOCKS = compile_exit_locks(EXIT_LOCK_RULES)
+EXIT_LOCK_FLAGS = tuple(rule["requires"]["flag"] for rule in EXIT_LOCK_RULES if "flag" in rule["requires"])
+
+
+# -----------------------------
+# Command registry
+# -----------------------------
+
+CommandSpec = namedtuple("CommandSpec", "handler needs_args horde_safe")
+
+
+def command(*verbs, needs_args=False, horde_safe=False):
+    """Mark a Game method as the handler for one or more command verbs.
+
+    Handlers are called as handler(game, verb, args). A needs_args command treats a
+    bare verb as unrecognized; horde_safe commands stay available during the Apex escape.
+    """
+
+    def decorate(handler):
+        handler.command_spec = (verbs, needs_args, horde_safe)
+        return handler
+
+    return decorate
 
 
 # -----------------------------
@@ -469,13 +1798,20 @@ class Player:
 class Game:
     """Main game controller: builds the world, handles input, and runs the loop."""
 
-    def __init__(self):
-        self.item_catalog = self.build_item_catalog()
-        self.enemy_catalog = self.build_enemy_catalog()
-        self.world = self.build_world()
+    shared_world = None
+    shared_world_lock = threading.Lock()
+    command_table = {}
+    horde_verbs = frozenset()
+
+    def __init__(self, io=None):
+        self.io = io or ConsoleIO()
+        self.item_catalog = ITEM_TEMPLATES
+        self.enemy_catalog = ENEMY_TEMPLATES
+        shared_world = self.get_shared_world()
+        self.world = WorldOverlay(shared_world, self.copy_location, private=self.rolled_locations(shared_world))
         self.merchant_inventory = self.build_merchant_inventory()
         self.base_location_descriptions = {
-            name: location.description for name, location in self.world.items()
+            name: location.description for name, location in self.world.base.items()
         }
         self.player = None
         self.previous_location = None
@@ -486,6 +1822,8 @@ class Game:
         self.pending_encounter_message = None
         self.pending_post_redraw_messages = []
         self.pending_post_combat_messages = []
+        self.queued_commands = deque()
+        self.batch_arrival = None
         self.just_moved = False
         self.horde_active = False
         self.horde_delay_turns = 0
@@ -493,42 +1831,17 @@ class Game:
         self.horde_pending = {}
         self.wandering_enemy_pool = list(WANDERING_ENEMY_POOL)
         self.score_saved = False
-        self.combat_log = []
+        self.combat_log = deque(maxlen=COMBAT_LOG_LIMIT)
         self.current_save_slot = None
-
-    def build_item_catalog(self):
-        """Define item templates used to populate the world."""
-        catalog = {}
-        for name, data in ITEM_DEFS.items():
-            catalog[name] = Item(
-                name,
-                data["description"],
-                data["item_type"],
-                data.get("effect", {}),
-                weapon_type=data.get("weapon_type"),
-                gold_value=data.get("gold_value", 0),
-                major=data.get("major", False),
-            )
-        return catalog
-
-    def build_enemy_catalog(self):
-        """Define enemy templates for the world."""
-        catalog = {}
-        for name, data in ENEMY_DEFS.items():
-            enemy = Enemy(
-                name,
-                data["description"],
-                health=data["health"],
-                damage=data["damage"],
-                defense=data["defense"],
-                agility=data["agility"],
-                exp_reward=data["exp_reward"],
-                loot=data.get("loot", []),
-                bonus_loot=data.get("bonus_loot", []),
-                magic_resistance=data.get("magic_resistance", 0.0),
-            )
-            catalog[name] = enemy
-        return catalog
+        self.quest_ready = set()
+        self.quest_ready_key = None
+        self.exit_cache = {}
+        self.minimap_cache_state = None
+        self.minimap_cache_rows = []
+        self.minimap_row_cache = {}
+        self.render_cache = {}
+        self.inventory_summary_key = None
+        self.inventory_summary_text = ""
 
     def build_world(self):
         """Construct the starting game world with locations and content."""
@@ -555,6 +1868,30 @@ class Game:
             )
         return locations
 
+    def get_shared_world(self):
+        """Return the process-wide base world, building it on first use."""
+        with Game.shared_world_lock:
+            if Game.shared_world is None:
+                Game.shared_world = self.build_world()
+            return Game.shared_world
+
+    def rolled_locations(self, world):
+        """Return the locations holding gear whose rarity each session rolls for itself."""
+        return [name for name, location in world.items() if any(item.rarity for item in location.items)]
+
+    def copy_location(self, location):
+        """Return a session-private copy of a shared location with fresh items, rarities, and enemies."""
+        return Location(
+            location.name,
+            location.description,
+            exits=location.exits,
+            items=[self.clone_item(item.name) for item in location.items],
+            enemies=[self.clone_enemy(enemy.name) for enemy in location.enemies],
+            npcs=list(location.npcs),
+            events=location.events,
+            art=location.art,
+        )
+
     def build_merchant_inventory(self):
         """Create the merchant's starting stock."""
         consumables = [
@@ -565,13 +1902,13 @@ class Game:
         ]
         gear_candidates = [
             name
-            for name, item in self.item_catalog.items()
-            if item.item_type in ("weapon", "armor")
+            for name, template in self.item_catalog.items()
+            if template.item_type in ("weapon", "armor")
             and name not in ("Warrior's Sword", "Shadow-Kissed Dagger")
         ]
         selection_count = min(len(gear_candidates), random.randint(3, 4))
         gear_names = random.sample(gear_candidates, selection_count) if gear_candidates else []
-        stock = []
+        stock = Inventory()
         for name in consumables + gear_names:
             item = self.clone_item(name)
             if item.item_type != "quest_item":
@@ -580,25 +1917,24 @@ class Game:
 
     def clone_item(self, name, rarity=None):
         """Return a fresh copy of an item template."""
-        item = deepcopy(self.item_catalog[name])
+        item = Item(self.item_catalog[name])
         return self.assign_item_rarity(item, rarity=rarity)
 
     def clone_enemy(self, name):
         """Return a fresh copy of an enemy template."""
-        return deepcopy(self.enemy_catalog[name])
+        return Enemy.from_template(self.enemy_catalog[name])
 
     def safe_clone_item(self, name, rarity=None):
         """Clone an item if it exists in the catalog; otherwise return None."""
         if name not in self.item_catalog:
-            print(danger(f"Save data referenced unknown item '{name}'. Skipping."))
+            self.io.print(danger(f"Save data referenced unknown item '{name}'. Skipping."))
             return None
-        item = deepcopy(self.item_catalog[name])
-        return self.assign_item_rarity(item, rarity=rarity)
+        return self.clone_item(name, rarity=rarity)
 
     def safe_clone_enemy(self, name):
         """Clone an enemy if it exists in the catalog; otherwise return None."""
         if name not in self.enemy_catalog:
-            print(danger(f"Save data referenced unknown enemy '{name}'. Skipping."))
+            self.io.print(danger(f"Save data referenced unknown enemy '{name}'. Skipping."))
             return None
         return self.clone_enemy(name)
 
@@ -613,9 +1949,9 @@ class Game:
 
     def sanitize_merchant_inventory(self):
         """Ensure merchant inventory contains no quest items."""
-        self.merchant_inventory = [
+        self.merchant_inventory = Inventory(
             item for item in self.merchant_inventory if item.item_type != "quest_item"
-        ]
+        )
 
     def scale_enemy_for_player(self, enemy, preserve_health=False, level=None):
         """Scale an enemy to a level relative to the player."""
@@ -651,39 +1987,14 @@ class Game:
                 return name
         return "Common"
 
-    def scale_item_effect(self, base_effect, multiplier):
-        """Scale core combat stats by rarity multiplier."""
-        scaled = {}
-        for key, value in base_effect.items():
-            if key in ("damage", "defense"):
-                scaled_value = int(round(value * multiplier))
-                if value > 0:
-                    scaled_value = max(1, scaled_value)
-                scaled[key] = scaled_value
-            elif key in ("magic", "mana_cost_reduction_percent", "life_steal_percent"):
-                scaled_value = value * multiplier
-                if value > 0:
-                    scaled_value = max(0.1, scaled_value)
-                scaled[key] = scaled_value
-            else:
-                scaled[key] = value
-        return scaled
-
     def assign_item_rarity(self, item, rarity=None):
         """Assign rarity and scale base stats for eligible items."""
         if item.item_type in ("consumable", "quest_item"):
             item.rarity = None
-            item.effect = deepcopy(item.base_effect)
-            item.gold_value = item.base_gold_value
-            item.value = item.gold_value
             return item
         if not rarity:
             rarity = self.roll_rarity()
-        multiplier = RARITY_MULTIPLIERS.get(rarity, 1.0)
         item.rarity = rarity
-        item.effect = self.scale_item_effect(item.base_effect, multiplier)
-        item.gold_value = max(1, int(round(item.base_gold_value * multiplier)))
-        item.value = item.gold_value
         return item
 
     def get_next_rarity(self, rarity):
@@ -713,7 +2024,7 @@ class Game:
 
     def title_screen(self):
         """Display the game title screen with ASCII art."""
-        clear_screen()
+        self.io.clear_screen()
         title_art = r"""
 +----------------------------------------------------+
 |            ECHOES OF AETHELGARD                    |
@@ -729,24 +2040,25 @@ X\__    __   /X XXXX XX\                          _
 /  __    \  /     \ \_   _//_\___     _/    //         
 __/_______\________\__\_/________\_ _/_____/_________
 """
-        slow_print([title_art], delay=0.1)
+        if self.io.renders_scenes:
+            self.io.slow_print([title_art], delay=0.1)
 
     def show_lore(self):
         """Display the game lore article."""
-        clear_screen()
-        print(GAME_LORE_ARTICLE)
-        safe_input("Press Enter to return to the menu...")
-        clear_screen()
+        self.io.clear_screen()
+        self.io.print(GAME_LORE_ARTICLE)
+        self.io.input("Press Enter to return to the menu...")
+        self.io.clear_screen()
 
     def choose_class(self):
         """Prompt the player to choose a class."""
         while True:
-            clear_screen()
+            self.io.clear_screen()
             self.print_section_header("Choose Your Class")
-            print("1) Ranger (+2 Strength - Rusty Dagger)")
-            print("2) Wizard (+2 Magic - Apprentice Staff)")
-            print("3) Elf (+2 Agility - Primitive Bow)")
-            choice = safe_input("Class (1-3 or name): ").strip().lower()
+            self.io.print("1) Ranger (+2 Strength - Rusty Dagger)")
+            self.io.print("2) Wizard (+2 Magic - Apprentice Staff)")
+            self.io.print("3) Elf (+2 Agility - Primitive Bow)")
+            choice = self.io.input("Class (1-3 or name): ").strip().lower()
             mapping = {
                 "1": "Ranger",
                 "ranger": "Ranger",
@@ -758,19 +2070,19 @@ __/_______\________\__\_/________\_ _/_____/_________
             selected = mapping.get(choice)
             if selected:
                 return selected
-            print("Not a valid choice.")
-            pause(0.5)
+            self.io.print("Not a valid choice.")
+            self.io.pause(0.5)
 
     def start_menu(self):
         """Prompt the player for a start menu choice."""
         while True:
             self.title_screen()
-            print("1) New Game")
-            print("2) Continue Game")
-            print("3) View Scores")
-            print("4) Read Lore (warning - spoilers)")
-            print("5) Quit")
-            choice = safe_input("Choose an option: ").strip().lower()
+            self.io.print("1) New Game")
+            self.io.print("2) Continue Game")
+            self.io.print("3) View Scores")
+            self.io.print("4) Read Lore (warning - spoilers)")
+            self.io.print("5) Quit")
+            choice = self.io.input("Choose an option: ").strip().lower()
             mapping = {
                 "1": "new",
                 "new": "new",
@@ -790,18 +2102,19 @@ __/_______\________\__\_/________\_ _/_____/_________
             selection = mapping.get(choice)
             if selection:
                 return selection
-            print("Not a valid choice.")
-            pause(0.5)
+            self.io.print("Not a valid choice.")
+            self.io.pause(0.5)
 
     def start_new_game(self, slot=None):
         """Create a new player and begin at the Whispering Ruins."""
         class_name = self.choose_class()
         class_info = CLASS_DEFS[class_name]
-        clear_screen()
-        name = safe_input("Name your Wayfinder: ").strip()
+        self.io.clear_screen()
+        name = self.io.input("Name your Wayfinder: ").strip()
         if not name:
             name = "Wayfinder"
-        self.player = Player(name, "Whispering Ruins")
+        self.player = Player(name, "Whispering Ruins", io=self.io)
+        self.reset_session_caches()
         self.player.class_name = class_name
         if slot is not None:
             self.current_save_slot = slot
@@ -819,13 +2132,43 @@ __/_______\________\__\_/________\_ _/_____/_________
         if slot is not None:
             self.save_game(quiet=True)
 
+    def run(self):
+        """Drive a full session: start menu, then the main loop."""
+        self.sync_styling()
+        while True:
+            selection = self.start_menu()
+            if selection == "new":
+                if self.start_new_game_flow():
+                    break
+                continue
+            if selection == "continue":
+                if self.continue_game_flow():
+                    break
+                continue
+            if selection == "scores":
+                self.show_scores()
+                continue
+            if selection == "lore":
+                self.show_lore()
+                continue
+            if selection == "quit":
+                return
+        self.main_loop()
+
     def main_loop(self):
         """Main game loop: display location, handle input, update state."""
         while self.running:
             try:
-                if self.needs_redraw:
+                location = self.world[self.player.current_location]
+                if self.needs_redraw and self.queued_commands and not location.enemies:
+                    self.pass_through_location(location)
+                    if not self.running:
+                        break
+                elif self.needs_redraw:
                     self.needs_redraw = False
-                    self.display_location()
+                    self.queued_commands.clear()
+                    self.display_location(arrive=self.batch_arrival != location.name)
+                    self.batch_arrival = None
                     location = self.world[self.player.current_location]
                     if self.just_moved and location.enemies:
                         encounter_name = location.enemies[0].name
@@ -835,43 +2178,155 @@ __/_______\________\__\_/________\_ _/_____/_________
                         else:
                             threat_name = f"a {encounter_name}"
                         danger_rule = danger("!" * 56)
-                        print(danger_rule)
-                        print(danger(f"You sense danger... {threat_name} approaches!"))
+                        self.io.print(danger_rule)
+                        self.io.print(danger(f"You sense danger... {threat_name} approaches!"))
                         if encounter_name == "The Chronos Tyrant":
-                            print(color_text(location.enemies[0].description, "2;37"))
-                        print(danger_rule)
+                            self.io.print(color_text(location.enemies[0].description, "2;37"))
+                        self.io.print(danger_rule)
                         if encounter_name == "The Chronos Tyrant":
-                            print()
-                            pause(5.0)
-                            safe_input("Press Enter to continue ")
+                            self.io.print()
+                            self.io.pause(5.0)
+                            self.io.input("Press Enter to continue ")
                     self.just_moved = False
                     self.check_for_combat()
                     if not self.running:
                         break
                     if self.needs_redraw:
+                        self.queued_commands.clear()
+                        continue
+                if not self.queued_commands:
+                    self.queue_commands(self.io.input(styled("\n> ", "1;37")))
+                    if not self.queued_commands:
                         continue
-                command = safe_input(color_text("\n> ", "1;37"))
-                self.process_command(command)
+                self.process_command(self.queued_commands.popleft())
             except KeyboardInterrupt:
-                print()
+                self.queued_commands.clear()
+                self.batch_arrival = None
+                self.io.print()
                 self.confirm_quit()
 
+    def queue_commands(self, line):
+        """Split an input line on semicolons into a batch of commands run before the next redraw."""
+        self.queued_commands.extend(part for part in line.split(COMMAND_SEPARATOR) if part.strip())
+
     # -----------------------------
     # Display and status helpers
     # -----------------------------
 
-    def display_location(self):
-        """Show the player's current location, items, NPCs, and exits."""
+    def emit(self, event):
+        """Report a typed game event to the I/O port."""
+        self.io.emit(event)
+
+    def pass_through_location(self, location):
+        """Report a batched command's results now and leave the full redraw for the end of the batch.
+
+        When the command moved the player, the location crossed gets a one-line note and
+        its arrival effects; messages meant for the redraw are printed in order either way.
+        """
+        if self.just_moved:
+            self.just_moved = False
+            self.io.print(styled(f"You pass through {location.name}.", DIM_STYLE))
+            self.batch_arrival = location.name
+            if not self.visit_location(location):
+                return
+        self.print_post_redraw_messages()
+
+    def print_post_redraw_messages(self):
+        """Print and clear messages queued to follow the location view."""
+        if self.pending_post_redraw_messages:
+            for message in self.pending_post_redraw_messages:
+                self.io.print(message)
+            self.pending_post_redraw_messages = []
+
+    def display_location(self, arrive=True):
+        """Show the player's current location, items, NPCs, and exits.
+
+        arrive=False skips the arrival effects when a command batch already ran them here.
+        """
         location = self.world[self.player.current_location]
-        clear_screen()
+        self.io.clear_screen()
         self.print_status_bar()
-        if location.art:
-            print(location.art)
-            pause(0.2)
+        if location.art and self.io.renders_scenes:
+            self.io.print(location.art)
+            self.io.pause(0.2)
         self.force_show_art = False
+        self.io.print(self.cached_section("header", location.name, (), lambda: self.format_location_header(location)))
+        description_key = (location.description, self.horde_active, self.player.flags.get("ilyra_at_portal"))
+        description = self.cached_section(
+            "description", location.name, description_key, lambda: self.describe_location(location)
+        )
+        self.io.slow_print([description], delay=0.2)
+        if location.name == "Shattered Library" and self.horde_active:
+            self.io.print(
+                good(
+                    "The portal in the library is the only escape from the unraveling. Enter it before the collapse reaches the stacks."
+                )
+            )
+        if arrive and not self.visit_location(location):
+            return
+
         self.print_divider()
-        print(headline(location.name))
+        contents_key = (location.items, location.items.version, location.npcs, location.npcs.version)
+        contents = self.cached_section(
+            "contents", location.name, contents_key, lambda: self.format_location_contents(location)
+        )
+        if contents:
+            self.io.print(contents)
+
         self.print_divider()
+        exits_key = (self.available_exits(location), len(self.player.visited_locations))
+        self.io.print(
+            self.cached_section("exits", location.name, exits_key, lambda: f"Exits: {self.format_exits(location)}")
+        )
+        if self.io.renders_scenes:
+            self.print_minimap()
+            self.print_divider()
+            self.io.print(self.inventory_summary())
+        self.print_post_redraw_messages()
+
+    def visit_location(self, location):
+        """Run a location's arrival scenes and events; return False if they ended the game."""
+        if (
+            location.name == "Shattered Library"
+            and self.horde_active
+            and self.player.flags.get("ilyra_at_portal")
+            and not self.player.flags.get("ilyra_portal_briefed")
+        ):
+            self.player.flags["ilyra_portal_briefed"] = True
+            self.handle_ilyra()
+            if not self.running:
+                return False
+        self.trigger_events(location)
+        if self.pending_encounter_message:
+            self.io.print(danger(self.pending_encounter_message))
+            self.pending_encounter_message = None
+        self.player.visited_locations.add(location.name)
+        if location.name == "The Temporal Breach Apex":
+            self.update_breach_boss_state()
+        if location.name == "Heartstone Depths":
+            self.handle_heartstone()
+        return True
+
+    def cached_section(self, section, location_name, key, build):
+        """Return a formatted display section, rebuilding it only when its key changes.
+
+        Keys are built from the collection versions, flags, and horde state a section
+        depends on, so a redraw of an unchanged location reuses every formatted line.
+        """
+        cached = self.render_cache.get((section, location_name))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        text = build()
+        self.render_cache[section, location_name] = (key, text)
+        return text
+
+    def format_location_header(self, location):
+        """Return the location name framed by divider rules."""
+        rule = styled(UI_RULE, DIM_STYLE)
+        return f"{rule}\n{headline(location.name)}\n{rule}"
+
+    def describe_location(self, location):
+        """Return the location description, including horde-time variants."""
         description = location.description
         if location.name == "Shattered Library" and self.horde_active:
             if self.player.flags.get("ilyra_at_portal"):
@@ -893,59 +2348,27 @@ __/_______\________\__\_/________\_ _/_____/_________
                 "The Apex is collapsing into violent rifts. The air screams with tearing time, and "
                 "every breath tastes of ash and panic. You must get out now."
             )
-        slow_print([description], delay=0.2)
-        if location.name == "Shattered Library" and self.horde_active:
-            print(
-                good(
-                    "The portal in the library is the only escape from the unraveling. Enter it before the collapse reaches the stacks."
-                )
-            )
-        if (
-            location.name == "Shattered Library"
-            and self.horde_active
-            and self.player.flags.get("ilyra_at_portal")
-            and not self.player.flags.get("ilyra_portal_briefed")
-        ):
-            self.player.flags["ilyra_portal_briefed"] = True
-            self.handle_ilyra()
-            if not self.running:
-                return
-        self.trigger_events(location)
-        if self.pending_encounter_message:
-            print(danger(self.pending_encounter_message))
-            self.pending_encounter_message = None
-        self.player.visited_locations.add(location.name)
-        if location.name == "The Temporal Breach Apex":
-            self.update_breach_boss_state()
-        if location.name == "Heartstone Depths":
-            self.handle_heartstone()
+        return description
 
-        self.print_divider()
+    def format_location_contents(self, location):
+        """Return the items-here and NPC lines for a location, or an empty string."""
+        lines = []
         if location.items:
             item_names = self.format_item_list(location.items)
-            print(good(f"Items here: {item_names}"))
+            lines.append(good(f"Items here: {item_names}"))
         if location.npcs:
             npc_names = ", ".join(npc.name for npc in location.npcs)
-            print(npc_name(f"You see someone: {npc_names}"))
-
-        self.print_divider()
-        print(f"Exits: {self.format_exits(location)}")
-        self.print_minimap()
-        self.print_divider()
-        print(self.inventory_summary())
-        if self.pending_post_redraw_messages:
-            for message in self.pending_post_redraw_messages:
-                print(message)
-            self.pending_post_redraw_messages = []
+            lines.append(npc_name(f"You see someone: {npc_names}"))
+        return "\n".join(lines)
 
     def display_status(self, enemy=None):
         """Display health and mana bars for player and enemy."""
         hp = color_text(self.format_bar_value(self.player.health, self.player.max_health), "1;31")
         mp = color_text(self.format_bar_value(self.player.mana, self.player.max_mana), "1;34")
-        print(f"Your Health: {hp} | Mana: {mp}")
+        self.io.print(f"Your Health: {hp} | Mana: {mp}")
         if enemy:
             enemy_hp = color_text(self.format_bar_value(enemy.health, enemy.max_health), "1;31")
-            print(f"{enemy.name} Health: {enemy_hp}")
+            self.io.print(f"{enemy.name} Health: {enemy_hp}")
 
     def format_bar_value(self, current, maximum):
         """Format a current/max pair as integers for display."""
@@ -953,6 +2376,8 @@ __/_______\________\__\_/________\_ _/_____/_________
 
     def print_status_bar(self):
         """Render the compact status bar for the top of the screen."""
+        if not self.io.renders_scenes:
+            return
         hp = color_text(self.format_bar_value(self.player.health, self.player.max_health), "1;31")
         mp = color_text(self.format_bar_value(self.player.mana, self.player.max_mana), "1;34")
         gold = color_text(str(self.player.gold), "1;33")
@@ -960,27 +2385,33 @@ __/_______\________\__\_/________\_ _/_____/_________
         level = color_text(str(self.player.level), "1;35")
         xp_required = self.player.level * 100
         xp = color_text(f"{self.player.experience}/{xp_required}", "2;37")
-        print(f"HP {hp} | MP {mp} | Lvl {level} | XP {xp} | Gold {gold} | Loc {location}")
+        self.io.print(f"HP {hp} | MP {mp} | Lvl {level} | XP {xp} | Gold {gold} | Loc {location}")
         self.print_divider()
 
     def add_combat_log(self, message):
-        """Store a combat message for the refreshed combat view."""
+        """Store a combat message for the refreshed combat view; the oldest falls off the ring.
+
+        Sinks that do not draw the combat view get each message as it happens instead.
+        """
         if not message:
             return
+        if not self.io.renders_scenes:
+            self.io.print(message)
+            return
         self.combat_log.append(message)
-        if len(self.combat_log) > COMBAT_LOG_LIMIT:
-            self.combat_log = self.combat_log[-COMBAT_LOG_LIMIT:]
 
     def render_combat_screen(self, enemy):
         """Render the combat HUD with the latest messages."""
-        clear_screen()
+        if not self.io.renders_scenes:
+            return
+        self.io.clear_screen()
         self.print_status_bar()
         enemy_hp = color_text(self.format_bar_value(enemy.health, enemy.max_health), "1;31")
-        print(f"{enemy.name} Health: {enemy_hp}")
+        self.io.print(f"{enemy.name} Health: {enemy_hp}")
         if self.combat_log:
             self.print_divider()
-            for line in self.combat_log[-COMBAT_LOG_LIMIT:]:
-                print(line)
+            for line in self.combat_log:
+                self.io.print(line)
 
     def compute_score(self, result=None):
         """Calculate the final score for the current run."""
@@ -1009,7 +2440,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             with open(SCORES_FILE, "w", encoding="utf-8") as handle:
                 json.dump(scores, handle, indent=2)
         except OSError as exc:
-            print(danger(f"Failed to save scores: {exc}"))
+            self.io.print(danger(f"Failed to save scores: {exc}"))
 
     def record_score(self, result):
         """Record the current run's score once."""
@@ -1032,12 +2463,12 @@ __/_______\________\__\_/________\_ _/_____/_________
 
     def show_scores(self):
         """Display a list of high scores."""
-        clear_screen()
+        self.io.clear_screen()
         self.print_section_header("Scores")
         scores = self.load_scores()
         if not scores:
-            print("No scores recorded yet.")
-            safe_input("Press Enter to return to the menu...")
+            self.io.print("No scores recorded yet.")
+            self.io.input("Press Enter to return to the menu...")
             return
         scores.sort(key=lambda entry: entry.get("score", 0), reverse=True)
         for idx, entry in enumerate(scores, 1):
@@ -1053,106 +2484,124 @@ __/_______\________\__\_/________\_ _/_____/_________
                     played = f"{played_date.strftime('%B')} {played_date.day}, {played_date.year}"
                 except ValueError:
                     played = "Unknown date"
-            print(f"{idx}) {score} | {name} | {class_name} | Lvl {level} | {result} | {played}")
-        safe_input("Press Enter to return to the menu...")
+            self.io.print(f"{idx}) {score} | {name} | {class_name} | Lvl {level} | {result} | {played}")
+        self.io.input("Press Enter to return to the menu...")
 
     def print_endgame_summary(self, title, subtitle=None, accent="1;36"):
         """Display a styled endgame summary."""
-        rule = color_text("=" * 60, accent)
-        print(rule)
-        print(color_text(title.center(60), accent))
-        print(rule)
+        rule = styled("=" * 60, accent)
+        self.io.print(rule)
+        self.io.print(color_text(title.center(60), accent))
+        self.io.print(rule)
         if subtitle:
-            print(color_text(subtitle, "1;37"))
+            self.io.print(color_text(subtitle, "1;37"))
         result = "WIN" if title.upper() == "ESCAPE" else "LOSS"
         score = self.compute_score(result)
-        print(color_text(f"Score: {score}", "1;32"))
-        print(color_text("Final Stats", "1;33"))
+        self.emit(GameEnded(result.lower(), score))
+        self.io.print(color_text(f"Score: {score}", "1;32"))
+        self.io.print(styled("Final Stats", "1;33"))
         xp_required = self.player.level * 100
-        print(f"Wayfinder: {self.player.name}")
-        print(f"Level: {self.player.level} | XP: {self.player.experience}/{xp_required}")
-        print(f"Total gold earned: {self.player.total_gold_earned}")
-        print(f"Enemies killed:    {self.player.enemies_killed}")
-        print(f"Damage dealt:      {self.player.damage_done}")
-        print(f"Damage received:   {self.player.damage_received}")
+        self.io.print(f"Wayfinder: {self.player.name}")
+        self.io.print(f"Level: {self.player.level} | XP: {self.player.experience}/{xp_required}")
+        self.io.print(f"Total gold earned: {self.player.total_gold_earned}")
+        self.io.print(f"Enemies killed:    {self.player.enemies_killed}")
+        self.io.print(f"Damage dealt:      {self.player.damage_done}")
+        self.io.print(f"Damage received:   {self.player.damage_received}")
         self.record_score(result)
-        print(color_text("a game by Tim Dibert", "2;37"))
+        self.io.print(styled("a game by Tim Dibert", DIM_STYLE))
 
     def inventory_summary(self, limit=5):
-        """Summarize inventory in a compact, subdued line."""
-        if not self.player.inventory:
-            text = "Inventory: (empty)"
-            return color_text(text, "2;37")
-        order, counts = self.summarize_items_with_counts(self.player.inventory)
-        dim_color = "2;37"
-        dim_label = color_text("Inventory: ", dim_color)
-        dim_sep = color_text(", ", dim_color)
+        """Summarize inventory in a compact, subdued line, rebuilt only when the pack changes."""
+        inventory = self.player.inventory
+        key = (inventory, inventory.version, self.player.equipped_weapon, self.player.equipped_armor, limit)
+        if self.inventory_summary_key != key:
+            self.inventory_summary_text = self.format_inventory_summary(inventory, limit)
+            self.inventory_summary_key = key
+        return self.inventory_summary_text
+
+    def format_inventory_summary(self, inventory, limit):
+        """Format the first few inventory stacks, noting how many more are carried."""
+        if not inventory:
+            return styled("Inventory: (empty)", DIM_STYLE)
+        order, counts = self.summarize_items_with_counts(inventory)
+        parts = []
+        for item in islice(order, limit):
+            name = self.format_item_name(item, dim=True)
+            count = counts[self.item_key(item)]
+            if count > 1:
+                name = f"{name}{color_text(f' (x{count})', DIM_STYLE)}"
+            type_tag = self.format_item_type_tag(item, dim=True)
+            if type_tag:
+                name = f"{name} {type_tag}"
+            parts.append(name)
+        summary = styled("Inventory: ", DIM_STYLE) + styled(", ", DIM_STYLE).join(parts)
         if len(order) > limit:
-            parts = []
-            for item in order[:limit]:
-                count = counts[self.item_key(item)]
-                name = self.format_item_name(item, dim=True)
-                if count > 1:
-                    name = f"{name}{color_text(f' (x{count})', dim_color)}"
-                type_tag = self.format_item_type_tag(item, dim=True)
-                if type_tag:
-                    name = f"{name} {type_tag}"
-                parts.append(name)
-            shown = dim_sep.join(parts)
-            dim_more = color_text(f" (+{len(order) - limit} more)", dim_color)
-            return f"{dim_label}{shown}{dim_more}"
-        else:
-            parts = []
-            for item in order:
-                count = counts[self.item_key(item)]
-                name = self.format_item_name(item, dim=True)
-                if count > 1:
-                    name = f"{name}{color_text(f' (x{count})', dim_color)}"
-                type_tag = self.format_item_type_tag(item, dim=True)
-                if type_tag:
-                    name = f"{name} {type_tag}"
-                parts.append(name)
-            shown = dim_sep.join(parts)
-            return f"{dim_label}{shown}"
+            summary += color_text(f" (+{len(order) - limit} more)", DIM_STYLE)
+        return summary
 
     def summarize_description(self, text, max_len=90):
         """Return a short, single-sentence summary."""
-        summary = " ".join(text.split())
-        for sep in (".", "!", "?"):
-            index = summary.find(sep)
-            if index != -1 and index + 1 < len(summary):
-                summary = summary[: index + 1]
-                break
-        if len(summary) > max_len:
-            summary = summary[: max_len - 3].rstrip() + "..."
-        return summary
+        return summarize_text(text, max_len)
 
     def format_direction_label(self, direction, destination, capitalize=False):
         """Format direction labels, dimming already-visited destinations."""
         label = direction.capitalize() if capitalize else direction
         if destination in self.player.visited_locations:
-            return color_text(label, "2;37")
+            return styled(label, DIM_STYLE)
         return label
 
+    def find_exit_lock(self, destination, current_location=None):
+        """Return the lock rule guarding an exit, if any."""
+        return EXIT_LOCKS.get((current_location, destination)) or EXIT_LOCKS.get((None, destination))
+
     def is_exit_locked(self, destination, current_location=None):
         """Return True if an exit is not yet available."""
-        if destination == "Heartstone Depths":
-            return not self.player.flags.get("heartstone_unlocked")
-        if destination == "Barren Peaks" and current_location == "Ironclad Camp":
-            return self.get_quest("clear_path") is None
-        if destination == "Voidscar Hollow" and current_location == "Chasm of Whispers":
-            return self.get_quest("void_shards") is None
-        if destination == "The Temporal Breach Apex" and current_location == "The Chronos Nexus":
-            return self.count_completed_quests() < 6
-        return False
+        lock = self.find_exit_lock(destination, current_location)
+        return lock is not None and lock.is_locked(self)
+
+    def exit_state(self, location):
+        """Return cached (available, locked) exit maps for a location; treat both as read-only.
+
+        Lock rules only read the quest log and the flags in EXIT_LOCK_FLAGS, so the maps are
+        rebuilt only when one of those changes.
+        """
+        key = (self.player.quests.version,) + tuple(self.player.flags.get(flag) for flag in EXIT_LOCK_FLAGS)
+        cached = self.exit_cache.get(location.name)
+        if cached is None or cached[0] != key:
+            available = {}
+            locked = {}
+            for direction, destination in location.exits.items():
+                if self.is_exit_locked(destination, location.name):
+                    locked[direction] = destination
+                else:
+                    available[direction] = destination
+            cached = (key, available, locked)
+            self.exit_cache[location.name] = cached
+        return cached[1], cached[2]
 
     def available_exits(self, location):
         """Return exits that are currently available to the player."""
-        return {
-            direction: destination
-            for direction, destination in location.exits.items()
-            if not self.is_exit_locked(destination, location.name)
-        }
+        return self.exit_state(location)[0]
+
+    def locked_exits(self, location):
+        """Return exits that are visible but still locked."""
+        return self.exit_state(location)[1]
+
+    def sync_styling(self):
+        """Build colored strings on this session's thread only while its sink shows them."""
+        enabled = self.io.use_color and self.io.renders_scenes
+        if enabled != styling_enabled():
+            self.reset_session_caches()
+        STYLE.enabled = enabled
+
+    def reset_session_caches(self):
+        """Drop caches keyed on player state after a new game or a load."""
+        self.quest_ready_key = None
+        self.exit_cache = {}
+        self.render_cache = {}
+        self.inventory_summary_key = None
+        self.minimap_cache_state = None
+        self.minimap_row_cache = {}
 
     def format_exits(self, location):
         """Format exit directions with visited locations subdued."""
@@ -1170,7 +2619,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             summary = self.summarize_description(dest_location.description)
             direction_label = self.format_direction_label(direction, destination, capitalize=True)
             details = color_text(f": {dest_location.name} - {summary}", "2;37")
-            print(f"{direction_label}{details}")
+            self.io.print(f"{direction_label}{details}")
 
     def get_minimap_visibility(self):
         """Return visited and adjacent locations for minimap discovery."""
@@ -1187,7 +2636,19 @@ __/_______\________\__\_/________\_ _/_____/_________
         return visited, adjacent
 
     def get_quest_ready_locations(self):
-        """Return locations with NPCs ready to turn in a quest."""
+        """Return locations with NPCs ready to turn in a quest; treat the set as read-only.
+
+        Readiness only changes when items are gained or lost, an enemy is defeated, or a
+        quest changes status, so the set is rebuilt only when one of those counters moves.
+        """
+        key = (self.player.inventory.version, self.player.quests.version, self.player.enemies_killed)
+        if self.quest_ready_key != key:
+            self.quest_ready = self.compute_quest_ready_locations()
+            self.quest_ready_key = key
+        return self.quest_ready
+
+    def compute_quest_ready_locations(self):
+        """Evaluate every quest turn-in condition."""
         ready = set()
         quest = self.get_quest("echo_crystal")
         if quest and quest.status != "completed" and self.player_has_item("Echo Crystal"):
@@ -1207,142 +2668,119 @@ __/_______\________\__\_/________\_ _/_____/_________
             ready.add("Chasm of Whispers")
         return ready
 
-    def print_minimap(self, show_known=False):
-        """Render a small, directional map as the player explores."""
+    def minimap_state(self):
+        """Collect everything the minimap depends on into one hashable key."""
         visited, adjacent = self.get_minimap_visibility()
-        infected = set(self.infected_locations) if self.horde_active else set()
+        infected = frozenset(self.infected_locations) if self.horde_active else frozenset()
         visible = visited | adjacent | infected
-        width = max(data["pos"][0] + MINIMAP_LABEL_WIDTH for data in MINIMAP_LAYOUT.values())
-        height = max(data["pos"][1] for data in MINIMAP_LAYOUT.values()) + 1
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        dim_edges = set()
-        for start, end in MINIMAP_EDGES:
-            if start in visited and end in adjacent:
-                dim_edges.add((start, end))
-            elif end in visited and start in adjacent:
-                dim_edges.add((start, end))
-
-        def place_text(x, y, text):
-            for offset, char in enumerate(text):
-                if 0 <= x + offset < width and 0 <= y < height:
-                    grid[y][x + offset] = char
-
-        for start, end in MINIMAP_EDGES:
-            if start not in visible or end not in visible:
-                continue
-            x1, y1 = MINIMAP_LAYOUT[start]["pos"]
-            x2, y2 = MINIMAP_LAYOUT[end]["pos"]
-            dim_edge = (start, end) in dim_edges
-            if y1 == y2:
-                left = min(x1, x2) + MINIMAP_LABEL_WIDTH
-                right = max(x1, x2)
-                for x in range(left, right):
-                    grid[y1][x] = "." if dim_edge else "-"
-            elif x1 == x2:
-                column = x1 + 1
-                top = min(y1, y2) + 1
-                bottom = max(y1, y2)
-                for y in range(top, bottom):
-                    grid[y][column] = ":" if dim_edge else "|"
-
-        blocked_positions = set()
-        for loc_name, location in self.world.items():
-            if loc_name not in visible:
+        current = self.player.current_location
+        npc_locations = set()
+        for name in visited:
+            location = self.world.get(name)
+            if name != current and location and location.npcs:
+                npc_locations.add(name)
+        blocked = set()
+        for name in visible:
+            location = self.world.get(name)
+            if not location:
                 continue
-            for direction, destination in location.exits.items():
-                if destination not in visible:
-                    continue
-                if not self.is_exit_locked(destination, loc_name):
-                    continue
-                if loc_name not in MINIMAP_LAYOUT or destination not in MINIMAP_LAYOUT:
-                    continue
-                x1, y1 = MINIMAP_LAYOUT[loc_name]["pos"]
-                x2, y2 = MINIMAP_LAYOUT[destination]["pos"]
-                if y1 == y2:
-                    if x2 > x1:
-                        block_x = x1 + MINIMAP_LABEL_WIDTH
-                    else:
-                        block_x = x1 - 1
-                    block_y = y1
-                elif x1 == x2:
-                    block_x = x1 + 1
-                    block_y = y1 + 1 if y2 > y1 else y1 - 1
-                else:
-                    continue
-                if 0 <= block_y < height and 0 <= block_x < width:
-                    blocked_positions.add((block_x, block_y))
+            for destination in self.locked_exits(location).values():
+                if destination in visible and (name, destination) in MINIMAP_LOCK_CELLS:
+                    blocked.add(MINIMAP_LOCK_CELLS[name, destination])
+        return (
+            current,
+            frozenset(visited),
+            frozenset(adjacent),
+            infected,
+            frozenset(self.get_quest_ready_locations()),
+            frozenset(npc_locations),
+            frozenset(blocked),
+            self.horde_active,
+        )
 
-        for block_x, block_y in blocked_positions:
-            grid[block_y][block_x] = "x"
+    def minimap_label(self, name, state):
+        """Return the (text, style) for a location label, or None when it is hidden."""
+        current, visited, adjacent, infected, ready, npc_locations, _, horde_active = state
+        abbr = MINIMAP_LAYOUT[name]["abbr"]
+        if name == current:
+            return f"<{abbr}>", "1;31" if name in infected else "1;34"
+        if name in infected or name in visited:
+            if horde_active and name == MINIMAP_ESCAPE_LOCATION:
+                style = "1;32"
+            elif name in infected:
+                style = "1;31"
+            elif name in npc_locations and name not in ready:
+                style = "1;33"
+            elif name in ready:
+                style = "1;32"
+            else:
+                style = None
+            return f"[{abbr}]", style
+        if name in adjacent:
+            return "[??]", MINIMAP_DIM_STYLE
+        return None
 
-        current_abbr = MINIMAP_LAYOUT.get(self.player.current_location, {}).get("abbr")
-        infected_abbrs = {
-            MINIMAP_LAYOUT[name]["abbr"]
-            for name in infected
-            if name in MINIMAP_LAYOUT and name != self.player.current_location
-        }
-        escape_abbr = MINIMAP_LAYOUT.get("Shattered Library", {}).get("abbr")
-        ready_locations = self.get_quest_ready_locations()
-        ready_abbrs = {
-            MINIMAP_LAYOUT[name]["abbr"]
-            for name in ready_locations
-            if name in MINIMAP_LAYOUT and name != self.player.current_location
-        }
-        npc_abbrs = set()
-        for name in visited:
-            if name == self.player.current_location:
+    def minimap_cells(self, state):
+        """Return the minimap's occupied cells as {row: {column: (text, style)}}."""
+        _, visited, adjacent, infected, _, _, blocked, _ = state
+        visible = visited | adjacent | infected
+        rows = {}
+        for start, end, cells, glyphs in MINIMAP_EDGE_CELLS:
+            if start not in visible or end not in visible:
                 continue
-            location = self.world.get(name)
-            if location and location.npcs:
-                abbr = MINIMAP_LAYOUT.get(name, {}).get("abbr")
-                if abbr:
-                    npc_abbrs.add(abbr)
-        npc_abbrs -= ready_abbrs
+            dim = (start in visited and end in adjacent) or (end in visited and start in adjacent)
+            glyph = (glyphs[1], MINIMAP_DIM_STYLE) if dim else (glyphs[0], None)
+            for x, y in cells:
+                rows.setdefault(y, {})[x] = glyph
+        for x, y in blocked:
+            rows.setdefault(y, {})[x] = ("x", "1;31")
         for name, data in MINIMAP_LAYOUT.items():
-            x, y = data["pos"]
-            abbr = data["abbr"]
-            if name == self.player.current_location:
-                label = f"<{abbr}>"
-            elif name in infected:
-                label = f"[{abbr}]"
-            elif name in visited:
-                label = f"[{abbr}]"
-            elif name in adjacent:
-                label = "[??]"
-            else:
-                label = " " * MINIMAP_LABEL_WIDTH
-            place_text(x, y, label)
+            label = self.minimap_label(name, state)
+            if label:
+                x, y = data["pos"]
+                rows.setdefault(y, {})[x] = label
+        return rows
+
+    def render_minimap_row(self, cells):
+        """Colorize one minimap row in a single pass over its occupied cells."""
+        parts = []
+        cursor = 0
+        for x, (text, style) in cells:
+            if x > cursor:
+                parts.append(" " * (x - cursor))
+            parts.append(color_text(text, style) if style else text)
+            cursor = x + len(text)
+        return "".join(parts)
+
+    def minimap_rows(self):
+        """Return rendered minimap rows, re-rendering only rows whose cells changed."""
+        state = self.minimap_state()
+        if state == self.minimap_cache_state:
+            return self.minimap_cache_rows
+        cells_by_row = self.minimap_cells(state)
+        rows = []
+        for y in range(MINIMAP_HEIGHT):
+            cells = tuple(sorted(cells_by_row.get(y, {}).items()))
+            cached = self.minimap_row_cache.get(y)
+            if cached is None or cached[0] != cells:
+                cached = (cells, self.render_minimap_row(cells))
+                self.minimap_row_cache[y] = cached
+            rows.append(cached[1])
+        self.minimap_cache_state = state
+        self.minimap_cache_rows = rows
+        return rows
 
+    def print_minimap(self, show_known=False):
+        """Render a small, directional map as the player explores."""
         self.print_section_header("Mini-map")
-        for row in grid:
-            row_text = "".join(row).rstrip()
-            if "[??]" in row_text:
-                row_text = row_text.replace("[??]", color_text("[??]", "2;37"))
-            if "." in row_text:
-                row_text = row_text.replace(".", color_text(".", "2;37"))
-            if ":" in row_text:
-                row_text = row_text.replace(":", color_text(":", "2;37"))
-            if "x" in row_text:
-                row_text = row_text.replace("x", color_text("x", "1;31"))
-            if current_abbr:
-                current_color = "1;31" if self.player.current_location in infected else "1;34"
-                row_text = row_text.replace(
-                    f"<{current_abbr}>", color_text(f"<{current_abbr}>", current_color)
-                )
-            for abbr in ready_abbrs:
-                row_text = row_text.replace(f"[{abbr}]", color_text(f"[{abbr}]", "1;32"))
-            for abbr in npc_abbrs:
-                row_text = row_text.replace(f"[{abbr}]", color_text(f"[{abbr}]", "1;33"))
-            for abbr in infected_abbrs:
-                row_text = row_text.replace(f"[{abbr}]", color_text(f"[{abbr}]", "1;31"))
-            if self.horde_active and escape_abbr:
-                row_text = row_text.replace(f"[{escape_abbr}]", color_text(f"[{escape_abbr}]", "1;32"))
-            print(row_text)
+        for row_text in self.minimap_rows():
+            self.io.print(row_text)
         if show_known:
+            visited = self.minimap_cache_state[1]
             known = [name for name in MINIMAP_LAYOUT if name in visited]
             if known:
                 legend = " | ".join(f"{MINIMAP_LAYOUT[name]['abbr']} {name}" for name in known)
-                print(color_text(f"Known: {legend}", "2;37"))
+                self.io.print(color_text(f"Known: {legend}", "2;37"))
 
     def format_item_list(self, items):
         """Format item names, collapsing duplicates with counts."""
@@ -1367,16 +2805,16 @@ __/_______\________\__\_/________\_ _/_____/_________
 
     def wait_for_continue(self):
         """Pause so the player can read the current output."""
-        safe_input("Press Enter to continue...")
+        self.io.input("Press Enter to continue...")
 
     def print_divider(self):
         """Print a thin divider rule for section separation."""
-        print(color_text(UI_RULE, "2;37"))
+        self.io.print(styled(UI_RULE, DIM_STYLE))
 
     def print_section_header(self, title):
         """Print a titled section with divider rules."""
         self.print_divider()
-        print(headline(title))
+        self.io.print(headline(title))
         self.print_divider()
 
     def format_currency(self, amount):
@@ -1389,47 +2827,18 @@ __/_______\________\__\_/________\_ _/_____/_________
 
     def format_item_name(self, item, dim=False):
         """Format item names with rarity tags when applicable."""
-        if item.rarity:
-            name = f"[{item.rarity}] {item.name}"
-            color_map = {
-                "Common": "37",
-                "Uncommon": "32",
-                "Rare": "34",
-                "Epic": "35",
-                "Legendary": "33",
-            }
-            color = color_map.get(item.rarity)
-            if color:
-                style = "2" if dim else "1"
-                return color_text(name, f"{style};{color}")
-            if dim:
-                return color_text(name, "2;37")
-            return name
-        if dim:
-            return color_text(item.name, "2;37")
-        return item.name
+        return styled_item_name(item.name, item.rarity, dim)
 
     def format_item_type_tag(self, item, dim=False):
         """Return a colored tag for item types shown in inventory."""
         if item.item_type == "consumable":
-            style = "2;32" if dim else "1;32"
-            return color_text("[Consumable]", style)
+            return styled("[Consumable]", "2;32" if dim else "1;32")
         return ""
 
-    def parse_item_query(self, item_name):
-        """Normalize item queries and extract any rarity tag."""
-        normalized = normalize_name(item_name).replace("[", "").replace("]", "")
-        rarity = None
-        for name in RARITY_MULTIPLIERS:
-            tier = name.lower()
-            if tier in normalized:
-                rarity = name
-                normalized = normalized.replace(tier, "").strip()
-                break
-        return normalized, rarity
-
     def summarize_items_with_counts(self, items):
         """Return ordered item stacks and counts."""
+        if isinstance(items, Inventory):
+            return items.stacks()
         counts = {}
         order = []
         for item in items:
@@ -1470,154 +2879,251 @@ __/_______\________\__\_/________\_ _/_____/_________
     # Command handling
     # -----------------------------
 
+    @classmethod
+    def register_command(cls, verbs, handler, needs_args=False, horde_safe=False):
+        """Route verbs to handler(game, verb, args) for this class and its subclasses."""
+        table = dict(cls.command_table)
+        for verb in verbs:
+            table[verb] = CommandSpec(handler, needs_args, horde_safe)
+        cls.command_table = table
+        cls.horde_verbs = frozenset(verb for verb, spec in table.items() if spec.horde_safe)
+
+    @classmethod
+    def collect_commands(cls):
+        """Register every method on this class marked with @command."""
+        for attribute in list(vars(cls).values()):
+            spec = getattr(attribute, "command_spec", None)
+            if spec:
+                verbs, needs_args, horde_safe = spec
+                cls.register_command(verbs, attribute, needs_args=needs_args, horde_safe=horde_safe)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.collect_commands()
+
     def process_command(self, command):
         """Parse input and route to the appropriate handler."""
-        if not command.strip():
-            return
-        command = command.strip()
         tokens = command.split()
+        if not tokens:
+            return
         verb = tokens[0].lower()
         args = tokens[1:]
+        spec = self.command_table.get(verb)
 
-        if self.horde_active and self.player.current_location == "The Temporal Breach Apex":
-            movement_verbs = {
-                "north",
-                "south",
-                "east",
-                "west",
-                "n",
-                "s",
-                "e",
-                "w",
-                "up",
-                "down",
-                "left",
-                "right",
-            }
-            if verb in ("go", "move") and args:
-                pass
-            elif verb in movement_verbs:
-                pass
-            elif verb in ("save", "quit", "exit", "load"):
-                pass
-            else:
-                print(danger("No time for that. You must run!"))
+        if self.horde_active and self.player.current_location == HORDE_LOCKOUT_LOCATION:
+            if verb not in self.horde_verbs or (spec.needs_args and not args):
+                self.io.print(danger("No time for that. You must run!"))
                 return
 
-        if verb in ("go", "move") and args:
-            self.move_player(self.normalize_direction(args[0].lower()))
-        elif verb in ("north", "south", "east", "west", "n", "s", "e", "w", "up", "down", "left", "right"):
-            self.move_player(self.normalize_direction(verb))
-        elif verb == "look":
-            self.force_show_art = True
-            self.display_location()
-            self.needs_redraw = False
-        elif verb == "help":
-            self.print_help()
-            self.wait_for_continue()
-            self.needs_redraw = True
-        elif verb == "take" and args:
-            if " ".join(args).lower() in ("all", "everything"):
-                self.take_all_items()
-            else:
-                self.take_item(" ".join(args))
-        elif verb == "drop" and args:
-            self.drop_item(" ".join(args))
-        elif verb == "inventory" or verb == "inv":
-            self.show_inventory()
-            self.needs_redraw = False
-        elif verb == "equip" and args:
+        if spec is None or (spec.needs_args and not args):
+            self.io.print("Command not recognized. Type 'help' for a list of actions.")
+            return
+        spec.handler(self, verb, args)
+
+    # -----------------------------
+    # Commands
+    # -----------------------------
+
+    @command("go", "move", needs_args=True, horde_safe=True)
+    def command_go(self, verb, args):
+        """Move in a named direction."""
+        self.move_player(self.normalize_direction(args[0].lower()))
+
+    @command(*MOVEMENT_VERBS, horde_safe=True)
+    def command_direction(self, verb, args):
+        """Move using a bare direction verb."""
+        self.move_player(self.normalize_direction(verb))
+
+    @command("look")
+    def command_look(self, verb, args):
+        """Redraw the current location with its art."""
+        self.force_show_art = True
+        self.display_location()
+        self.needs_redraw = False
+
+    @command("help")
+    def command_help(self, verb, args):
+        """Show the command list."""
+        self.print_help()
+        self.wait_for_continue()
+        self.needs_redraw = True
+
+    @command("take", needs_args=True)
+    def command_take(self, verb, args):
+        """Pick up one item or everything here."""
+        if " ".join(args).lower() in ("all", "everything"):
+            self.take_all_items()
+        else:
+            self.take_item(" ".join(args))
+
+    @command("drop", needs_args=True)
+    def command_drop(self, verb, args):
+        """Drop an item here."""
+        self.drop_item(" ".join(args))
+
+    @command("inventory", "inv")
+    def command_inventory(self, verb, args):
+        """List the player's inventory."""
+        self.show_inventory()
+        self.needs_redraw = False
+
+    @command("equip")
+    def command_equip(self, verb, args):
+        """Equip a named item, or choose from unequipped gear."""
+        if args:
             self.equip_item(" ".join(args))
-        elif verb == "equip":
-            options = [
-                item
-                for item in self.player.inventory
-                if item.item_type in ("weapon", "armor")
-                and item is not self.player.equipped_weapon
-                and item is not self.player.equipped_armor
-            ]
-            if not options:
-                print("You have no unequipped weapons or armor.")
-            else:
-                print("Equip what?")
-                for index, item in enumerate(options, 1):
-                    print(f"{index}) {self.format_item_name(item)}")
-                    stats_tag = self.format_merchant_item_stats(item)
-                    if stats_tag:
-                        print(f"        {stats_tag}")
-                choice = safe_input("Choose (number/name or 'back'): ").strip().lower()
-                if not choice or choice == "back":
-                    return
-                if choice.isdigit():
-                    selection = int(choice)
-                    if 1 <= selection <= len(options):
-                        self.equip_item(options[selection - 1].name, direct_item=options[selection - 1])
-                        return
-                self.equip_item(choice)
-        elif verb == "use" and args:
+            return
+        options = [
+            item
+            for item in self.player.inventory
+            if item.item_type in ("weapon", "armor")
+            and item is not self.player.equipped_weapon
+            and item is not self.player.equipped_armor
+        ]
+        if not options:
+            self.io.print("You have no unequipped weapons or armor.")
+            return
+        self.io.print("Equip what?")
+        for index, item in enumerate(options, 1):
+            self.io.print(f"{index}) {self.format_item_name(item)}")
+            stats_tag = self.format_merchant_item_stats(item)
+            if stats_tag:
+                self.io.print(f"        {stats_tag}")
+        choice = self.io.input("Choose (number/name or 'back'): ").strip().lower()
+        if not choice or choice == "back":
+            return
+        if choice.isdigit():
+            selection = int(choice)
+            if 1 <= selection <= len(options):
+                self.equip_item(options[selection - 1].name, direct_item=options[selection - 1])
+                return
+        self.equip_item(choice)
+
+    @command("use")
+    def command_use(self, verb, args):
+        """Use a named consumable, or choose from those carried."""
+        if args:
             self.use_item(" ".join(args))
-        elif verb == "use":
-            options = [item for item in self.player.inventory if item.item_type == "consumable"]
-            if not options:
-                print("You have no consumables.")
-            else:
-                print("Use what?")
-                for index, item in enumerate(options, 1):
-                    print(f"{index}) {self.format_item_name(item)}")
-                choice = safe_input("Choose (number/name or 'back'): ").strip().lower()
-                if not choice or choice == "back":
-                    return
-                if choice.isdigit():
-                    selection = int(choice)
-                    if 1 <= selection <= len(options):
-                        self.use_item(options[selection - 1].name)
-                        return
-                self.use_item(choice)
-        elif verb == "talk" and args:
-            if args[0].lower() == "to":
-                args = args[1:]
-            if not args:
-                print("Talk to whom?")
-            else:
-                self.talk_to_npc(" ".join(args))
-                self.wait_for_continue()
-                self.needs_redraw = True
-        elif verb == "quests":
-            self.show_quests()
-            self.needs_redraw = False
-        elif verb == "stats":
-            self.show_stats()
-            self.needs_redraw = False
-        elif verb == "map":
-            self.print_minimap(show_known=True)
-            self.needs_redraw = False
-        elif verb == "read" and args:
-            query = " ".join(args).strip().lower()
-            if query in ("book", "spellbook", "dark spellbook", "tome", "dark tome"):
-                self.use_item("Dark Spellbook")
-            else:
-                print("You can only read spellbooks for now.")
-        elif verb in ("examine", "inspect", "info") and args:
-            self.examine_item(" ".join(args))
-            self.needs_redraw = False
-        elif verb == "save":
-            self.save_game_prompt()
-        elif verb == "load":
-            if self.load_game_prompt():
-                self.needs_redraw = True
-        elif verb == "enter" and args:
-            if "portal" in args:
-                self.enter_portal()
-            else:
-                print("Enter what?")
-        elif verb == "portal":
+            return
+        options = [item for item in self.player.inventory if item.item_type == "consumable"]
+        if not options:
+            self.io.print("You have no consumables.")
+            return
+        self.io.print("Use what?")
+        for index, item in enumerate(options, 1):
+            self.io.print(f"{index}) {self.format_item_name(item)}")
+        choice = self.io.input("Choose (number/name or 'back'): ").strip().lower()
+        if not choice or choice == "back":
+            return
+        if choice.isdigit():
+            selection = int(choice)
+            if 1 <= selection <= len(options):
+                self.use_item(options[selection - 1].name)
+                return
+        self.use_item(choice)
+
+    @command("talk", needs_args=True)
+    def command_talk(self, verb, args):
+        """Talk to an NPC here."""
+        if args[0].lower() == "to":
+            args = args[1:]
+        if not args:
+            self.io.print("Talk to whom?")
+            return
+        self.talk_to_npc(" ".join(args))
+        self.wait_for_continue()
+        self.needs_redraw = True
+
+    @command("quests")
+    def command_quests(self, verb, args):
+        """Show the quest log."""
+        self.show_quests()
+        self.needs_redraw = False
+
+    @command("stats")
+    def command_stats(self, verb, args):
+        """Show character stats."""
+        self.show_stats()
+        self.needs_redraw = False
+
+    @command("map")
+    def command_map(self, verb, args):
+        """Show the full known map."""
+        self.print_minimap(show_known=True)
+        self.needs_redraw = False
+
+    @command("read", needs_args=True)
+    def command_read(self, verb, args):
+        """Read a spellbook."""
+        query = " ".join(args).strip().lower()
+        if query in ("book", "spellbook", "dark spellbook", "tome", "dark tome"):
+            self.use_item("Dark Spellbook")
+        else:
+            self.io.print("You can only read spellbooks for now.")
+
+    @command("examine", "inspect", "info", needs_args=True)
+    def command_examine(self, verb, args):
+        """Inspect an item."""
+        self.examine_item(" ".join(args))
+        self.needs_redraw = False
+
+    @command("save", horde_safe=True)
+    def command_save(self, verb, args):
+        """Save to a slot."""
+        self.save_game_prompt()
+
+    @command("load", horde_safe=True)
+    def command_load(self, verb, args):
+        """Load from a slot."""
+        if self.load_game_prompt():
+            self.needs_redraw = True
+
+    @command("enter", needs_args=True)
+    def command_enter(self, verb, args):
+        """Enter the portal."""
+        if "portal" in args:
             self.enter_portal()
-        elif verb == "quit" or verb == "exit":
-            self.confirm_quit()
         else:
-            print("Command not recognized. Type 'help' for a list of actions.")
+            self.io.print("Enter what?")
+
+    @command("portal")
+    def command_portal(self, verb, args):
+        """Enter the portal."""
+        self.enter_portal()
+
+    @command("color", "colour", horde_safe=True)
+    def command_color(self, verb, args):
+        """Turn ANSI colors on or off for this session's output."""
+        choice = args[0].lower() if args else ""
+        if choice in ("on", "off"):
+            self.io.use_color = choice == "on"
+            self.sync_styling()
+        elif choice:
+            self.io.print("Usage: color on|off")
+            return
+        self.io.print(f"Color is {'on' if self.io.use_color else 'off'}.")
+
+    @command("width", horde_safe=True)
+    def command_width(self, verb, args):
+        """Set the column width text is wrapped to for this session."""
+        if args:
+            choice = args[0].lower()
+            if choice == "off":
+                self.io.width = None
+            elif choice.isdigit() and WRAP_MIN_WIDTH <= int(choice) <= WRAP_MAX_WIDTH:
+                self.io.width = int(choice)
+            else:
+                self.io.print(f"Usage: width <{WRAP_MIN_WIDTH}-{WRAP_MAX_WIDTH}>|off")
+                return
+        if self.io.width:
+            self.io.print(f"Text wraps at {self.io.width} columns.")
+        else:
+            self.io.print("Text wrapping is off.")
 
-        # Horde advances only on successful movement.
+    @command("quit", "exit", horde_safe=True)
+    def command_quit(self, verb, args):
+        """Quit, offering to save first."""
+        self.confirm_quit()
 
     def confirm_quit(self):
         """Ask whether to save before quitting."""
@@ -1625,9 +3131,9 @@ __/_______\________\__\_/________\_ _/_____/_________
             self.running = False
             return
         try:
-            choice = safe_input("Save before quitting? (yes/no): ").strip().lower()
+            choice = self.io.input("Save before quitting? (yes/no): ").strip().lower()
         except KeyboardInterrupt:
-            print()
+            self.io.print()
             self.running = False
             return
         if choice in ("yes", "y"):
@@ -1636,51 +3142,43 @@ __/_______\________\__\_/________\_ _/_____/_________
         elif choice in ("no", "n"):
             self.running = False
         else:
-            print("Continuing your journey.")
+            self.io.print("Continuing your journey.")
 
     def print_help(self):
         """Display available commands for exploration and progression."""
         self.print_section_header("Commands")
-        print("go/move <direction> | north/south/east/west")
-        print("look | take <item> | drop <item>")
-        print("use <item> | equip <item> | inventory")
-        print("examine <item> | talk <npc> | quests | stats | map")
-        print("save | load | quit")
+        self.io.print("go/move <direction> | north/south/east/west")
+        self.io.print("look | take <item> | drop <item>")
+        self.io.print("use <item> | equip <item> | inventory")
+        self.io.print("examine <item> | talk <npc> | quests | stats | map")
+        self.io.print("save | load | color on/off | width <columns> | quit")
+        self.io.print("Chain commands with ';', e.g. 'n; n; take all; e'")
 
     def normalize_direction(self, direction):
         """Convert shorthand directions to full words."""
-        mapping = {
-            "n": "north",
-            "s": "south",
-            "e": "east",
-            "w": "west",
-            "up": "north",
-            "down": "south",
-            "left": "west",
-            "right": "east",
-        }
-        return mapping.get(direction, direction)
+        return DIRECTION_ALIASES.get(direction, direction)
 
     def resolve_item(self, item_name, items):
         """Find an item by exact or partial match, returning matches if ambiguous."""
-        normalized, rarity = self.parse_item_query(item_name)
+        normalized, rarity = parse_item_query(item_name)
         if not normalized:
             return None, None
-        exact_matches = [
-            item
-            for item in items
-            if normalize_name(item.name) == normalized and (not rarity or item.rarity == rarity)
-        ]
+        if isinstance(items, NamedCollection):
+            exact_candidates = items.items_named(normalized)
+        else:
+            named = [(normalize_name(item.name), item) for item in items]
+            exact_candidates = [item for name, item in named if name == normalized]
+        exact_matches = [item for item in exact_candidates if not rarity or item.rarity == rarity]
         if exact_matches:
             unique_keys = {self.item_key(item) for item in exact_matches}
             if len(unique_keys) == 1:
                 return exact_matches[0], []
             return None, exact_matches
-        partial_matches = [
-            item
-            for item in items
-            if normalized in normalize_name(item.name) and (not rarity or item.rarity == rarity)
-        ]
+        if isinstance(items, NamedCollection):
+            partial_candidates = items.items_containing(normalized)
+        else:
+            partial_candidates = [item for name, item in named if normalized in name]
+        partial_matches = [item for item in partial_candidates if not rarity or item.rarity == rarity]
         if partial_matches:
             unique_keys = {self.item_key(item) for item in partial_matches}
             if len(unique_keys) == 1:
@@ -1694,10 +3192,17 @@ __/_______\________\__\_/________\_ _/_____/_________
     def resolve_npc(self, npc_name, npcs):
         """Find an NPC by exact or partial match, returning matches if ambiguous."""
         normalized = normalize_name(npc_name)
-        exact_matches = [npc for npc in npcs if normalize_name(npc.name) == normalized]
+        if isinstance(npcs, NamedCollection):
+            exact_matches = npcs.items_named(normalized)
+        else:
+            named = [(normalize_name(npc.name), npc) for npc in npcs]
+            exact_matches = [npc for name, npc in named if name == normalized]
         if exact_matches:
             return exact_matches[0], []
-        partial_matches = [npc for npc in npcs if normalized in normalize_name(npc.name)]
+        if isinstance(npcs, NamedCollection):
+            partial_matches = npcs.items_containing(normalized)
+        else:
+            partial_matches = [npc for name, npc in named if normalized in name]
         if len(partial_matches) == 1:
             return partial_matches[0], []
         if partial_matches:
@@ -1711,17 +3216,17 @@ __/_______\________\__\_/________\_ _/_____/_________
         if not item:
             item, matches = self.resolve_item(item_name, location.items)
         if item:
-            print(headline(self.format_item_name(item)))
-            print(item.description)
+            self.io.print(headline(self.format_item_name(item)))
+            self.io.print(item.description)
             if item.effect:
-                print(f"Effects: {item.effect}")
-            print(f"Type: {item.item_type}")
+                self.io.print(f"Effects: {item.effect}")
+            self.io.print(f"Type: {item.item_type}")
             return
         if matches:
             options = self.format_item_list(matches)
-            print(f"Which item did you mean? {options}")
+            self.io.print(f"Which item did you mean? {options}")
         else:
-            print("You don't see that item here.")
+            self.io.print("You don't see that item here.")
 
     # -----------------------------
     # Movement and location events
@@ -1742,7 +3247,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                     f"claws rake your skin, leaving bloody lacerations. You take {damage} damage."
                 )
                 if self.player.health <= 0:
-                    print(danger(message))
+                    self.io.print(danger(message))
                     self.game_over()
                     return
                 self.pending_post_redraw_messages.append(danger(message))
@@ -1785,27 +3290,23 @@ __/_______\________\__\_/________\_ _/_____/_________
                     self.pending_post_combat_messages.append(escape_message)
                 else:
                     self.pending_post_redraw_messages.append(escape_message)
+            self.emit(Moved(self.previous_location, destination))
             self.just_moved = True
             self.needs_redraw = True
-        elif direction in location.exits and self.is_exit_locked(location.exits[direction], location.name):
-            destination = location.exits[direction]
-            if destination == "Barren Peaks" and location.name == "Ironclad Camp":
-                print("I should talk to Brak before going this way.")
-            elif destination == "Voidscar Hollow" and location.name == "Chasm of Whispers":
-                print("I should talk with Nyx before going this way.")
-            elif destination == "The Temporal Breach Apex" and location.name == "The Chronos Nexus":
-                print("I can't help but feeling I need to go back and see what else needs done first.")
-            else:
-                print("A sealed passage blocks your way. Something deeper must call you first.")
+        elif direction in self.locked_exits(location):
+            lock = self.find_exit_lock(location.exits[direction], location.name)
+            self.io.print(lock.message)
+            self.queued_commands.clear()
         else:
-            print("You cannot travel that way.")
+            self.io.print("You cannot travel that way.")
+            self.queued_commands.clear()
 
     def trigger_events(self, location):
         """Fire one-time or repeatable events tied to a location."""
         for event in location.events:
             if event["once"] and event["id"] in self.triggered_events:
                 continue
-            print(color_text(event["text"], "1;35"))
+            self.io.print(color_text(event["text"], "1;35"))
             if event["once"]:
                 self.triggered_events.add(event["id"])
 
@@ -1818,6 +3319,7 @@ __/_______\________\__\_/________\_ _/_____/_________
         if random.random() > RETURN_ENCOUNTER_CHANCE:
             return
         enemy_name = random.choice(self.wandering_enemy_pool)
+        location = self.world.mutable(location.name)
         location.enemies.append(self.clone_enemy(enemy_name))
         self.pending_encounter_message = "A lurking threat stirs as you return."
 
@@ -1830,6 +3332,8 @@ __/_______\________\__\_/________\_ _/_____/_________
         location = self.world[self.player.current_location]
         item, matches = self.resolve_item(item_name, location.items)
         if item:
+            location = self.world.mutable(location.name)
+            item, matches = self.resolve_item(item_name, location.items)
             location.items.remove(item)
             self.player.inventory.append(item)
             if item.major:
@@ -1843,16 +3347,17 @@ __/_______\________\__\_/________\_ _/_____/_________
             return
         if matches:
             options = self.format_item_list(matches)
-            print(f"Which item did you mean? {options}")
+            self.io.print(f"Which item did you mean? {options}")
             return
-        print("That item is not here.")
+        self.io.print("That item is not here.")
 
     def take_all_items(self):
         """Pick up all items from the current location."""
         location = self.world[self.player.current_location]
         if not location.items:
-            print("There is nothing here to take.")
+            self.io.print("There is nothing here to take.")
             return
+        location = self.world.mutable(location.name)
         items_to_take = list(location.items)
         location.items.clear()
         equip_message = None
@@ -1890,55 +3395,43 @@ __/_______\________\__\_/________\_ _/_____/_________
             f"You put on the {self.format_item_name(item)}, gaining {defense} defense points."
         )
 
-    def drop_item(self, item_name):
+    def drop_item(self, item_name, direct_item=None):
         """Drop an item into the current location."""
         if direct_item:
             item = direct_item
             matches = []
         else:
             item, matches = self.resolve_item(item_name, self.player.inventory)
-        if item:
-            if self.player.equipped_weapon == item:
-                self.player.equipped_weapon = None
-            if self.player.equipped_armor == item:
-                self.player.equipped_armor = None
-            self.player.inventory.remove(item)
-            self.world[self.player.current_location].items.append(item)
-            print(f"You drop the {self.format_item_name(item)}.")
-            self.needs_redraw = True
-            return
-        if matches:
+        if not item and matches:
             order, counts = self.summarize_items_with_counts(matches)
-            print("Which item did you mean?")
+            self.io.print("Which item did you mean?")
             for index, match in enumerate(order, 1):
                 key = self.item_key(match)
                 count_tag = f" (x{counts[key]})" if counts[key] > 1 else ""
-                print(f"{index}) {self.format_item_name(match)}{count_tag}")
-            choice = safe_input("Equip which item? (number or 'back'): ").strip().lower()
+                self.io.print(f"{index}) {self.format_item_name(match)}{count_tag}")
+            choice = self.io.input("Drop which item? (number or 'back'): ").strip().lower()
             if not choice or choice == "back":
                 return
-            if choice.isdigit():
-                selection = int(choice)
-                if 1 <= selection <= len(order):
-                    item = order[selection - 1]
-                    if item.item_type == "weapon":
-                        self.player.equipped_weapon = item
-                        print(good(f"You equip the {self.format_item_name(item)}."))
-                        return
-                    if item.item_type == "armor":
-                        self.player.equipped_armor = item
-                        print(good(f"You equip the {self.format_item_name(item)}."))
-                        return
-                    print("You can only equip weapons or armor.")
-                    return
-            print("Please choose a valid number.")
+            if not choice.isdigit() or not 1 <= int(choice) <= len(order):
+                self.io.print("Please choose a valid number.")
+                return
+            item = order[int(choice) - 1]
+        if not item:
+            self.io.print("You don't have that item.")
             return
-        print("You don't have that item.")
+        if self.player.equipped_weapon == item:
+            self.player.equipped_weapon = None
+        if self.player.equipped_armor == item:
+            self.player.equipped_armor = None
+        self.player.inventory.remove(item)
+        self.world.mutable(self.player.current_location).items.append(item)
+        self.io.print(f"You drop the {self.format_item_name(item)}.")
+        self.needs_redraw = True
 
     def show_inventory(self):
         """List the player's inventory."""
         if not self.player.inventory:
-            print("Your inventory is empty.")
+            self.io.print("Your inventory is empty.")
             return
         self.print_section_header("Inventory")
         order, counts = self.summarize_items_with_counts(self.player.inventory)
@@ -1956,10 +3449,10 @@ __/_______\________\__\_/________\_ _/_____/_________
             name = self.format_item_name(item)
             type_tag = self.format_item_type_tag(item, dim=False)
             type_suffix = f" {type_tag}" if type_tag else ""
-            print(f"- {name}{count_tag}{equip_tag}{type_suffix}")
+            self.io.print(f"- {name}{count_tag}{equip_tag}{type_suffix}")
             stats_tag = self.format_merchant_item_stats(item)
             if stats_tag:
-                print(f"        {stats_tag}")
+                self.io.print(f"        {stats_tag}")
 
     def equip_item(self, item_name, direct_item=None):
         """Equip a weapon or armor from the inventory."""
@@ -1971,19 +3464,19 @@ __/_______\________\__\_/________\_ _/_____/_________
         if item:
             if item.item_type == "weapon":
                 self.player.equipped_weapon = item
-                print(good(f"You equip the {self.format_item_name(item)}."))
+                self.io.print(good(f"You equip the {self.format_item_name(item)}."))
                 return
             if item.item_type == "armor":
                 self.player.equipped_armor = item
-                print(good(f"You equip the {self.format_item_name(item)}."))
+                self.io.print(good(f"You equip the {self.format_item_name(item)}."))
                 return
-            print("You can only equip weapons or armor.")
+            self.io.print("You can only equip weapons or armor.")
             return
         if matches:
             options = self.format_item_list(matches)
-            print(f"Which item did you mean? {options}")
+            self.io.print(f"Which item did you mean? {options}")
             return
-        print("You don't have that item.")
+        self.io.print("You don't have that item.")
 
     def use_item(self, item_name, in_combat=False):
         """Use a consumable item and apply its effects."""
@@ -1992,7 +3485,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             if item.item_type != "consumable":
                 if in_combat:
                     return False, ["That item cannot be used right now."]
-                print("That item cannot be used right now.")
+                self.io.print("That item cannot be used right now.")
                 return False
             if item.name == "Dark Spellbook" and self.player.current_active_spell == "lightning bolt":
                 message = (
@@ -2001,7 +3494,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                 )
                 if in_combat:
                     return False, [message]
-                print(message)
+                self.io.print(message)
                 return False
             messages = self.apply_item_effect(item)
             if item.name == "Dark Spellbook":
@@ -2014,8 +3507,8 @@ __/_______\________\__\_/________\_ _/_____/_________
                 return True, messages + [use_line]
             if self.player.health <= 0:
                 for message in messages:
-                    print(message)
-                print(use_line)
+                    self.io.print(message)
+                self.io.print(use_line)
                 self.game_over()
                 return True
             self.pending_post_redraw_messages.extend(messages)
@@ -2026,11 +3519,11 @@ __/_______\________\__\_/________\_ _/_____/_________
             options = self.format_item_list(matches)
             if in_combat:
                 return False, [f"Which item did you mean? {options}"]
-            print(f"Which item did you mean? {options}")
+            self.io.print(f"Which item did you mean? {options}")
             return False
         if in_combat:
             return False, ["You don't have that item."]
-        print("You don't have that item.")
+        self.io.print("You don't have that item.")
         return False
 
     def apply_passive_item_effect(self, item):
@@ -2044,18 +3537,18 @@ __/_______\________\__\_/________\_ _/_____/_________
             amount = item.effect["health"]
             if amount >= 0:
                 self.player.health = min(self.player.max_health, self.player.health + amount)
-                print(good("Warmth floods through your body."))
+                self.io.print(good("Warmth floods through your body."))
             else:
                 self.player.health = max(0, self.player.health + amount)
-                print(danger("The relic's power bites back."))
+                self.io.print(danger("The relic's power bites back."))
         if "mana" in item.effect:
             amount = item.effect["mana"]
             if amount >= 0:
                 self.player.mana = min(self.player.max_mana, self.player.mana + amount)
-                print(good("A clear, cool current fills your senses."))
+                self.io.print(good("A clear, cool current fills your senses."))
         if "magic" in item.effect:
             self.player.magic += item.effect["magic"]
-            print(good("Arcane power stirs within you."))
+            self.io.print(good("Arcane power stirs within you."))
         if "strength" in item.effect:
             self.player.strength += item.effect["strength"]
         if "agility" in item.effect:
@@ -2103,7 +3596,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             ("agility", "Agility"),
         ):
             if stat in item.effect:
-                current = self.player.__dict__[stat]
+                current = getattr(self.player, stat)
                 delta = current - before[stat]
                 if delta != 0:
                     sign = "+" if delta > 0 else ""
@@ -2170,10 +3663,10 @@ __/_______\________\__\_/________\_ _/_____/_________
 
     def move_ilyra_to_portal(self):
         """Relocate Ilyra to the Shattered Library during the horde."""
-        ruins = self.world.get("Whispering Ruins")
-        library = self.world.get("Shattered Library")
-        if not ruins or not library:
+        if "Whispering Ruins" not in self.world or "Shattered Library" not in self.world:
             return
+        ruins = self.world.mutable("Whispering Ruins")
+        library = self.world.mutable("Shattered Library")
         ilyra = None
         for npc in list(ruins.npcs):
             if npc.name == "Ilyra":
@@ -2195,7 +3688,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             and self.player.current_location == "Whispering Ruins"
             and "ilyra" in normalize_name(npc_query)
         ):
-            print(
+            self.io.print(
                 "Ilyra is nowhere to be found. A sense of urgency compels you towards the Shattered Library."
             )
             return
@@ -2210,9 +3703,9 @@ __/_______\________\__\_/________\_ _/_____/_________
                 ):
                     self.handle_ilyra()
                 else:
-                    print(npc_name(f"{npc.name}: Go, Wayfinder! The horde approaches!"))
+                    self.io.print(npc_name(f"{npc.name}: Go, Wayfinder! The horde approaches!"))
                 return
-            print(npc_name(f"{npc.name}: {npc.dialogue}"))
+            self.io.print(npc_name(f"{npc.name}: {npc.dialogue}"))
             if npc.name == "Ilyra":
                 self.handle_ilyra()
             elif npc.name == "Brak":
@@ -2226,16 +3719,16 @@ __/_______\________\__\_/________\_ _/_____/_________
             return
         if matches:
             options = ", ".join(match.name for match in matches)
-            print(f"Who did you want to speak with? {options}")
+            self.io.print(f"Who did you want to speak with? {options}")
         else:
-            print("No one by that name is here.")
+            self.io.print("No one by that name is here.")
 
     def notify_first_quest(self):
         """Show the quest log tip when the first quest is accepted."""
         if self.player.flags.get("quest_tip_shown"):
             return
         if len(self.player.quests) == 1:
-            print(color_text("Tip: Use the 'quests' command to track your active quests.", "2;37"))
+            self.io.print(styled("Tip: Use the 'quests' command to track your active quests.", DIM_STYLE))
             self.player.flags["quest_tip_shown"] = True
 
     def handle_ilyra(self):
@@ -2246,30 +3739,30 @@ __/_______\________\__\_/________\_ _/_____/_________
             and self.player.current_location == "Shattered Library"
         ):
             if self.player.spellbooks_read_count >= 6 and not self.player.flags.get("ilyra_spellbook_lore"):
-                print(
+                self.io.print(
                     npc_name(
                         "Ilyra: Wayfinder, I've been studying the fragments of lore we've gathered. The mages who caused the Sundering... they didn't just seek power, they sought to command time itself. But their research notes, their rituals... many of them were recorded in tomes much like the 'Dark Spellbooks' you carry. They delved deeper and deeper, believing they were mastering time, but the books, the forbidden knowledge, slowly mastered them. It warped their judgment, consumed their ethics, and blinded them to the true danger of tearing at the fabric of existence. The cost to your vitality when you read them... it's a small echo of the price they paid, and the price Aethelgard is still paying."
                     )
                 )
                 self.player.flags["ilyra_spellbook_lore"] = True
-            print(
+            self.io.print(
                 npc_name(
                     "Ilyra: Wayfinder! You made it! This portal... it's not just a way from Aethelgard, it's a tear through the Temporal Breach itself! I can't hold it much longer! The unraveling... it's consuming everything! You must step through! Carry the truth of Aethelgard's folly, the knowledge of this collapsing reality, to wherever it leads! Go! Escape... and remember!"
                 )
             )
-            choice = safe_input("Enter the portal? (yes/no): ").strip().lower()
+            choice = self.io.input("Enter the portal? (yes/no): ").strip().lower()
             if choice in ("yes", "y"):
                 self.enter_portal()
             return
         if self.player.spellbooks_read_count >= 6 and not self.player.flags.get("ilyra_spellbook_lore"):
-            print(
+            self.io.print(
                 npc_name(
                     "Ilyra: Wayfinder, I've been studying the fragments of lore we've gathered. The mages who caused the Sundering... they didn't just seek power, they sought to command time itself. But their research notes, their rituals... many of them were recorded in tomes much like the 'Dark Spellbooks' you carry. They delved deeper and deeper, believing they were mastering time, but the books, the forbidden knowledge, slowly mastered them. It warped their judgment, consumed their ethics, and blinded them to the true danger of tearing at the fabric of existence. The cost to your vitality when you read them... it's a small echo of the price they paid, and the price Aethelgard is still paying."
                 )
             )
             self.player.flags["ilyra_spellbook_lore"] = True
         if "Shimmering Pass" in self.player.visited_locations and random.random() < 0.5:
-            print(
+            self.io.print(
                 npc_name(
                     "Ilyra: The veil between moments feels thinner, especially towards the east. "
                     "The whispers carry not just the past, but fragments of what might have been... or what is yet to come. It's unsettling."
@@ -2277,7 +3770,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             )
         quest = self.get_quest("echo_crystal")
         if not quest:
-            choice = safe_input("Accept her request to recover an Echo Crystal? (yes/no): ").strip().lower()
+            choice = self.io.input("Accept her request to recover an Echo Crystal? (yes/no): ").strip().lower()
             if choice == "yes":
                 new_quest = Quest(
                     "echo_crystal",
@@ -2286,43 +3779,43 @@ __/_______\________\__\_/________\_ _/_____/_________
                     {"item": "Echo Crystal"},
                     {"exp": 60, "gold": 20},
                 )
-                self.player.quests.append(new_quest)
-                print(good("Quest accepted: Echoes in the Library."))
+                self.accept_quest(new_quest)
+                self.io.print(good("Quest accepted: Echoes in the Library."))
                 self.notify_first_quest()
             else:
-                print("Ilyra nods, her eyes shadowed with disappointment.")
+                self.io.print("Ilyra nods, her eyes shadowed with disappointment.")
             return
 
         if quest.status != "completed":
             if self.player_has_item("Echo Crystal"):
-                print(npc_name("Ilyra: You found it. Will you share its truth with the Remnants?"))
-                print("1) Give the Echo Crystal to Ilyra.")
-                print("2) Keep it for yourself.")
-                choice = safe_input("Choose 1 or 2: ").strip()
+                self.io.print(npc_name("Ilyra: You found it. Will you share its truth with the Remnants?"))
+                self.io.print("1) Give the Echo Crystal to Ilyra.")
+                self.io.print("2) Keep it for yourself.")
+                choice = self.io.input("Choose 1 or 2: ").strip()
                 if choice == "1":
                     self.remove_item_from_inventory("Echo Crystal")
-                    quest.status = "completed"
+                    self.complete_quest(quest)
                     self.player.gain_experience(quest.rewards["exp"])
                     self.add_gold(quest.rewards["gold"])
-                    print(good("Ilyra cradles the crystal, whispering a prayer."))
-                    print(good("You gain the Remnants' trust."))
+                    self.io.print(good("Ilyra cradles the crystal, whispering a prayer."))
+                    self.io.print(good("You gain the Remnants' trust."))
                     self.check_heartstone_unlock()
                 elif choice == "2":
-                    quest.status = "completed"
+                    self.complete_quest(quest)
                     self.player.gain_experience(quest.rewards["exp"] // 2)
                     self.player.flags["kept_echo_crystal"] = True
-                    print(danger("You tuck the crystal away, its whispers now yours alone."))
-                    print(danger("The Shadow Weavers' influence stirs within you."))
+                    self.io.print(danger("You tuck the crystal away, its whispers now yours alone."))
+                    self.io.print(danger("The Shadow Weavers' influence stirs within you."))
                     self.check_heartstone_unlock()
                 else:
-                    print("Ilyra waits for a clearer answer.")
+                    self.io.print("Ilyra waits for a clearer answer.")
             else:
-                print("Ilyra: The Shattered Library still holds what we need. Be cautious.")
+                self.io.print("Ilyra: The Shattered Library still holds what we need. Be cautious.")
             return
 
         scroll_quest = self.get_quest("lost_scroll")
         if not scroll_quest:
-            choice = safe_input(
+            choice = self.io.input(
                 "Ilyra asks you to recover her lost scroll from the Sunken Archives. Accept? (yes/no): "
             ).strip().lower()
             if choice == "yes":
@@ -2333,28 +3826,28 @@ __/_______\________\__\_/________\_ _/_____/_________
                     {"item": "Scholar's Lost Scroll"},
                     {"magic": 1, "item": "Mana Bloom", "faction": "Remnants of Aethelgard"},
                 )
-                self.player.quests.append(new_quest)
+                self.accept_quest(new_quest)
                 self.update_lost_scroll_state()
-                print(good("Quest accepted: The Scholar's Lost Scroll."))
+                self.io.print(good("Quest accepted: The Scholar's Lost Scroll."))
                 self.notify_first_quest()
             else:
-                print("Ilyra presses the request no further, but her concern lingers.")
+                self.io.print("Ilyra presses the request no further, but her concern lingers.")
             return
 
         if scroll_quest.status == "completed":
-            print("Ilyra: The Ley Line Conflux will no longer hide from us. Thank you, Wayfinder.")
+            self.io.print("Ilyra: The Ley Line Conflux will no longer hide from us. Thank you, Wayfinder.")
             return
 
         if self.player_has_item("Scholar's Lost Scroll"):
             self.remove_item_from_inventory("Scholar's Lost Scroll")
-            scroll_quest.status = "completed"
+            self.complete_quest(scroll_quest)
             self.player.magic += 1
             reward_item = self.clone_item("Mana Bloom")
             self.player.inventory.append(reward_item)
             if reward_item.major:
                 self.show_item_art(reward_item)
-            print(good("Ilyra: The Ley Line Conflux will no longer hide from us. Thank you, Wayfinder."))
-            print(
+            self.io.print(good("Ilyra: The Ley Line Conflux will no longer hide from us. Thank you, Wayfinder."))
+            self.io.print(
                 good(
                     "Ilyra unseals the scroll, her eyes widening with a mix of awe and terror as the ancient ink stirs and shifts. "
                     "'It speaks of a desperate ritual at the Conflux,' she whispers, her voice trembling. "
@@ -2363,15 +3856,15 @@ __/_______\________\__\_/________\_ _/_____/_________
                     "This scroll... it warns that the Breach was never truly closed, only contained by something ancient and terrible.'"
                 )
             )
-            print(good("You gain insight and the Remnants' deeper trust."))
+            self.io.print(good("You gain insight and the Remnants' deeper trust."))
             self.check_heartstone_unlock()
         else:
-            print("Ilyra: The Sunken Archives are treacherous. The scroll must still be there.")
+            self.io.print("Ilyra: The Sunken Archives are treacherous. The scroll must still be there.")
 
     def handle_brak(self):
         """Handle Ironclad scout quest and rewards."""
         if "Shimmering Pass" in self.player.visited_locations and random.random() < 0.5:
-            print(
+            self.io.print(
                 npc_name(
                     "Brak: The air feels wrong in the east, Wayfinder. Not just magic, but... time itself feels twisted. "
                     "Creatures appear and disappear. Something unnatural is stirring, something that even steel might not hold back."
@@ -2379,7 +3872,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             )
         quest = self.get_quest("clear_path")
         if not quest:
-            choice = safe_input(
+            choice = self.io.input(
                 "Brak asks you to clear the monsters in the Barren Peaks to the north. Accept? (yes/no): "
             ).strip().lower()
             if choice == "yes":
@@ -2390,33 +3883,33 @@ __/_______\________\__\_/________\_ _/_____/_________
                     {"defeat": "Wildling Brute"},
                     {"exp": 50, "item": "Ironclad Mail"},
                 )
-                self.player.quests.append(new_quest)
-                print(good("Quest accepted: Clear the Barren Peaks."))
+                self.accept_quest(new_quest)
+                self.io.print(good("Quest accepted: Clear the Barren Peaks."))
                 self.notify_first_quest()
             else:
-                print("Brak grunts, unimpressed.")
+                self.io.print("Brak grunts, unimpressed.")
             return
 
         if quest.status != "completed":
             if self.player.flags.get("defeated_wildling"):
-                quest.status = "completed"
+                self.complete_quest(quest)
                 self.player.gain_experience(quest.rewards["exp"])
                 reward_item = self.clone_item(quest.rewards["item"])
                 self.player.inventory.append(reward_item)
                 if reward_item.major:
                     self.show_item_art(reward_item)
-                print(good("Brak hands you Ironclad Mail."))
+                self.io.print(good("Brak hands you Ironclad Mail."))
                 equip_message = self.auto_equip_armor(reward_item)
                 if equip_message:
-                    print(equip_message)
+                    self.io.print(equip_message)
                 self.check_heartstone_unlock()
             else:
-                print("Brak: The brute still prowls the peaks. Finish it.")
+                self.io.print("Brak: The brute still prowls the peaks. Finish it.")
             return
 
         outpost_quest = self.get_quest("blighted_outpost")
         if not outpost_quest:
-            choice = safe_input(
+            choice = self.io.input(
                 "Brak growls about the Blighted Outpost east of the Barren Peaks. Clear it out? (yes/no): "
             ).strip().lower()
             if choice == "yes":
@@ -2427,19 +3920,19 @@ __/_______\________\__\_/________\_ _/_____/_________
                     {"defeat": "Stone-Hide Golem"},
                     {"exp": 80, "item": "Ironclad Plate Armor", "health": 15},
                 )
-                self.player.quests.append(new_quest)
-                print(good("Quest accepted: The Blighted Outpost."))
+                self.accept_quest(new_quest)
+                self.io.print(good("Quest accepted: The Blighted Outpost."))
                 self.notify_first_quest()
             else:
-                print("Brak spits into the fire, unimpressed.")
+                self.io.print("Brak spits into the fire, unimpressed.")
             return
 
         if outpost_quest.status == "completed":
-            print("Brak: The peaks sing quieter now. You did well, Wayfinder.")
+            self.io.print("Brak: The peaks sing quieter now. You did well, Wayfinder.")
             return
 
         if not self.location_has_enemy("Blighted Outpost", "Stone-Hide Golem"):
-            outpost_quest.status = "completed"
+            self.complete_quest(outpost_quest)
             self.player.gain_experience(outpost_quest.rewards["exp"])
             reward_item = self.clone_item(outpost_quest.rewards["item"])
             self.player.inventory.append(reward_item)
@@ -2447,19 +3940,19 @@ __/_______\________\__\_/________\_ _/_____/_________
                 self.show_item_art(reward_item)
             equip_message = self.auto_equip_armor(reward_item)
             if equip_message:
-                print(equip_message)
+                self.io.print(equip_message)
             self.player.max_health += outpost_quest.rewards["health"]
             self.player.health = self.player.max_health
-            print(good("Brak clasps your forearm and hands over Ironclad Plate Armor."))
-            print(good("Your body feels tougher after the ordeal."))
+            self.io.print(good("Brak clasps your forearm and hands over Ironclad Plate Armor."))
+            self.io.print(good("Your body feels tougher after the ordeal."))
             self.check_heartstone_unlock()
         else:
-            print("Brak: The outpost still crawls with stone-hide beasts. Finish the job.")
+            self.io.print("Brak: The outpost still crawls with stone-hide beasts. Finish the job.")
 
     def handle_nyx(self):
         """Handle Shadow Weaver quest and rewards."""
         if "Shimmering Pass" in self.player.visited_locations and random.random() < 0.5:
-            print(
+            self.io.print(
                 npc_name(
                     "Nyx: The eastern lands grow... vibrant. The fabric of existence thins, and the whispers grow louder. "
                     "A powerful presence stirs there, drawing the very essence of the Breach closer. A grand unraveling awaits."
@@ -2468,13 +3961,13 @@ __/_______\________\__\_/________\_ _/_____/_________
         quest = self.get_quest("void_shards")
         if not quest:
             if self.player.flags.get("kept_echo_crystal"):
-                print(
+                self.io.print(
                     npc_name(
                         "Nyx: The echo you kept drew me here. The void has tasted you already. "
                         "Its shards lie to the east."
                     )
                 )
-            choice = safe_input(
+            choice = self.io.input(
                 "Nyx offers a pact: gather three Void Shards to the east. Accept? (yes/no): "
             ).strip().lower()
             if choice == "yes":
@@ -2485,31 +3978,31 @@ __/_______\________\__\_/________\_ _/_____/_________
                     {"item": "Void Shard", "count": 3},
                     {"exp": 90, "item": "Shadow-Kissed Dagger"},
                 )
-                self.player.quests.append(new_quest)
-                print(good("Quest accepted: Whispers of the Void."))
+                self.accept_quest(new_quest)
+                self.io.print(good("Quest accepted: Whispers of the Void."))
                 self.notify_first_quest()
             else:
-                print("Nyx fades back into the chasm's shadow.")
+                self.io.print("Nyx fades back into the chasm's shadow.")
             return
 
         if quest.status == "completed":
-            print("Nyx: The void sings through you now. Do not waste its favor.")
+            self.io.print("Nyx: The void sings through you now. Do not waste its favor.")
             return
 
         if self.count_inventory_items("Void Shard") >= 3:
-            choice = safe_input("Nyx extends a gloved hand for the shards. Give them? (yes/no): ").strip().lower()
+            choice = self.io.input("Nyx extends a gloved hand for the shards. Give them? (yes/no): ").strip().lower()
             if choice != "yes":
-                print("Nyx: Then keep their whispers, for now.")
+                self.io.print("Nyx: Then keep their whispers, for now.")
                 return
             self.remove_items_from_inventory("Void Shard", 3)
-            quest.status = "completed"
+            self.complete_quest(quest)
             self.player.gain_experience(quest.rewards["exp"])
             reward_item = self.clone_item(quest.rewards["item"])
             self.player.inventory.append(reward_item)
             if reward_item.major:
                 self.show_item_art(reward_item)
-            print(danger("Nyx: The void sings through you now. Do not waste its favor."))
-            print(
+            self.io.print(danger("Nyx: The void sings through you now. Do not waste its favor."))
+            self.io.print(
                 danger(
                     "Nyx smiles, her voice like smoke: 'These Void Shards... they are tears from the Temporal Breach itself, Wayfinder. "
                     "Fragments of raw, unmaking energy. The Sundering was not a tragedy, but an opportunity - a glimpse into the true chaos that lies beyond. "
@@ -2518,46 +4011,46 @@ __/_______\________\__\_/________\_ _/_____/_________
             )
             self.check_heartstone_unlock()
         else:
-            print("Nyx: The void still hungers. The shards are to the east.")
+            self.io.print("Nyx: The void still hungers. The shards are to the east.")
 
     def handle_kaelen(self):
         """Handle trading with Kaelen Stonehand."""
         self.sanitize_merchant_inventory()
-        print(npc_name("Kaelen: Steel and salt are all that keep you breathing out here."))
-        print(npc_name("Kaelen: Rumor says the cliffs sing at night. I don't wait around to listen."))
+        self.io.print(npc_name("Kaelen: Steel and salt are all that keep you breathing out here."))
+        self.io.print(npc_name("Kaelen: Rumor says the cliffs sing at night. I don't wait around to listen."))
         while True:
-            print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
-            choice = safe_input("Trade (buy/sell/leave): ").strip().lower()
+            self.io.print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
+            choice = self.io.input("Trade (buy/sell/leave): ").strip().lower()
             if choice in ("leave", "exit", "no"):
-                print("Kaelen nods once, already watching the road.")
+                self.io.print("Kaelen nods once, already watching the road.")
                 return
             if choice == "buy":
                 self.trade_buy()
             elif choice == "sell":
                 self.trade_sell()
             else:
-                print("Kaelen: Say it straight. Buy, sell, or leave.")
+                self.io.print("Kaelen: Say it straight. Buy, sell, or leave.")
 
     def trade_buy(self):
         """Buy items from the merchant."""
         self.sanitize_merchant_inventory()
         if not self.merchant_inventory:
-            print("Kaelen: I'm out of stock for now.")
+            self.io.print("Kaelen: I'm out of stock for now.")
             return
         while True:
             self.print_section_header("Kaelen's Stock")
-            print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
+            self.io.print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
             order, counts = self.summarize_items_with_counts(self.merchant_inventory)
             for index, item in enumerate(order, 1):
                 key = self.item_key(item)
                 count_tag = f" (x{counts[key]})" if counts[key] > 1 else ""
-                print(
+                self.io.print(
                     f"{index}) {self.format_item_name(item)}{count_tag} - {self.format_currency(item.gold_value)}"
                 )
                 stats_tag = self.format_merchant_item_stats(item)
                 if stats_tag:
-                    print(f"        {stats_tag}")
-            choice = safe_input("Buy which item? (number/name or 'back'): ").strip().lower()
+                    self.io.print(f"        {stats_tag}")
+            choice = self.io.input("Buy which item? (number/name or 'back'): ").strip().lower()
             if not choice or choice == "back":
                 return
             item = None
@@ -2569,14 +4062,14 @@ __/_______\________\__\_/________\_ _/_____/_________
                 item, matches = self.resolve_item(choice, self.merchant_inventory)
                 if matches:
                     options = self.format_item_list(matches)
-                    print(f"Which item did you mean? {options}")
+                    self.io.print(f"Which item did you mean? {options}")
                     continue
             if not item:
-                print("Kaelen: I don't carry that.")
+                self.io.print("Kaelen: I don't carry that.")
                 continue
             price = item.gold_value
             if self.player.gold < price:
-                print("Kaelen: You can't afford that.")
+                self.io.print("Kaelen: You can't afford that.")
                 continue
             self.player.gold -= price
             self.merchant_inventory.remove(item)
@@ -2584,91 +4077,38 @@ __/_______\________\__\_/________\_ _/_____/_________
             if item.major:
                 self.show_item_art(item)
             self.apply_passive_item_effect(item)
-            print(good(f"You buy {self.format_item_name(item)} for {self.format_currency(price)}."))
+            self.io.print(good(f"You buy {self.format_item_name(item)} for {self.format_currency(price)}."))
             equip_message = self.auto_equip_armor(item)
             if equip_message:
-                print(equip_message)
+                self.io.print(equip_message)
 
     def format_merchant_item_stats(self, item):
         """Format weapon/armor stats with comparisons to equipped gear."""
         if item.item_type == "weapon":
-            item_damage = item.effect.get("damage", 0)
-            equipped_damage = self.player.equipped_weapon.effect.get("damage", 0) if self.player.equipped_weapon else 0
-            delta = item_damage - equipped_damage
-            if delta == 0:
-                return f" (Damage {item_damage})"
-            sign = "+" if delta > 0 else ""
-            diff_text = f"{sign}{delta} damage"
-            if delta > 0:
-                diff_text = color_text(f"({diff_text})", "1;32")
-            else:
-                diff_text = color_text(f"({diff_text})", "1;31")
-            return f" (Damage {item_damage} {diff_text})"
-        if item.item_type == "armor":
-            item_defense = item.effect.get("defense", 0)
-            equipped_defense = self.player.equipped_armor.effect.get("defense", 0) if self.player.equipped_armor else 0
-            delta = item_defense - equipped_defense
-            if delta == 0:
-                return f" (Defense {item_defense})"
-            sign = "+" if delta > 0 else ""
-            diff_text = f"{sign}{delta} defense"
-            if delta > 0:
-                diff_text = color_text(f"({diff_text})", "1;32")
-            else:
-                diff_text = color_text(f"({diff_text})", "1;31")
-            return f" (Defense {item_defense} {diff_text})"
-        return ""
+            equipped = self.player.equipped_weapon
+        elif item.item_type == "armor":
+            equipped = self.player.equipped_armor
+        else:
+            return ""
+        if equipped:
+            return item_stats_tag(item.template, item.rarity, equipped.template, equipped.rarity)
+        return item_stats_tag(item.template, item.rarity)
 
     def format_upgrade_preview(self, item, next_rarity):
         """Format projected stat gains for the next rarity tier."""
-        if not next_rarity or item.item_type not in ("weapon", "armor"):
-            return ""
-        multiplier = RARITY_MULTIPLIERS.get(next_rarity)
-        if multiplier is None:
-            return ""
-        upgraded = self.scale_item_effect(item.base_effect, multiplier)
-
-        def format_value(value, is_percent):
-            if is_percent:
-                if abs(value - round(value)) < 0.0001:
-                    return f"{int(round(value))}%"
-                return f"{value:.1f}%"
-            if abs(value - round(value)) < 0.0001:
-                return str(int(round(value)))
-            return f"{value:.1f}"
-        fields = (
-            ("damage", "Damage", False),
-            ("defense", "Defense", False),
-            ("magic", "Magic", False),
-            ("mana_cost_reduction_percent", "Mana Cost Reduction", True),
-            ("life_steal_percent", "Life Steal", True),
-        )
-        changes = []
-        for key, label, is_percent in fields:
-            if key not in item.effect and key not in upgraded:
-                continue
-            current = item.effect.get(key, 0)
-            future = upgraded.get(key, 0)
-            if abs(current - future) < 0.0001:
-                continue
-            changes.append(
-                f"{label} {format_value(current, is_percent)} -> {format_value(future, is_percent)}"
-            )
-        if not changes:
-            return ""
-        return f"(Upgrade: {', '.join(changes)})"
+        return upgrade_preview_tag(item.template, item.rarity, next_rarity)
 
     def trade_sell(self):
         """Sell items to the merchant."""
         if not self.player.inventory:
-            print("Kaelen: You've got nothing worth weighing.")
+            self.io.print("Kaelen: You've got nothing worth weighing.")
             return
         while True:
             self.print_section_header("Your Goods")
-            print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
+            self.io.print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
             saleable = [item for item in self.player.inventory if item.item_type != "quest_item"]
             if not saleable:
-                print("Kaelen: You've got nothing I'd trade for.")
+                self.io.print("Kaelen: You've got nothing I'd trade for.")
                 return
             order, counts = self.summarize_items_with_counts(saleable)
             equipped_weapon = self.player.equipped_weapon
@@ -2683,14 +4123,14 @@ __/_______\________\__\_/________\_ _/_____/_________
                 count_tag = f" (x{counts[key]})" if counts[key] > 1 else ""
                 equip_tag = " (equipped)" if key in equipped_keys else ""
                 sell_price = int(item.gold_value * 0.75)
-                print(
+                self.io.print(
                     f"{index}) {self.format_item_name(item)}{count_tag}{equip_tag} - "
                     f"{self.format_currency(sell_price)}"
                 )
                 stats_tag = self.format_merchant_item_stats(item)
                 if stats_tag:
-                    print(f"        {stats_tag}")
-            choice = safe_input("Sell which item? (number/name or 'back'): ").strip().lower()
+                    self.io.print(f"        {stats_tag}")
+            choice = self.io.input("Sell which item? (number/name or 'back'): ").strip().lower()
             if not choice or choice == "back":
                 return
             item = None
@@ -2702,18 +4142,14 @@ __/_______\________\__\_/________\_ _/_____/_________
                 item, matches = self.resolve_item(choice, self.player.inventory)
                 if matches:
                     options = self.format_item_list(matches)
-                    print(f"Which item did you mean? {options}")
+                    self.io.print(f"Which item did you mean? {options}")
                     continue
             if not item:
-                normalized_choice = normalize_name(choice)
-                quest_item = next(
-                    (owned for owned in self.player.inventory if normalize_name(owned.name) == normalized_choice),
-                    None,
-                )
+                quest_item = self.player.inventory.first_named(choice)
                 if quest_item and quest_item.item_type == "quest_item":
-                    print("Kaelen: I don't buy quest relics.")
+                    self.io.print("Kaelen: I don't buy quest relics.")
                 else:
-                    print("Kaelen: I don't see that in your pack.")
+                    self.io.print("Kaelen: I don't see that in your pack.")
                 continue
             sell_price = int(item.gold_value * 0.75)
             if self.player.equipped_weapon == item:
@@ -2723,32 +4159,32 @@ __/_______\________\__\_/________\_ _/_____/_________
             self.player.inventory.remove(item)
             self.merchant_inventory.append(item)
             self.add_gold(sell_price)
-            print(good(f"You sell {self.format_item_name(item)} for {self.format_currency(sell_price)}."))
+            self.io.print(good(f"You sell {self.format_item_name(item)} for {self.format_currency(sell_price)}."))
 
     def handle_borin(self):
         """Handle upgrades with Borin Stonefist."""
-        print(npc_name("Borin: The forge will tell me what your steel can become."))
-        print(npc_name("Borin: Bring coin and patience, and I'll bring the fire."))
+        self.io.print(npc_name("Borin: The forge will tell me what your steel can become."))
+        self.io.print(npc_name("Borin: Bring coin and patience, and I'll bring the fire."))
         while True:
-            print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
-            choice = safe_input("Forge (upgrade/leave): ").strip().lower()
+            self.io.print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
+            choice = self.io.input("Forge (upgrade/leave): ").strip().lower()
             if choice in ("leave", "exit", "no"):
-                print("Borin grunts and returns to the anvil.")
+                self.io.print("Borin grunts and returns to the anvil.")
                 return
             if choice in ("upgrade", "yes"):
                 self.forge_upgrade()
             else:
-                print("Borin: Speak plain. Upgrade or leave.")
+                self.io.print("Borin: Speak plain. Upgrade or leave.")
 
     def forge_upgrade(self):
         """Upgrade a weapon or armor to the next rarity tier."""
         while True:
             eligible = [item for item in self.player.inventory if self.is_upgradeable_item(item)]
             if not eligible:
-                print("Borin: Nothing here worth the heat.")
+                self.io.print("Borin: Nothing here worth the heat.")
                 return
             self.print_section_header("Emberforge Upgrades")
-            print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
+            self.io.print(color_text(f"Your gold: {self.format_currency(self.player.gold)}", "2;37"))
             order, counts = self.summarize_items_with_counts(eligible)
             equipped_weapon = self.player.equipped_weapon
             equipped_armor = self.player.equipped_armor
@@ -2764,14 +4200,14 @@ __/_______\________\__\_/________\_ _/_____/_________
                 next_rarity = self.get_next_rarity(item.rarity)
                 cost = self.upgrade_cost(item)
                 if next_rarity and cost is not None:
-                    print(
+                    self.io.print(
                         f"{index}) {self.format_item_name(item)}{count_tag}{equip_tag} -> {next_rarity} "
                         f"for {self.format_currency(cost)}"
                     )
                     preview = self.format_upgrade_preview(item, next_rarity)
                     if preview:
-                        print(f"        {preview}")
-            choice = safe_input("Upgrade which item? (number/name or 'back'): ").strip().lower()
+                        self.io.print(f"        {preview}")
+            choice = self.io.input("Upgrade which item? (number/name or 'back'): ").strip().lower()
             if not choice or choice == "back":
                 return
             item = None
@@ -2783,29 +4219,40 @@ __/_______\________\__\_/________\_ _/_____/_________
                 item, matches = self.resolve_item(choice, eligible)
                 if matches:
                     options = self.format_item_list(matches)
-                    print(f"Which item did you mean? {options}")
+                    self.io.print(f"Which item did you mean? {options}")
                     continue
             if not item:
-                print("Borin: I don't see that in your pack.")
+                self.io.print("Borin: I don't see that in your pack.")
                 continue
             next_rarity = self.get_next_rarity(item.rarity)
             if not next_rarity:
-                print("Borin: That piece can't be tempered further.")
+                self.io.print("Borin: That piece can't be tempered further.")
                 continue
             cost = self.upgrade_cost(item)
             if cost is None:
-                print("Borin: That won't take the hammer.")
+                self.io.print("Borin: That won't take the hammer.")
                 continue
             if self.player.gold < cost:
-                print("Borin: Come back with heavier coin.")
+                self.io.print("Borin: Come back with heavier coin.")
                 continue
             self.player.gold -= cost
             self.assign_item_rarity(item, rarity=next_rarity)
-            print(good(f"Borin hammers away, and your {item.name} now shines with {next_rarity} power!"))
+            self.player.inventory.refresh(item)
+            self.io.print(good(f"Borin hammers away, and your {item.name} now shines with {next_rarity} power!"))
 
     def count_completed_quests(self):
         """Count quests marked as completed."""
-        return sum(1 for quest in self.player.quests if quest.status == "completed")
+        return self.player.quests.completed
+
+    def accept_quest(self, quest):
+        """Add a newly accepted quest to the player's log."""
+        self.player.quests.append(quest)
+        self.emit(QuestAccepted(quest.quest_id, quest.name))
+
+    def complete_quest(self, quest):
+        """Mark a quest completed."""
+        self.player.quests.set_status(quest, "completed")
+        self.emit(QuestCompleted(quest.quest_id, quest.name))
 
     def check_heartstone_unlock(self, announce=True):
         """Unlock the Heartstone quest after completing enough tasks."""
@@ -2820,11 +4267,11 @@ __/_______\________\__\_/________\_ _/_____/_________
             {"location": "Heartstone Depths"},
             {"choice": "stabilize/exploit/destroy"},
         )
-        self.player.quests.append(new_quest)
+        self.accept_quest(new_quest)
         self.player.flags["heartstone_unlocked"] = True
         if announce:
-            print(headline("A Distant Pulse"))
-            print("A deep heartbeat rolls through the ruins, calling you downward.")
+            self.io.print(headline("A Distant Pulse"))
+            self.io.print("A deep heartbeat rolls through the ruins, calling you downward.")
 
     def update_lost_scroll_state(self):
         """Gate Sunken Archives content behind the lost scroll quest."""
@@ -2832,78 +4279,82 @@ __/_______\________\__\_/________\_ _/_____/_________
         if not location:
             return
         quest = self.get_quest("lost_scroll")
+        has_scroll = any(item.name == "Scholar's Lost Scroll" for item in location.items)
+        has_archivist = any(enemy.name == "Drowned Archivist" for enemy in location.enemies)
         if not quest:
-            location.items = [item for item in location.items if item.name != "Scholar's Lost Scroll"]
-            location.enemies = [enemy for enemy in location.enemies if enemy.name != "Drowned Archivist"]
+            if has_scroll or has_archivist:
+                location = self.world.mutable(location.name)
+                location.items = Inventory(item for item in location.items if item.name != "Scholar's Lost Scroll")
+                location.enemies = [enemy for enemy in location.enemies if enemy.name != "Drowned Archivist"]
             return
         if quest.status == "completed":
             return
-        if not any(enemy.name == "Drowned Archivist" for enemy in location.enemies):
-            location.enemies.append(self.clone_enemy("Drowned Archivist"))
-        if (
-            not self.player_has_item("Scholar's Lost Scroll")
-            and not any(item.name == "Scholar's Lost Scroll" for item in location.items)
-        ):
-            location.items.append(self.clone_item("Scholar's Lost Scroll"))
+        if not has_archivist:
+            self.world.mutable(location.name).enemies.append(self.clone_enemy("Drowned Archivist"))
+        if not self.player_has_item("Scholar's Lost Scroll") and not has_scroll:
+            self.world.mutable(location.name).items.append(self.clone_item("Scholar's Lost Scroll"))
 
     def update_breach_boss_state(self):
         """Ensure the Chronos Tyrant is present until defeated."""
         location = self.world.get("The Temporal Breach Apex")
         if not location:
             return
+        has_tyrant = any(enemy.name == "The Chronos Tyrant" for enemy in location.enemies)
         if self.player.flags.get("chronos_tyrant_defeated"):
-            location.enemies = [enemy for enemy in location.enemies if enemy.name != "The Chronos Tyrant"]
+            if has_tyrant:
+                location = self.world.mutable(location.name)
+                location.enemies = [enemy for enemy in location.enemies if enemy.name != "The Chronos Tyrant"]
             return
-        if not any(enemy.name == "The Chronos Tyrant" for enemy in location.enemies):
-            location.enemies.append(self.clone_enemy("The Chronos Tyrant"))
+        if not has_tyrant:
+            self.world.mutable(location.name).enemies.append(self.clone_enemy("The Chronos Tyrant"))
 
     def handle_chronos_tyrant_defeat(self):
         """Trigger the horde after defeating the Chronos Tyrant."""
         if self.player.flags.get("chronos_tyrant_defeated"):
             return
         self.player.flags["chronos_tyrant_defeated"] = True
-        print(
+        self.io.print(
             danger(
                 "As the Chronos Tyrant begins to crumble into a pile of temporal dust,, a guttural, "
                 "echoing scream tears through the Apex."
             )
         )
-        print(
+        self.io.print(
             danger(
                 "'You have undone the threads! Now, witness the unraveling!' it shrieks, its voice a "
                 "chorus of countless dying moments."
             )
         )
-        print(
+        self.io.print(
             npc_name(
                 "Brak Stonehand, his face grim and scarred, bursts into the Apex, his heavy axe already drawn."
             )
         )
-        print(
+        self.io.print(
             danger(
                 "The very air shatters, and from the newly formed chasms, a cacophony of screeches erupts! "
                 "A tide of grotesque creatures, their eyes burning with hunger, surges towards you."
             )
         )
-        print(
+        self.io.print(
             danger(
                 "The Temporal Breach spills outward in a cascading collapse. The creatures surge forth, tearing at the fabric of stable reality."
             )
         )
-        camp = self.world.get("Ironclad Camp")
-        if camp:
-            camp.npcs = [npc for npc in camp.npcs if npc.name != "Brak"]
+        if "Ironclad Camp" in self.world:
+            camp = self.world.mutable("Ironclad Camp")
+            camp.npcs = NamedCollection(npc for npc in camp.npcs if npc.name != "Brak")
         self.player.flags["ilyra_at_portal"] = True
         self.player.flags.pop("ilyra_portal_briefed", None)
         self.move_ilyra_to_portal()
-        print(
+        self.io.print(
             npc_name(
                 "Brak: Wayfinder! There's no time! The Tyrant's defeat has shattered its hold, and the Temporal Breach is fully unraveling! Reality itself is collapsing! "
                 "A raw portal has just bloomed in the Shattered Library - Ilyra is there, Wayfinder, using all her Remnant power to hold it open! It's your only way out! You "
                 "must reach it before this unraveling chaos, the true horrors of the Sundering, swallows the path and seals your last escape!"
             )
         )
-        print(npc_name("Brak: Go! I'll hold them back as long as I can! Don't look back, Wayfinder! Run!"))
+        self.io.print(npc_name("Brak: Go! I'll hold them back as long as I can! Don't look back, Wayfinder! Run!"))
         self.player.flags["portal_warning_given"] = True
         self.horde_active = True
         self.horde_delay_turns = 1
@@ -2917,6 +4368,7 @@ __/_______\________\__\_/________\_ _/_____/_________
         if self.horde_delay_turns > 0:
             self.horde_delay_turns -= 1
             return
+        previously_infected = set(self.infected_locations)
         if self.horde_pending:
             for destination in list(self.horde_pending):
                 turns = self.horde_pending[destination] - 1
@@ -2940,25 +4392,29 @@ __/_______\________\__\_/________\_ _/_____/_________
                 if destination in self.horde_pending:
                     del self.horde_pending[destination]
         self.infected_locations = new_infected
+        spread = new_infected - previously_infected
+        if spread:
+            self.emit(HordeSpread(tuple(sorted(spread))))
 
     def enter_portal(self):
         """Escape through the Shattered Library portal if the horde is active."""
         if not self.horde_active:
-            print("There is no portal to enter.")
+            self.io.print("There is no portal to enter.")
             return
         if self.player.current_location != "Shattered Library":
-            print("You see no portal here.")
+            self.io.print("You see no portal here.")
             return
-        clear_screen()
-        print(headline("The Last Threshold"))
-        print(
+        self.io.clear_screen()
+        self.io.print(headline("The Last Threshold"))
+        self.io.print(
             "You plunge through the shimmering portal, the screams of Aethelgard's final moments echoing behind you. "
             "The journey through the Temporal Breach is disorienting, a maelstrom of fractured realities. "
             "When you finally emerge, the air is still, the world unfamiliar. Aethelgard is lost, consumed by the unraveling it wrought upon itself. "
             "But you, the Wayfinder, carry its truth. The knowledge of the mages' hubris, the danger of the Dark Spellbooks, and the terrifying power of the Temporal Breach now rests with you. "
             "Your path is uncertain, but the echoes of a lost world demand that you remember, and perhaps, warn others. The Wayfinder's true journey has just begun..."
         )
-        print(WIN_ENDGAME_ART)
+        if self.io.renders_scenes:
+            self.io.print(WIN_ENDGAME_ART)
         self.print_endgame_summary("ESCAPE", accent="1;32")
         self.running = False
 
@@ -2967,60 +4423,57 @@ __/_______\________\__\_/________\_ _/_____/_________
         quest = self.get_quest("echoing_heartbeat")
         if not quest or quest.status == "completed":
             return
-        print(headline("The Heartstone"))
-        print(
+        self.io.print(headline("The Heartstone"))
+        self.io.print(
             "The relic throbs with unstable power. You sense three paths: soothe it, seize it, or shatter it."
         )
-        print("1) Stabilize the Heartstone and align it with the ley lines.")
-        print("2) Exploit its power and claim it for yourself.")
-        print("3) Destroy it, ending its pulse forever.")
-        choice = safe_input("Choose 1, 2, or 3 (or press Enter to wait): ").strip()
+        self.io.print("1) Stabilize the Heartstone and align it with the ley lines.")
+        self.io.print("2) Exploit its power and claim it for yourself.")
+        self.io.print("3) Destroy it, ending its pulse forever.")
+        choice = self.io.input("Choose 1, 2, or 3 (or press Enter to wait): ").strip()
         if choice == "1":
-            quest.status = "completed"
+            self.complete_quest(quest)
             self.player.flags["heartstone_outcome"] = "stabilized"
             reward_item = self.clone_item("Stabilized Heartstone")
             self.player.inventory.append(reward_item)
             self.apply_passive_item_effect(reward_item)
-            print(good("The chamber calms, and the Heartstone settles into a steady rhythm."))
-            print(good("You carry a harmonic fragment of its power."))
+            self.io.print(good("The chamber calms, and the Heartstone settles into a steady rhythm."))
+            self.io.print(good("You carry a harmonic fragment of its power."))
         elif choice == "2":
-            quest.status = "completed"
+            self.complete_quest(quest)
             self.player.flags["heartstone_outcome"] = "exploited"
             reward_item = self.clone_item("Heartstone Core")
             self.player.inventory.append(reward_item)
             self.apply_passive_item_effect(reward_item)
-            print(danger("You wrench the Heartstone free. The world shudders, and power floods your veins."))
+            self.io.print(danger("You wrench the Heartstone free. The world shudders, and power floods your veins."))
         elif choice == "3":
-            quest.status = "completed"
+            self.complete_quest(quest)
             self.player.flags["heartstone_outcome"] = "destroyed"
             self.player.max_health += 20
             self.player.health = self.player.max_health
-            print(good("The Heartstone cracks. Silence follows, and your body hardens against the loss."))
+            self.io.print(good("The Heartstone cracks. Silence follows, and your body hardens against the loss."))
         else:
-            print("The Heartstone continues its slow, waiting beat.")
+            self.io.print("The Heartstone continues its slow, waiting beat.")
 
     def get_quest(self, quest_id):
         """Return a quest by ID if the player has it."""
-        for quest in self.player.quests:
-            if quest.quest_id == quest_id:
-                return quest
-        return None
+        return self.player.quests.get(quest_id)
 
     def show_quests(self):
         """Display the quest log."""
         if not self.player.quests:
-            print("You have no active quests.")
+            self.io.print("You have no active quests.")
             return
         self.print_section_header("Quest Log")
         for quest in self.player.quests:
             status = quest.status.capitalize()
-            print(f"- {quest.name} [{status}]: {quest.description}")
+            self.io.print(f"- {quest.name} [{status}]: {quest.description}")
 
     def print_combat_help(self):
         """Display available commands during combat."""
         self.print_section_header("Combat Commands")
-        print("attack | cast | use <item> | flee")
-        print("help | inventory | stats")
+        self.io.print("attack | cast | use <item> | flee")
+        self.io.print("help | inventory | stats")
 
     # -----------------------------
     # Combat system
@@ -3031,10 +4484,12 @@ __/_______\________\__\_/________\_ _/_____/_________
         location = self.world[self.player.current_location]
         if not location.enemies:
             return
+        location = self.world.mutable(location.name)
         while location.enemies and self.running:
             enemy = location.enemies[0]
             self.scale_enemy_for_player(enemy, preserve_health=True)
             result = self.combat(enemy)
+            self.emit(CombatEnded(enemy.name, enemy.level, result, self.player.health))
             if result == "fled":
                 self.needs_redraw = True
                 return
@@ -3049,7 +4504,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                     self.handle_chronos_tyrant_defeat()
                 if self.pending_post_combat_messages:
                     for message in self.pending_post_combat_messages:
-                        print(message)
+                        self.io.print(message)
                     self.pending_post_combat_messages = []
                 self.wait_for_continue()
                 self.needs_redraw = True
@@ -3059,8 +4514,8 @@ __/_______\________\__\_/________\_ _/_____/_________
 
     def combat(self, enemy):
         """Turn-based combat loop against a single enemy."""
-        self.combat_log = []
-        clear_screen()
+        self.combat_log = deque(maxlen=COMBAT_LOG_LIMIT)
+        self.io.clear_screen()
         self.print_status_bar()
         combat_art = r"""
 +------------------+
@@ -3074,17 +4529,18 @@ __/_______\________\__\_/________\_ _/_____/_________
         /  \
        /____\
 """
-        print(combat_art)
-        pause(0.2)
+        if self.io.renders_scenes:
+            self.io.print(combat_art)
+            self.io.pause(0.2)
         lower_name = enemy.name.lower()
         article = "" if lower_name.startswith(("the ", "a ", "an ")) else "A "
         self.add_combat_log(danger(f"{article}{enemy.name} (Lv {enemy.level}) attacks! {enemy.description}"))
         self.add_combat_log(danger("A low, guttural growl echoes from the shadows."))
-        pause(0.4)
+        self.io.pause(0.4)
 
         while enemy.is_alive() and self.player.health > 0 and self.running:
             self.render_combat_screen(enemy)
-            action = safe_input("Action (attack, cast, use item, flee): ").strip().lower()
+            action = self.io.input("Action (attack, cast, use item, flee): ").strip().lower()
             if not action:
                 for message in self.player_attack(enemy):
                     self.add_combat_log(message)
@@ -3115,7 +4571,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                     self.add_combat_log("You have no consumables.")
                     self.render_combat_screen(enemy)
                     continue
-                item_name = safe_input("Use which item? ").strip()
+                item_name = self.io.input("Use which item? ").strip()
                 if not item_name:
                     self.add_combat_log("Use what?")
                     options = self.format_consumable_options()
@@ -3139,7 +4595,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                 if self.attempt_flee(enemy):
                     self.add_combat_log(good("You escape the fight."))
                     self.render_combat_screen(enemy)
-                    pause(0.4)
+                    self.io.pause(0.4)
                     if self.previous_location:
                         self.player.current_location = self.previous_location
                     return "fled"
@@ -3176,6 +4632,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             weapon = self.player.equipped_weapon
             weapon_name = weapon.name if weapon else "fists"
             weapon_type = weapon.weapon_type if weapon else "melee"
+            self.emit(Damage(self.player.name, enemy.name, damage, weapon_type))
             if weapon_type == "ranged_bow":
                 messages.append(good(f"You loose an arrow, striking the {enemy.name} for {damage} damage!"))
             elif weapon_type == "magic_staff" and CANTRIP_ACTIVE:
@@ -3196,6 +4653,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                 if random.randint(1, 100) <= curse_chance:
                     self.player.health = max(0, self.player.health - curse_damage)
                     self.player.damage_received += curse_damage
+                    self.emit(Damage(weapon.name, self.player.name, curse_damage, "curse"))
                     messages.append(danger("The shadow within your blade bites back."))
                     if self.player.health <= 0:
                         self.game_over()
@@ -3240,6 +4698,7 @@ __/_______\________\__\_/________\_ _/_____/_________
         damage = max(0, damage)
         enemy.health = max(0, enemy.health - damage)
         self.player.damage_done += damage
+        self.emit(Damage(self.player.name, enemy.name, damage, "spell"))
         messages = []
         if effective_resistance > 0:
             if is_staff and resistance > 0:
@@ -3262,6 +4721,7 @@ __/_______\________\__\_/________\_ _/_____/_________
             damage = max(1, base_damage - self.player.defense())
             self.player.health = max(0, self.player.health - damage)
             self.player.damage_received += damage
+            self.emit(Damage(enemy.name, self.player.name, damage, "melee"))
             return [danger(f"{enemy.name} hits you for {damage} damage.")]
         else:
             return [f"{enemy.name} misses, its strike cutting only air."]
@@ -3299,7 +4759,7 @@ __/_______\________\__\_/________\_ _/_____/_________
         base_gold = random.randint(4, 8)
         gold_amount = max(1, int(round(base_gold * (1 + (level - 1) * 0.15))))
         self.add_gold(gold_amount)
-        print(good(f"You collect {self.format_currency(gold_amount)}."))
+        self.io.print(good(f"You collect {self.format_currency(gold_amount)}."))
         drops = []
         equip_messages = []
         if enemy.loot:
@@ -3322,12 +4782,13 @@ __/_______\________\__\_/________\_ _/_____/_________
                 if equip_message:
                     equip_messages.append(equip_message)
             else:
-                self.world[self.player.current_location].items.append(loot_item)
-            print(good(f"The {enemy.name} drops {self.format_item_name(loot_item)}."))
+                self.world.mutable(self.player.current_location).items.append(loot_item)
+            self.io.print(good(f"The {enemy.name} drops {self.format_item_name(loot_item)}."))
+            self.emit(LootDropped(enemy.name, loot_item.name, loot_item.rarity))
             if loot_item.major:
                 self.show_item_art(loot_item)
         for message in equip_messages:
-            print(message)
+            self.io.print(message)
 
     # -----------------------------
     # Player status and stats
@@ -3336,44 +4797,37 @@ __/_______\________\__\_/________\_ _/_____/_________
     def show_stats(self):
         """Show player stats and faction affinity."""
         self.print_section_header(f"{self.player.name} - Wayfinder")
-        print(f"Level: {self.player.level} | XP: {self.player.experience}/{self.player.level * 100}")
+        self.io.print(f"Level: {self.player.level} | XP: {self.player.experience}/{self.player.level * 100}")
         hp = color_text(self.format_bar_value(self.player.health, self.player.max_health), "1;31")
         mp = color_text(self.format_bar_value(self.player.mana, self.player.max_mana), "1;34")
-        print(f"Health: {hp}")
-        print(f"Mana: {mp}")
-        print(f"Strength: {self.player.strength} | Magic: {self.player.magic} | Agility: {self.player.agility}")
+        self.io.print(f"Health: {hp}")
+        self.io.print(f"Mana: {mp}")
+        self.io.print(f"Strength: {self.player.strength} | Magic: {self.player.magic} | Agility: {self.player.agility}")
         weapon_bonus = self.player.equipped_weapon.effect.get("damage", 0) if self.player.equipped_weapon else 0
         armor_bonus = self.player.equipped_armor.effect.get("defense", 0) if self.player.equipped_armor else 0
-        print(f"Weapon Damage Bonus: +{weapon_bonus} | Armor Defense Bonus: +{armor_bonus}")
-        print(f"Gold: {self.player.gold}")
+        self.io.print(f"Weapon Damage Bonus: +{weapon_bonus} | Armor Defense Bonus: +{armor_bonus}")
+        self.io.print(f"Gold: {self.player.gold}")
 
     def player_has_item(self, item_name):
         """Check if the player has an item in their inventory."""
-        return any(normalize_name(item.name) == normalize_name(item_name) for item in self.player.inventory)
+        return self.player.inventory.count_named(item_name) > 0
 
     def remove_item_from_inventory(self, item_name):
         """Remove an item from inventory by name."""
-        for item in self.player.inventory:
-            if normalize_name(item.name) == normalize_name(item_name):
-                self.player.inventory.remove(item)
-                return
+        item = self.player.inventory.first_named(item_name)
+        if item:
+            self.player.inventory.remove(item)
 
     def count_inventory_items(self, item_name):
         """Count matching items in inventory by name."""
-        return sum(
-            1 for item in self.player.inventory if normalize_name(item.name) == normalize_name(item_name)
-        )
+        return self.player.inventory.count_named(item_name)
 
     def remove_items_from_inventory(self, item_name, count):
         """Remove multiple items from inventory by name."""
-        removed = 0
-        for item in list(self.player.inventory):
-            if removed >= count:
-                break
-            if normalize_name(item.name) == normalize_name(item_name):
-                self.player.inventory.remove(item)
-                removed += 1
-        return removed
+        matches = self.player.inventory.items_named(item_name)[:count]
+        for item in matches:
+            self.player.inventory.remove(item)
+        return len(matches)
 
     def location_has_enemy(self, location_name, enemy_name):
         """Check if a location still contains a specific enemy."""
@@ -3452,20 +4906,20 @@ __/_______\________\__\_/________\_ _/_____/_________
             self.print_section_header("Save Slots")
             slots = self.list_save_slots()
             for slot_info in slots:
-                print(self.format_slot_line(slot_info))
-            choice = safe_input("Save to slot (1-3 or 'back'): ").strip().lower()
+                self.io.print(self.format_slot_line(slot_info))
+            choice = self.io.input("Save to slot (1-3 or 'back'): ").strip().lower()
             if not choice or choice == "back":
                 return None
             if not choice.isdigit():
-                print("Please choose a slot number.")
+                self.io.print("Please choose a slot number.")
                 continue
             slot = int(choice)
             if slot < 1 or slot > MAX_SAVE_SLOTS:
-                print("Please choose a valid slot.")
+                self.io.print("Please choose a valid slot.")
                 continue
             slot_info = slots[slot - 1]
             if slot_info["summary"]:
-                confirm = safe_input(f"Overwrite Slot {slot}? (yes/no): ").strip().lower()
+                confirm = self.io.input(f"Overwrite Slot {slot}? (yes/no): ").strip().lower()
                 if confirm not in ("yes", "y"):
                     continue
             return slot
@@ -3476,20 +4930,20 @@ __/_______\________\__\_/________\_ _/_____/_________
             self.print_section_header("Load Slots")
             slots = self.list_save_slots()
             for slot_info in slots:
-                print(self.format_slot_line(slot_info))
-            choice = safe_input("Load which slot? (1-3 or 'back'): ").strip().lower()
+                self.io.print(self.format_slot_line(slot_info))
+            choice = self.io.input("Load which slot? (1-3 or 'back'): ").strip().lower()
             if not choice or choice == "back":
                 return None
             if not choice.isdigit():
-                print("Please choose a slot number.")
+                self.io.print("Please choose a slot number.")
                 continue
             slot = int(choice)
             if slot < 1 or slot > MAX_SAVE_SLOTS:
-                print("Please choose a valid slot.")
+                self.io.print("Please choose a valid slot.")
                 continue
             slot_info = slots[slot - 1]
             if not slot_info["summary"]:
-                print("That slot is empty.")
+                self.io.print("That slot is empty.")
                 continue
             return slot
 
@@ -3508,27 +4962,27 @@ __/_______\________\__\_/________\_ _/_____/_________
             self.print_section_header("Delete Save Slot")
             slots = self.list_save_slots()
             for slot_info in slots:
-                print(self.format_slot_line(slot_info))
-            choice = safe_input("Delete which slot? (1-3 or 'back'): ").strip().lower()
+                self.io.print(self.format_slot_line(slot_info))
+            choice = self.io.input("Delete which slot? (1-3 or 'back'): ").strip().lower()
             if not choice or choice == "back":
                 return None
             if not choice.isdigit():
-                print("Please choose a slot number.")
+                self.io.print("Please choose a slot number.")
                 continue
             slot = int(choice)
             if slot < 1 or slot > MAX_SAVE_SLOTS:
-                print("Please choose a valid slot.")
+                self.io.print("Please choose a valid slot.")
                 continue
             slot_info = slots[slot - 1]
             if not slot_info["summary"]:
-                print("That slot is already empty.")
+                self.io.print("That slot is already empty.")
                 continue
-            confirm = safe_input(f"Delete Slot {slot}? (yes/no): ").strip().lower()
+            confirm = self.io.input(f"Delete Slot {slot}? (yes/no): ").strip().lower()
             if confirm in ("yes", "y"):
                 if self.delete_save_slot(slot):
-                    print(good(f"Slot {slot} deleted."))
+                    self.io.print(good(f"Slot {slot} deleted."))
                     return slot
-                print("Could not delete that slot.")
+                self.io.print("Could not delete that slot.")
             else:
                 continue
 
@@ -3544,9 +4998,9 @@ __/_______\________\__\_/________\_ _/_____/_________
         """Start a new game in the next available slot."""
         slot = self.select_next_available_slot()
         if slot is None:
-            clear_screen()
-            print("All save slots are full. You must delete a slot to start a new game.")
-            choice = safe_input("Delete a slot now? (yes/no): ").strip().lower()
+            self.io.clear_screen()
+            self.io.print("All save slots are full. You must delete a slot to start a new game.")
+            choice = self.io.input("Delete a slot now? (yes/no): ").strip().lower()
             if choice in ("yes", "y"):
                 deleted = self.prompt_delete_slot()
                 if deleted is None:
@@ -3563,9 +5017,9 @@ __/_______\________\__\_/________\_ _/_____/_________
         """Continue a game from a chosen slot."""
         slots = self.list_save_slots()
         if not any(slot_info["summary"] for slot_info in slots):
-            clear_screen()
-            print("No saved games available.")
-            pause(0.6)
+            self.io.clear_screen()
+            self.io.print("No saved games available.")
+            self.io.pause(0.6)
             return False
         slot = self.prompt_load_slot()
         if slot is None:
@@ -3591,7 +5045,7 @@ __/_______\________\__\_/________\_ _/_____/_________
         """Save player and world state to a JSON file."""
         slot = self.current_save_slot
         if slot is None:
-            print("No save slot selected.")
+            self.io.print("No save slot selected.")
             return False
         data = {
             "player": {
@@ -3656,9 +5110,9 @@ __/_______\________\__\_/________\_ _/_____/_________
             with open(self.get_save_path(slot), "w", encoding="utf-8") as handle:
                 json.dump(data, handle, indent=2)
             if not quiet:
-                print(good(f"Game saved to Slot {slot}."))
+                self.io.print(good(f"Game saved to Slot {slot}."))
         except OSError as exc:
-            print(danger(f"Failed to save game: {exc}"))
+            self.io.print(danger(f"Failed to save game: {exc}"))
             return False
         return True
 
@@ -3666,25 +5120,25 @@ __/_______\________\__\_/________\_ _/_____/_________
         """Load player and world state from a JSON file."""
         path = self.get_save_path(slot)
         if not os.path.exists(path):
-            print("No save file found in that slot.")
+            self.io.print("No save file found in that slot.")
             return False
         try:
             with open(path, "r", encoding="utf-8") as handle:
                 data = json.load(handle)
         except (OSError, json.JSONDecodeError) as exc:
-            print(danger(f"Failed to load save file: {exc}"))
+            self.io.print(danger(f"Failed to load save file: {exc}"))
             return False
 
         player_data = data.get("player")
         if not player_data:
-            print(danger("Save file missing player data."))
+            self.io.print(danger("Save file missing player data."))
             return False
 
         location_name = player_data.get("current_location", "Whispering Ruins")
         if location_name not in self.world:
             location_name = "Whispering Ruins"
 
-        self.player = Player(player_data.get("name", "Wayfinder"), location_name)
+        self.player = Player(player_data.get("name", "Wayfinder"), location_name, io=self.io)
         self.current_save_slot = slot
         self.player.max_health = player_data.get("max_health", self.player.max_health)
         self.player.health = player_data.get("health", self.player.health)
@@ -3732,7 +5186,7 @@ __/_______\________\__\_/________\_ _/_____/_________
         self.player.visited_locations = visited_locations
 
         # Restore inventory and equipment using item templates.
-        self.player.inventory = []
+        self.player.inventory = Inventory()
         for entry in player_data.get("inventory", []):
             item = self.deserialize_item(entry)
             if item:
@@ -3757,7 +5211,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                 self.player.equipped_armor = self.find_inventory_item(equipped_armor_data)
 
         # Restore quests.
-        self.player.quests = []
+        self.player.quests = QuestLog()
         for quest_data in player_data.get("quests", []):
             quest = Quest(
                 quest_data.get("quest_id", "unknown"),
@@ -3768,14 +5222,20 @@ __/_______\________\__\_/________\_ _/_____/_________
             )
             quest.status = quest_data.get("status", "active")
             self.player.quests.append(quest)
+        self.reset_session_caches()
 
-        # Restore world items and enemies.
+        # Restore world items and enemies; locations that match the base stay shared, except
+        # private ones, whose first read would otherwise re-roll the saved item rarities.
         world_data = data.get("world", {})
-        for name, loc in self.world.items():
+        self.world.reset()
+        for name, base_location in self.world.base.items():
             if name not in world_data:
                 continue
             loc_data = world_data.get(name, {})
-            loc.items = []
+            if name not in self.world.private and self.location_matches_save(base_location, loc_data):
+                continue
+            loc = self.world.mutable(name)
+            loc.items = Inventory()
             for entry in loc_data.get("items", []):
                 item = self.deserialize_item(entry)
                 if item:
@@ -3798,7 +5258,7 @@ __/_______\________\__\_/________\_ _/_____/_________
                     enemy.health = max(0, min(enemy.max_health, saved_health))
                 loc.enemies.append(enemy)
 
-        self.merchant_inventory = []
+        self.merchant_inventory = Inventory()
         for entry in data.get("merchant_inventory", []):
             item = self.deserialize_item(entry)
             if item:
@@ -3823,12 +5283,21 @@ __/_______\________\__\_/________\_ _/_____/_________
         self.check_heartstone_unlock(announce=False)
         self.update_lost_scroll_state()
         self.update_breach_boss_state()
-        print(good("Game loaded."))
+        self.io.print(good("Game loaded."))
         return True
 
+    def location_matches_save(self, location, loc_data):
+        """Return True if saved items and enemies are identical to a location's current state."""
+        saved_items = [
+            entry if isinstance(entry, dict) else {"name": entry} for entry in loc_data.get("items", [])
+        ]
+        if saved_items != [self.serialize_item(item) for item in location.items]:
+            return False
+        return loc_data.get("enemies", []) == [self.serialize_enemy(enemy) for enemy in location.enemies]
+
     def find_inventory_item(self, item_name, rarity=None):
         """Find an item in inventory by name and optional rarity."""
-        for item in self.player.inventory:
+        for item in self.player.inventory.items_named(item_name):
             if item.name == item_name and (rarity is None or item.rarity == rarity):
                 return item
         return None
@@ -3839,7 +5308,7 @@ __/_______\________\__\_/________\_ _/_____/_________
 
     def game_over(self):
         """End the game with a dramatic game over screen."""
-        clear_screen()
+        self.io.clear_screen()
         over_art = r"""
 +-------------------+
 |     GAME OVER     |
@@ -3855,44 +5324,64 @@ __/_______\________\__\_/________\_ _/_____/_________
 ~  ~       ~ ~      ~           ~~ ~~~~~~  ~      ~~  ~             ~~
       ~             ~        ~      ~      ~~   ~    
 """
-        print(over_art)
-        print(danger("The echoes fade, and the world grows silent."))
+        if self.io.renders_scenes:
+            self.io.print(over_art)
+        self.io.print(danger("The echoes fade, and the world grows silent."))
         self.print_endgame_summary("FALLEN", accent="1;31")
         self.running = False
 
 
+Game.collect_commands()
+
+
 # -----------------------------
 # Entry point
 # -----------------------------
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options for the terminal front end."""
+    parser = argparse.ArgumentParser(description="Echoes of Aethelgard - a text-based RPG.")
+    parser.add_argument(
+        "--pacing",
+        choices=sorted(PACING_PROFILES),
+        default=None,
+        help="text pacing profile (default: interactive on screen, instant for streams)",
+    )
+    parser.add_argument("--no-color", action="store_true", help="disable ANSI colors even on a terminal")
+    parser.add_argument(
+        "--output",
+        choices=("auto", "screen") + STREAM_FORMATS,
+        default="auto",
+        help="screen for the full game, text or json for an event log "
+        "(default: screen when stdin or stdout is a terminal, else text)",
+    )
+    return parser.parse_args(argv)
+
+
+def make_io(args):
+    """Build the I/O port selected on the command line."""
+    output = args.output
+    if output == "auto":
+        interactive = sys.stdin.isatty() or sys.stdout.isatty()
+        output = "screen" if interactive else "text"
+    if output == "screen":
+        return ConsoleIO(pacing=args.pacing, color=False if args.no_color else None)
+    return StreamIO(fmt=output, pacing=args.pacing)
+
+
+def main(argv=None):
     """Run the game."""
-    game = Game()
+    args = parse_args(argv)
+    game = Game(io=make_io(args))
     try:
-        while True:
-            selection = game.start_menu()
-            if selection == "new":
-                if game.start_new_game_flow():
-                    break
-                continue
-            if selection == "continue":
-                if game.continue_game_flow():
-                    break
-                continue
-            if selection == "scores":
-                game.show_scores()
-                continue
-            if selection == "lore":
-                game.show_lore()
-                continue
-            if selection == "quit":
-                return
-
-        game.main_loop()
+        game.run()
     except KeyboardInterrupt:
+        game.io.flush()
         print("\nExiting Echoes of Aethelgard.")
         sys.exit(0)
+    finally:
+        game.io.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+"""Tests for the Echoes of Aethelgard session server."""
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aethelgard_server import GameServer
+
+
+class OversizedLineTest(unittest.TestCase):
+    """A client line longer than the reader's limit ends only that session."""
+
+    def test_oversized_line_closes_session(self):
+        """The server drops the client cleanly instead of logging a traceback."""
+        asyncio.run(self.run_oversized_client())
+
+    async def run_oversized_client(self):
+        """Send one line past the StreamReader limit and wait for the server to hang up."""
+        loop = asyncio.get_running_loop()
+        errors = []
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        server = GameServer(port=0, max_sessions=2)
+        listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"x" * (2**16 + 1024) + b"\r\n")
+            await writer.drain()
+            while await asyncio.wait_for(reader.read(65536), 10):
+                pass
+            writer.close()
+            for _ in range(100):
+                if not server.sessions:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.executor.shutdown(wait=True)
+        self.assertEqual(server.sessions, set())
+        self.assertEqual(errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Tests for per-session world state in Echoes of Aethelgard."""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import echoes_of_aethelgard
+from echoes_of_aethelgard import ITEM_TEMPLATES, Game, HeadlessIO, Item, Player
+
+GEAR_LOCATION = "Whispering Ruins"
+GEAR_NAME = "Rusty Dagger"
+
+
+class RolledGearTest(unittest.TestCase):
+    """Gear placed in the base world gets a rarity rolled, saved, and restored per session."""
+
+    def setUp(self):
+        """Rebuild the shared world with a weapon lying in the starting location."""
+        self.save_dir = tempfile.TemporaryDirectory()
+        self.save_template = echoes_of_aethelgard.SAVE_SLOT_TEMPLATE
+        echoes_of_aethelgard.SAVE_SLOT_TEMPLATE = os.path.join(self.save_dir.name, "savegame_slot{}.json")
+        Game.shared_world = None
+        base = Game(io=HeadlessIO()).world.base
+        base[GEAR_LOCATION].items.append(Item(ITEM_TEMPLATES[GEAR_NAME], "Common"))
+
+    def tearDown(self):
+        """Drop the modified shared world and restore the save location."""
+        Game.shared_world = None
+        echoes_of_aethelgard.SAVE_SLOT_TEMPLATE = self.save_template
+        self.save_dir.cleanup()
+
+    def gear_rarity(self, game):
+        """Return the rarity of the weapon lying in the gear location."""
+        for item in game.world[GEAR_LOCATION].items:
+            if item.name == GEAR_NAME:
+                return item.rarity
+        self.fail(f"{GEAR_NAME} missing from {GEAR_LOCATION}")
+
+    def test_saved_rarity_survives_reload(self):
+        """Every save and reload round trip keeps the rarity the session rolled."""
+        for seed in range(60):
+            random.seed(seed)
+            game = Game(io=HeadlessIO())
+            game.player = Player("Tester", GEAR_LOCATION, io=game.io)
+            game.current_save_slot = 1
+            saved = self.gear_rarity(game)
+            self.assertTrue(game.save_game(quiet=True))
+            loaded = Game(io=HeadlessIO())
+            self.assertTrue(loaded.load_game(1))
+            self.assertEqual(self.gear_rarity(loaded), saved, f"seed {seed}")
+
+    def test_fresh_sessions_roll_their_own_rarity(self):
+        """New sessions in one process do not all share the base world's roll."""
+        random.seed(0)
+        rarities = {self.gear_rarity(Game(io=HeadlessIO())) for _ in range(40)}
+        self.assertGreater(len(rarities), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()